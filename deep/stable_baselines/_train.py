@@ -1,3 +1,4 @@
+import functools
 import json
 import os
 import random
@@ -6,6 +7,7 @@ from pathlib import Path
 from typing import Type, Union
 
 import gymnasium as gym
+from stable_baselines3 import DQN
 from stable_baselines3.common.base_class import BaseAlgorithm
 from stable_baselines3.common.callbacks import (
     BaseCallback,
@@ -14,11 +16,26 @@ from stable_baselines3.common.callbacks import (
 )
 from stable_baselines3.common.env_util import make_vec_env
 from stable_baselines3.common.evaluation import evaluate_policy
+from stable_baselines3.common.off_policy_algorithm import OffPolicyAlgorithm
 from stable_baselines3.common.vec_env import VecEnv
 from tqdm import trange
 
+from deep.stable_baselines.offline import (
+    load_dict_dataset,
+    pretrain,
+    seed_replay_buffer,
+)
 from deep.stable_baselines.util import ModelSettings, TrainSettings
-from pylixir.envs import register_env
+from deep.stable_baselines.vec_env import PylixirVecEnv
+from pylixir.envs import DictVectorPylixirEnv, register_env
+from pylixir.envs.DictPylixirEnv import DictPylixirEnv
+from pylixir.envs.evaluation import (
+    EvaluationReport,
+    PairedComparison,
+    compare_seeds,
+    evaluate_seeds,
+    run_episode,
+)
 
 ENV_NAME = "DictPylixirEnv"
 
@@ -99,12 +116,15 @@ def train(
     n_envs = train_envs["n_envs"]
     # Env Control
     register_env()
-    env = make_vec_env(
-        f"pylixir/{ENV_NAME}-v0",
-        env_kwargs={"render_mode": "human"},
-        n_envs=n_envs,
-        seed=0,
-    )
+    if train_envs.get("vectorized"):
+        env = PylixirVecEnv(DictVectorPylixirEnv(n_envs, seed=0))
+    else:
+        env = make_vec_env(
+            f"pylixir/{ENV_NAME}-v0",
+            env_kwargs={"render_mode": "human"},
+            n_envs=n_envs,
+            seed=0,
+        )
     # env = PylixirEnv()
     # env.reset(0)
     action_dim = env.action_space.n
@@ -160,6 +180,9 @@ def train(
             _serialize_config({"train": train_envs, "model": model_envs}), f, indent=2
         )
 
+    if train_envs.get("offline_dataset"):
+        use_offline_dataset(model, train_envs)
+
     print(model.policy)
     random.seed(model_envs["seed"])
     evaluate(model, env, max_seed=train_envs["evaluation_n"], render=False)
@@ -184,6 +207,28 @@ def train(
     # model.set_parameters(model_path)
 
 
+def use_offline_dataset(model: BaseAlgorithm, train_envs: TrainSettings) -> None:
+    if not isinstance(model, OffPolicyAlgorithm):
+        raise ValueError("Offline datasets need an off-policy model")
+
+    dataset = load_dict_dataset(train_envs["offline_dataset"])
+    print(f"offline dataset: {len(dataset)} transitions")
+
+    if train_envs.get("offline_pretrain_steps"):
+        if not isinstance(model, DQN):
+            raise ValueError("Offline pretraining needs a DQN model")
+        pretrain(
+            model,
+            dataset,
+            train_envs["offline_pretrain_steps"],
+            tb_log_name=f"{train_envs['name']}.{train_envs['expname']}.pretrain",
+            seed=model.seed or 0,
+        )
+    if train_envs.get("offline_seed_buffer"):
+        seeded = seed_replay_buffer(model.replay_buffer, dataset)
+        print(f"replay buffer seeded with {seeded} transitions")
+
+
 def get_callback(
     checkpoint_freq: int, eval_freq: int, checkpoint_path: str
 ) -> CallbackList:
@@ -234,55 +279,76 @@ def evaluate_model(
     max_seed: int = 100000,
     render: bool = False,
 ) -> tuple[float, float, float]:
-    av_ep_lens, avg_rewards, success_rate = 0, 0, 0
-    neg_rew = 0
-    success_rate_14, success_rate_16, success_rate_18 = 0, 0, 0
-    for seed in trange(max_seed):
-        obs, _ = env.reset(seed=seed)
-        if render:
-            env.render()
-        terminated = False
-        curr_reward, curr_ep_len = 0, 0
-        ticks = 0
-        while not terminated:
+    def policy(obs):
+        action, _ = model.predict(obs, deterministic=True)
+        return action
+
+    results = [
+        run_episode(policy, env, seed, render=render) for seed in trange(max_seed)
+    ]
+    return _summarize(EvaluationReport.from_results(results, threshold=threshold))
+
+
+class CheckpointPolicy:
+    """Loads a saved model when called, so that each worker loads it once."""
+
+    def __init__(self, model_class: Type[BaseAlgorithm], model_zip_path: str):
+        self._model_class = model_class
+        self._model_zip_path = model_zip_path
+
+    def __call__(self):
+        model = self._model_class.load(self._model_zip_path, device="cpu")
+
+        def policy(obs):
             action, _ = model.predict(obs, deterministic=True)
-            obs, reward, terminated, _, info = env.step(action)
-            if render:
-                env.render()
-            curr_reward += reward
-            curr_ep_len += 1
-            ticks += 1
-            if ticks > 20:
-                break
-
-        av_ep_lens += curr_ep_len
-        avg_rewards += curr_reward
-        if ticks < 20:
-            if info["current_valuation"] >= threshold:
-                success_rate += 1
-            if info["current_valuation"] >= 14:
-                success_rate_14 += 1
-            if info["current_valuation"] >= 16:
-                success_rate_16 += 1
-            if info["current_valuation"] >= 18:
-                success_rate_18 += 1
-        else:
-            neg_rew += 1
-
-    print(f"Wrong choice: {neg_rew}")
-
-    return tuple(
-        map(
-            lambda x: float(x / max_seed),
-            (
-                av_ep_lens,
-                avg_rewards,
-                success_rate,
-                success_rate_14,
-                success_rate_16,
-                success_rate_18,
-            ),
-        )
+            return action
+
+        return policy
+
+
+def evaluate_checkpoint(
+    model_class: Type[BaseAlgorithm],
+    model_zip_path: str,
+    threshold: int = 14,
+    max_seed: int = 100000,
+    workers: int = 1,
+) -> tuple[float, float, float]:
+    results = evaluate_seeds(
+        CheckpointPolicy(model_class, model_zip_path),
+        DictPylixirEnv,
+        range(max_seed),
+        workers=workers,
+    )
+    return _summarize(EvaluationReport.from_results(results, threshold=threshold))
+
+
+def compare_checkpoints(
+    model_class: Type[BaseAlgorithm],
+    model_zip_path_a: str,
+    model_zip_path_b: str,
+    max_seed: int = 100000,
+    workers: int = 1,
+) -> list[PairedComparison]:
+    """Both checkpoints play the same seeds with common random numbers."""
+    return compare_seeds(
+        CheckpointPolicy(model_class, model_zip_path_a),
+        CheckpointPolicy(model_class, model_zip_path_b),
+        functools.partial(DictPylixirEnv, common_random_numbers=True),
+        range(max_seed),
+        workers=workers,
+    )
+
+
+def _summarize(report: EvaluationReport) -> tuple[float, float, float]:
+    print(f"Wrong choice: {report.unfinished}")
+
+    return (
+        report.mean_length,
+        report.mean_reward,
+        report.success_rate,
+        report.success_rate_14,
+        report.success_rate_16,
+        report.success_rate_18,
     )
 
 
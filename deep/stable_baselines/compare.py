@@ -0,0 +1,28 @@
+import os
+import sys
+
+from stable_baselines3 import DQN
+
+from deep.stable_baselines._train import compare_checkpoints
+
+model_zip_path_a, model_zip_path_b = sys.argv[1], sys.argv[2]
+
+workers = int(sys.argv[3]) if len(sys.argv) > 3 else os.cpu_count() or 1
+
+comparisons = compare_checkpoints(
+    DQN, model_zip_path_a, model_zip_path_b, max_seed=10000, workers=workers
+)
+print(
+    "--------------------------------------------------------------------------------------------"
+)
+for comparison in comparisons:
+    print(
+        f"success rate[{comparison.threshold}] (%) : "
+        f"{comparison.success_rate_a * 100:.2f} -> {comparison.success_rate_b * 100:.2f}"
+        f" ({comparison.difference * 100:+.2f} +- {comparison.standard_error * 196:.2f})"
+    )
+    print(f"  seeds won only by a / b : {comparison.only_a} / {comparison.only_b}")
+
+print(
+    "--------------------------------------------------------------------------------------------"
+)
@@ -1,19 +1,18 @@
+import os
 import sys
 
 from stable_baselines3 import DQN
 
-from deep.stable_baselines._train import evaluate_model
-from pylixir.envs.DictPylixirEnv import DictPylixirEnv
+from deep.stable_baselines._train import evaluate_checkpoint
 
 model_zip_path = sys.argv[
     1
 ]  # ex.  "./logs/checkpoints/DQN.exp-neg-decay-b128-emb/rl_model_1500000_steps.zip"
 
-model = DQN.load(model_zip_path)
+workers = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count() or 1
 
-env = DictPylixirEnv()
-av_ep_lens, avg_rewards, success_rate, r_14, r_16, r_18 = evaluate_model(
-    model, env, max_seed=10000, threshold=14, render=False
+av_ep_lens, avg_rewards, success_rate, r_14, r_16, r_18 = evaluate_checkpoint(
+    DQN, model_zip_path, max_seed=10000, threshold=14, workers=workers
 )
 print(
     "--------------------------------------------------------------------------------------------"
@@ -0,0 +1,70 @@
+import numpy as np
+import torch as th
+from stable_baselines3 import DQN
+
+from pylixir.application.reducer import (
+    PickCouncilAndEnchantAndRerollAction,
+    RerollAction,
+)
+from pylixir.core.base import Randomness
+from pylixir.core.compact import CompactGameState
+from pylixir.core.state import GameState
+from pylixir.data.pool import get_ingame_council_pool
+from pylixir.envs.observation import DictObservation
+from pylixir.search.rollout import AdvisedAction
+
+REROLL_ACTION_INDEX = 15
+
+
+def action_to_index(action: AdvisedAction) -> int:
+    if isinstance(action, RerollAction):
+        return REROLL_ACTION_INDEX
+    return action.effect_index * 3 + action.sage_index
+
+
+def index_to_action(index: int) -> AdvisedAction:
+    if index == REROLL_ACTION_INDEX:
+        return RerollAction()
+    return PickCouncilAndEnchantAndRerollAction(
+        effect_index=index // 3, sage_index=index % 3
+    )
+
+
+class _StateClient:
+    """`DictObservation` only reads `get_state` of its client."""
+
+    def __init__(self, state: GameState):
+        self._state = state
+
+    def get_state(self) -> GameState:
+        return self._state
+
+
+class QNetworkHooks:
+    """
+    MCTS hooks from a DQN model, e.g. one trained with `TransformerQPolicy`:
+    softmax of Q-values as priors and a Q-greedy rollout policy.
+    """
+
+    def __init__(self, model: DQN, temperature: float = 1.0):
+        self._model = model
+        self._temperature = temperature
+        self._observation = DictObservation(get_ingame_council_pool().get_index_map())
+
+    def q_values(self, state: GameState) -> np.ndarray:
+        observation = self._observation.create_observation(_StateClient(state))
+        observation_tensor, _ = self._model.policy.obs_to_tensor(observation)
+        with th.no_grad():
+            return self._model.q_net(observation_tensor)[0].cpu().numpy()
+
+    def prior(self, state: GameState, actions: list[AdvisedAction]) -> list[float]:
+        q_values = self.q_values(state)
+        logits = np.array([q_values[action_to_index(action)] for action in actions])
+        logits = (logits - logits.max()) / self._temperature
+        weights = np.exp(logits)
+        return (weights / weights.sum()).tolist()
+
+    def rollout_policy(
+        self, state: CompactGameState, randomness: Randomness
+    ) -> AdvisedAction:
+        return index_to_action(int(self.q_values(state.to_state()).argmax()))
@@ -0,0 +1,153 @@
+from typing import Optional
+
+import numpy as np
+from stable_baselines3 import DQN
+from stable_baselines3.common.buffers import DictReplayBuffer
+from stable_baselines3.common.type_aliases import DictReplayBufferSamples
+from stable_baselines3.common.utils import configure_logger, polyak_update
+from stable_baselines3.common.vec_env import VecNormalize
+
+from pylixir.data.pool import get_ingame_council_pool
+from pylixir.envs.observation import DictObservation
+from pylixir.envs.offline import OfflineDataset, TransitionBatch
+
+
+def load_dict_dataset(directory: str, include_rejected: bool = True) -> OfflineDataset:
+    """
+    Shards recorded by `DictPylixirEnv(record_to=...)`, served as observations of
+    `DictPylixirEnv`.
+    """
+    observation = DictObservation(get_ingame_council_pool().get_index_map())
+    return OfflineDataset(
+        directory,
+        transform=observation.observations_from_encodings,
+        include_rejected=include_rejected,
+    )
+
+
+class OfflineReplayBuffer(DictReplayBuffer):
+    """
+    Replay buffer that samples an `OfflineDataset` instead of the transitions
+    added to it, for batch-constrained training of off-policy models.
+    """
+
+    def __init__(
+        self,
+        dataset: OfflineDataset,
+        observation_space,
+        action_space,
+        device="auto",
+        seed: int = 0,
+    ):
+        # nothing is stored; the smallest buffer keeps `add` harmless.
+        super().__init__(1, observation_space, action_space, device=device)
+        self._dataset = dataset
+        self._rng = np.random.default_rng(seed)
+
+    def add(self, *args, **kwargs) -> None:
+        return None
+
+    def size(self) -> int:
+        return len(self._dataset)
+
+    def sample(
+        self, batch_size: int, env: Optional[VecNormalize] = None
+    ) -> DictReplayBufferSamples:
+        batch = self._dataset.sample(batch_size, self._rng)
+        return DictReplayBufferSamples(
+            observations=self._observations_to_torch(batch.observations, env),
+            actions=self.to_torch(batch.actions.reshape(-1, self.action_dim)),
+            next_observations=self._observations_to_torch(batch.next_observations, env),
+            dones=self.to_torch(batch.dones.astype(np.float32).reshape(-1, 1)),
+            rewards=self.to_torch(
+                self._normalize_reward(batch.rewards.reshape(-1, 1), env)
+            ),
+        )
+
+    def _observations_to_torch(self, observations, env):
+        shaped = {
+            key: value.reshape((-1,) + self.obs_shape[key])
+            for key, value in observations.items()
+        }
+        return {
+            key: self.to_torch(value)
+            for key, value in self._normalize_obs(shaped, env).items()
+        }
+
+
+def seed_replay_buffer(
+    replay_buffer: DictReplayBuffer,
+    dataset: OfflineDataset,
+    count: Optional[int] = None,
+    chunk_size: int = 4096,
+) -> int:
+    """
+    Adds the first `count` transitions of `dataset`, at most what the buffer
+    holds, and returns how many were added. Seeded transitions do not count as
+    timesteps, so `learning_starts` still applies.
+    """
+    n_envs = replay_buffer.n_envs
+    capacity = replay_buffer.buffer_size * n_envs
+    count = min(len(dataset), capacity if count is None else count)
+    count -= count % n_envs
+
+    infos = [{} for _ in range(n_envs)]
+    for start in range(0, count, chunk_size):
+        batch = dataset.get(np.arange(start, min(start + chunk_size, count)))
+        for row in range(0, len(batch.actions), n_envs):
+            _add_rows(replay_buffer, batch, slice(row, row + n_envs), infos)
+
+    return count
+
+
+def _add_rows(
+    replay_buffer: DictReplayBuffer, batch: TransitionBatch, rows: slice, infos
+) -> None:
+    replay_buffer.add(
+        {key: value[rows] for key, value in batch.observations.items()},
+        {key: value[rows] for key, value in batch.next_observations.items()},
+        batch.actions[rows],
+        batch.rewards[rows],
+        batch.dones[rows],
+        infos,
+    )
+
+
+def pretrain(
+    model: DQN,
+    dataset: OfflineDataset,
+    gradient_steps: int,
+    tb_log_name: str = "pretrain",
+    seed: int = 0,
+) -> None:
+    """
+    Trains `model` on `dataset` alone for `gradient_steps`, syncing the target
+    network every `target_update_interval` steps as `DQN.learn` would. The
+    replay buffer of `model` is left as it was.
+    """
+    online_buffer = model.replay_buffer
+    model.replay_buffer = OfflineReplayBuffer(
+        dataset,
+        model.observation_space,
+        model.action_space,
+        device=model.device,
+        seed=seed,
+    )
+    model._logger = configure_logger(  # pylint:disable=protected-access
+        model.verbose, model.tensorboard_log, tb_log_name
+    )
+
+    try:
+        done = 0
+        while done < gradient_steps:
+            steps = min(model.target_update_interval, gradient_steps - done)
+            model.train(gradient_steps=steps, batch_size=model.batch_size)
+            polyak_update(
+                model.q_net.parameters(), model.q_net_target.parameters(), model.tau
+            )
+            polyak_update(model.batch_norm_stats, model.batch_norm_stats_target, 1.0)
+
+            done += steps
+            model.logger.dump(step=done)
+    finally:
+        model.replay_buffer = online_buffer
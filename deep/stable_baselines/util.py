@@ -10,6 +10,10 @@ class TrainSettings(TypedDict):
     eval_freq: int
     evaluation_n: int  # n of episodes to simulate in evaluation phase
     n_envs: int
+    vectorized: bool  # step every env in lockstep on batched arrays
+    offline_dataset: str  # shards recorded by `DictPylixirEnv(record_to=...)`
+    offline_pretrain_steps: int  # gradient steps on the dataset alone
+    offline_seed_buffer: bool  # fill the replay buffer from the dataset
 
 
 def get_basic_train_settings(name: str) -> TrainSettings:
@@ -22,6 +26,10 @@ def get_basic_train_settings(name: str) -> TrainSettings:
         "eval_freq": int(1e5),
         "evaluation_n": int(250),
         "n_envs": 1,
+        "vectorized": False,
+        "offline_dataset": "",
+        "offline_pretrain_steps": 0,
+        "offline_seed_buffer": False,
     }
     return basic_train_setting
 
@@ -0,0 +1,75 @@
+from typing import Any, Sequence
+
+import numpy as np
+from stable_baselines3.common.vec_env import VecEnv
+
+from pylixir.envs.VectorPylixirEnv import BaseVectorPylixirEnv
+
+
+class PylixirVecEnv(VecEnv):
+    """
+    SB3 `VecEnv` over a natively vectorized pylixir env, replacing
+    `DummyVecEnv` which steps every sub-env in python.
+    """
+
+    def __init__(self, venv: BaseVectorPylixirEnv) -> None:
+        self.venv = venv
+        super().__init__(
+            venv.num_envs, venv.single_observation_space, venv.single_action_space
+        )
+
+    def reset(self):
+        # sub-envs share one generator; seeding with the first seed suffices.
+        observation, _ = self.venv.reset(seed=self._seeds[0])
+        self._reset_seeds()
+        return observation
+
+    def step_async(self, actions: np.ndarray) -> None:
+        self.venv.step_async(actions)
+
+    def step_wait(self):
+        observation, reward, terminated, truncated, info = self.venv.step_wait()
+        done = terminated | truncated
+
+        infos: list[dict[str, Any]] = []
+        for row in range(self.num_envs):
+            row_info = {
+                key: value[row]
+                for key, value in info.items()
+                if not key.startswith("_") and not key.startswith("final_")
+            }
+            if done[row]:
+                row_info = dict(info["final_info"][row])
+                row_info["terminal_observation"] = info["final_observation"][row]
+                row_info["TimeLimit.truncated"] = bool(
+                    truncated[row] and not terminated[row]
+                )
+            infos.append(row_info)
+
+        return observation, reward.astype(np.float32), done, infos
+
+    def close(self) -> None:
+        self.venv.close()
+
+    def get_attr(self, attr_name: str, indices=None) -> list[Any]:
+        return [getattr(self.venv, attr_name)] * len(self._get_indices(indices))
+
+    def set_attr(self, attr_name: str, value: Any, indices=None) -> None:
+        setattr(self.venv, attr_name, value)
+
+    def env_method(self, method_name: str, *method_args, indices=None, **method_kwargs):
+        result = getattr(self.venv, method_name)(*method_args, **method_kwargs)
+        if method_name == "action_masks":
+            # one mask per sub-env, as `sb3_contrib` stacks them.
+            return [result[index] for index in self._get_indices(indices)]
+        return [result] * len(self._get_indices(indices))
+
+    def env_is_wrapped(self, wrapper_class, indices=None) -> list[bool]:
+        return [False] * len(self._get_indices(indices))
+
+    def _get_indices(self, indices) -> Sequence[int]:
+        if indices is None:
+            return range(self.num_envs)
+        if isinstance(indices, int):
+            return [indices]
+        return indices
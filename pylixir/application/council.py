@@ -5,7 +5,8 @@ from typing import Optional
 import pydantic
 
 from pylixir.core.base import Randomness
-from pylixir.core.state import GameState
+from pylixir.core.outcome import Outcome, enumerate_outcomes, merge_outcomes
+from pylixir.core.state import GameState, get_state_key
 
 
 class CouncilType(enum.Enum):
@@ -26,6 +27,9 @@ class TargetSelector(pydantic.BaseModel, metaclass=abc.ABCMeta):
     target_condition: int
     count: int
 
+    class Config:
+        frozen = True
+
     @abc.abstractmethod
     def select_targets(
         self, state: GameState, effect_index: Optional[int], randomness: Randomness
@@ -36,12 +40,42 @@ class TargetSelector(pydantic.BaseModel, metaclass=abc.ABCMeta):
     def is_valid(self, state: GameState) -> bool:
         ...
 
+    def uses_effect_index(self) -> bool:
+        """Whether `select_targets` depends on the `effect_index` of the user."""
+        return False
+
+    def fixed_targets(self) -> tuple[int, ...]:
+        """Effects that `select_targets` selects whatever the state is."""
+        return ()
+
+    def selects_locked(self, state: GameState, effect_index: int) -> bool:
+        """
+        Whether `select_targets` surely selects a locked effect, which `Logic`
+        forbids. A dry run: `state` is not mutated and nothing is drawn.
+        """
+        locked = state.board.locked_indices()
+        return any(target in locked for target in self.fixed_targets())
+
+    def outcomes(
+        self, state: GameState, effect_index: Optional[int]
+    ) -> list[Outcome[list[int]]]:
+        """Every target list `select_targets` may return, with its probability."""
+        return merge_outcomes(
+            enumerate_outcomes(
+                lambda randomness: self.select_targets(state, effect_index, randomness)
+            ),
+            key=tuple,
+        )
+
 
 class ElixirOperation(pydantic.BaseModel, metaclass=abc.ABCMeta):
     ratio: int
     value: tuple[int, int]
     remain_turn: int
 
+    class Config:
+        frozen = True
+
     @abc.abstractmethod
     def reduce(
         self,
@@ -60,11 +94,38 @@ class ElixirOperation(pydantic.BaseModel, metaclass=abc.ABCMeta):
     ) -> bool:
         return True
 
+    def outcomes(
+        self, state: GameState, targets: list[int]
+    ) -> list[Outcome[GameState]]:
+        """
+        Every state `reduce` may return, with its probability.
+        `reduce` is replayed on a copy of `state` once per branch of its draws.
+        """
+        return merge_outcomes(
+            enumerate_outcomes(
+                lambda randomness: self.reduce(
+                    state.copy(deep=True), targets, randomness
+                )
+            ),
+            key=get_state_key,
+        )
+
     def is_lock_operation(
         self,
     ) -> bool:
         return False
 
+    def is_forbidden(self) -> bool:
+        """Whether `reduce` always raises `ForbiddenActionException`."""
+        return False
+
+    def is_value_dependent(self) -> bool:
+        """
+        Whether validity reads effect values. Otherwise it depends only on
+        progress, locked/mutable effects and the number of valid sages.
+        """
+        return False
+
     @classmethod
     def get_type(cls) -> str:
         class_name = cls.__name__
@@ -75,6 +136,9 @@ class Logic(pydantic.BaseModel):
     operation: ElixirOperation
     target_selector: TargetSelector
 
+    class Config:
+        frozen = True
+
     def apply(
         self, state: GameState, effect_index: int, randomness: Randomness
     ) -> GameState:
@@ -87,6 +151,19 @@ class Logic(pydantic.BaseModel):
 
         return new_state
 
+    def outcomes(self, state: GameState, effect_index: int) -> list[Outcome[GameState]]:
+        """Exact counterpart of `apply`."""
+        outcomes: list[Outcome[GameState]] = []
+        for targets_prob, targets in self.target_selector.outcomes(state, effect_index):
+            for target in targets:
+                if target in state.board.locked_indices():
+                    raise ForbiddenActionException("selected locked indices")
+
+            for prob, new_state in self.operation.outcomes(state, targets):
+                outcomes.append((targets_prob * prob, new_state))
+
+        return outcomes
+
     def is_valid(self, state: GameState) -> bool:
         if self.operation.is_lock_operation() and hasattr(
             self.target_selector, "target_index"
@@ -102,21 +179,52 @@ class Logic(pydantic.BaseModel):
             and self.operation.is_jointly_valid(state, self.target_selector)
         )
 
+    def is_value_dependent(self) -> bool:
+        return self.operation.is_value_dependent()
+
+    def uses_effect_index(self) -> bool:
+        return self.target_selector.uses_effect_index()
+
+    def is_forbidden(self, state: GameState, effect_index: int) -> bool:
+        """Whether `apply` surely raises `ForbiddenActionException` on `state`."""
+        return self.operation.is_forbidden() or self.target_selector.selects_locked(
+            state, effect_index
+        )
+
 
 class Council(pydantic.BaseModel):
+    """Immutable game data; pools hand out shared instances."""
+
     id: str
-    logics: list[Logic]
+    logics: tuple[Logic, ...]
     pickup_ratio: int
     turn_range: tuple[int, int]
     slot_type: int
-    descriptions: list[str]
+    descriptions: tuple[str, ...]
     type: CouncilType
 
+    class Config:
+        frozen = True
+
     def is_valid(self, state: GameState) -> bool:
         return self._is_turn_in_range(state) and all(
             logic.is_valid(state) for logic in self.logics
         )
 
+    def is_value_dependent(self) -> bool:
+        return any(logic.is_value_dependent() for logic in self.logics)
+
+    def uses_effect_index(self) -> bool:
+        return any(logic.uses_effect_index() for logic in self.logics)
+
+    def is_forbidden(self, state: GameState, effect_index: int) -> bool:
+        """
+        Whether picking this council with `effect_index` is surely forbidden.
+        Every logic is checked against `state`, not against the state left by
+        the logics before it.
+        """
+        return any(logic.is_forbidden(state, effect_index) for logic in self.logics)
+
     def _is_turn_in_range(self, state: GameState) -> bool:
         start, end = self.turn_range
         return start == 0 or start <= state.progress.get_current_turn() <= end
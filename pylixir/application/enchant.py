@@ -1,8 +1,20 @@
+from collections import defaultdict
+from functools import lru_cache
+from typing import NamedTuple, Sequence
+
 import pydantic
 
-from pylixir.core.base import Randomness
+from pylixir.core.base import DrawSlot, Randomness
+from pylixir.core.outcome import Outcome
 from pylixir.core.state import GameState
 
+EnchantDistribution = tuple[Outcome[tuple[int, ...]], ...]
+
+
+class EnchantOdds(NamedTuple):
+    hit: float  # probability that the effect is enchanted
+    gain: float  # expected value added to the effect
+
 
 class EnchantCommand(pydantic.BaseModel):
     size: int = 5
@@ -25,10 +37,17 @@ class EnchantCommand(pydantic.BaseModel):
 
         return result
 
+    def enchant_outcomes(self, state: GameState) -> list[Outcome[list[int]]]:
+        """Every result `enchant` may return, with its probability."""
+        return [
+            (result_prob, list(result))
+            for result_prob, result in self.enchant_distribution(state)
+        ]
+
     def get_enchant_result(
         self,
-        prob: list[float],
-        lucky_ratio: list[float],
+        prob: Sequence[float],
+        lucky_ratio: Sequence[float],
         count: int,
         amount: int,
         randomness: Randomness,
@@ -40,10 +59,12 @@ class EnchantCommand(pydantic.BaseModel):
             if sum(masked_prob) == 0:  ## 2-enchant given, but only one available
                 break
 
+            randomness.use_slot(DrawSlot.enchant)
             target_index = randomness.weighted_sampling(masked_prob)
 
             # add result as amount
             result[target_index] += amount
+            randomness.use_slot(DrawSlot.lucky)
             if randomness.binomial(lucky_ratio[target_index]):
                 result[target_index] += 1
 
@@ -51,3 +72,113 @@ class EnchantCommand(pydantic.BaseModel):
             masked_prob[target_index] = 0
 
         return result
+
+    def get_enchant_result_outcomes(
+        self,
+        prob: Sequence[float],
+        lucky_ratio: Sequence[float],
+        count: int,
+        amount: int,
+    ) -> list[Outcome[list[int]]]:
+        """Closed-form distribution of `get_enchant_result`."""
+        return [
+            (result_prob, list(result))
+            for result_prob, result in self.get_enchant_distribution(
+                prob, lucky_ratio, count, amount
+            )
+        ]
+
+    def get_enchant_distribution(
+        self,
+        prob: Sequence[float],
+        lucky_ratio: Sequence[float],
+        count: int,
+        amount: int,
+    ) -> EnchantDistribution:
+        """
+        `get_enchant_result_outcomes` as tuples, cached by its arguments; boards
+        of a game share few of them.
+        """
+        return _get_enchant_distribution(
+            tuple(prob), tuple(lucky_ratio), count, amount, self.size
+        )
+
+    def enchant_distribution(self, state: GameState) -> EnchantDistribution:
+        return self.get_enchant_distribution(
+            state.enchanter.query_enchant_prob(state.board.locked_indices()),
+            state.enchanter.query_lucky_ratio(),
+            state.enchanter.get_enchant_effect_count(),
+            state.enchanter.get_enchant_amount(),
+        )
+
+    def get_enchant_odds(
+        self,
+        prob: Sequence[float],
+        lucky_ratio: Sequence[float],
+        count: int,
+        amount: int,
+    ) -> list[EnchantOdds]:
+        """Per effect, the odds `get_enchant_result` raises it and its expected gain."""
+        hit = [0.0 for _ in range(self.size)]
+        gain = [0.0 for _ in range(self.size)]
+        for result_prob, result in self.get_enchant_distribution(
+            prob, lucky_ratio, count, amount
+        ):
+            for idx, increase in enumerate(result):
+                if increase > 0:
+                    hit[idx] += result_prob
+                    gain[idx] += result_prob * increase
+
+        return [EnchantOdds(hit[idx], gain[idx]) for idx in range(self.size)]
+
+
+@lru_cache(maxsize=1 << 14)
+def _get_enchant_distribution(
+    prob: tuple[float, ...],
+    lucky_ratio: tuple[float, ...],
+    count: int,
+    amount: int,
+    size: int,
+) -> EnchantDistribution:
+    # (result, masked_prob) -> probability, after each enchant
+    distribution: dict[tuple[tuple[int, ...], tuple[float, ...]], float] = {
+        ((0,) * size, prob): 1.0
+    }
+
+    for _ in range(count):
+        enchanted: dict[tuple[tuple[int, ...], tuple[float, ...]], float] = defaultdict(
+            float
+        )
+
+        for (result, masked_prob), branch_prob in distribution.items():
+            total = sum(masked_prob)
+            if total == 0:  ## 2-enchant given, but only one available
+                enchanted[(result, masked_prob)] += branch_prob
+                continue
+
+            for target_index, target_prob in enumerate(masked_prob):
+                if target_prob == 0:
+                    continue
+
+                next_prob = list(masked_prob)
+                next_prob[target_index] = 0
+                picked_prob = branch_prob * target_prob / total
+                lucky = lucky_ratio[target_index]
+
+                for bonus, bonus_prob in ((1, lucky), (0, 1 - lucky)):
+                    if bonus_prob == 0:
+                        continue
+
+                    next_result = list(result)
+                    next_result[target_index] += amount + bonus
+                    enchanted[(tuple(next_result), tuple(next_prob))] += (
+                        picked_prob * bonus_prob
+                    )
+
+        distribution = enchanted
+
+    merged: dict[tuple[int, ...], float] = defaultdict(float)
+    for (result, _), branch_prob in distribution.items():
+        merged[result] += branch_prob
+
+    return tuple((branch_prob, result) for result, branch_prob in merged.items())
@@ -1,17 +1,31 @@
-from typing import Callable, Dict, Optional
+from typing import Any, Callable, Dict, NamedTuple, Optional
 
 from pylixir.application.council import Council, ForbiddenActionException
+from pylixir.application.mask import (
+    REROLL_ACTION,
+    SAGE_COUNT,
+    BoolArray,
+    get_action_mask,
+)
+from pylixir.application.recorder import TrajectoryRecorder
 from pylixir.application.reducer import (
     PickCouncilAndEnchantAndRerollAction,
     pick_council,
     reroll,
 )
 from pylixir.application.terminal.view import show_game_state
-from pylixir.core.base import Board, Randomness
-from pylixir.core.state import GameState
+from pylixir.core.base import Board, BoardSnapshot, Randomness
+from pylixir.core.randomness import RecordingRandomness
+from pylixir.core.state import GameState, StateSnapshot
 from pylixir.data.council_pool import ConcreteCouncilPool
 
 
+class ClientSnapshot(NamedTuple):
+    state: StateSnapshot
+    previous_board: Optional[BoardSnapshot]
+    randomness: Any = None  # see `Randomness.get_generator_state`
+
+
 class Client:
     def __init__(
         self,
@@ -25,11 +39,13 @@ class Client:
         self._state = state
         self._council_pool = council_pool
         self._randomness = randomness
-        self._state.suggestions = self._council_pool.get_council_queries(
+        self._state.suggestions = self._council_pool.get_suggestions(
             state, randomness, is_reroll=False
         )
         self._show_previous_board = show_previous_board
         self._previous_board: Optional[Board] = None
+        self._action_mask: Optional[BoolArray] = None
+        self._recorder: Optional[TrajectoryRecorder] = None
 
     def pick(self, sage_index: int, effect_index: int) -> bool:
         """
@@ -39,10 +55,12 @@ class Client:
         returns False if choosen action is forbidden. This may occur when selecting
         locked effect or exhausted sage.
         """
+        action_index = effect_index * SAGE_COUNT + sage_index
         if sage_index not in self._state.committee.get_valid_slots():
-            return False
+            return self._record(action_index, False)
 
         self._set_previous_board_as_now()
+        self._action_mask = None
 
         try:
             self._state = pick_council(
@@ -55,9 +73,9 @@ class Client:
                 self._council_pool,
             )
         except ForbiddenActionException:
-            return False
+            return self._record(action_index, False)
 
-        return True
+        return self._record(action_index, True)
 
     def reroll(self) -> bool:
         """
@@ -66,13 +84,26 @@ class Client:
         """
         self._set_previous_board_as_now()
         if self._state.progress.reroll_left <= 0:
-            return False
+            return self._record(REROLL_ACTION, False)
+        self._action_mask = None
         self._state = reroll(
             self._state,
             self._randomness,
             self._council_pool,
         )
-        return True
+        return self._record(REROLL_ACTION, True)
+
+    def record_to(self, recorder: TrajectoryRecorder, seed: float) -> None:
+        """
+        Appends every later `pick` and `reroll` to `recorder`, as an episode
+        played on `seed`, with the draws each of them took.
+        """
+        if not isinstance(self._randomness, RecordingRandomness):
+            self._randomness = RecordingRandomness(self._randomness)
+        self._randomness.take_draws()
+
+        self._recorder = recorder
+        recorder.begin_episode(self, seed)
 
     def get_current_councils(self) -> list[Council]:
         """
@@ -80,9 +111,21 @@ class Client:
         You may use this method to access full information about current suggestion.
         """
         return [
-            self._council_pool.get_council(query) for query in self._state.suggestions
+            self._council_pool.get_council(index) for index in self._state.suggestions
         ]
 
+    def get_action_mask(self) -> BoolArray:
+        """
+        Read-only mask of the legal env actions; see `pylixir.application.mask`.
+        It is computed once per `pick`, `reroll` or `restore`, so changes made
+        to `get_state()` directly are not reflected.
+        """
+        if self._action_mask is None:
+            self._action_mask = get_action_mask(self._state, self._council_pool)
+            self._action_mask.flags.writeable = False
+
+        return self._action_mask
+
     def view(self) -> str:
         """
         Get terminal-friendly output to display current state.
@@ -98,12 +141,52 @@ class Client:
         """
         return self._state
 
+    def snapshot(self, with_randomness: bool = False) -> ClientSnapshot:
+        """
+        Get a snapshot of the game to `restore` later, e.g. to undo or to branch.
+        Randomness is only part of it `with_randomness`; otherwise draws after
+        `restore` keep advancing.
+        """
+        return ClientSnapshot(
+            state=self._state.snapshot(),
+            previous_board=(
+                self._previous_board.snapshot() if self._previous_board else None
+            ),
+            randomness=(
+                self._randomness.get_generator_state() if with_randomness else None
+            ),
+        )
+
+    def restore(self, snapshot: ClientSnapshot) -> None:
+        """
+        Restore the game to `snapshot`, which was taken from this client.
+        """
+        self._state.restore(snapshot.state)
+        self._action_mask = None
+        if snapshot.randomness is not None:
+            self._randomness.set_generator_state(snapshot.randomness)
+
+        if snapshot.previous_board is None:
+            self._previous_board = None
+        else:
+            self._previous_board = self._state.board.copy(deep=True)
+            self._previous_board.restore(snapshot.previous_board)
+
     def is_done(self) -> bool:
         """
         Returns whether game is done.
         """
         return self._state.progress.get_turn_left() == 0
 
+    def _record(self, action_index: int, accepted: bool) -> bool:
+        if self._recorder is not None:
+            assert isinstance(self._randomness, RecordingRandomness)
+            self._recorder.record(
+                self, action_index, accepted, self._randomness.take_draws()
+            )
+
+        return accepted
+
     def _set_previous_board_as_now(self) -> None:
         if self._show_previous_board:
             self._previous_board = self.get_state().board.copy(deep=True)
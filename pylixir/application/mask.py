@@ -0,0 +1,56 @@
+"""
+Legal action masks over the action space of the envs: `effect_index * 3 +
+sage_index` picks a council, and `REROLL_ACTION` rerolls the suggestions.
+
+Picks of exhausted sages and picks that `Council.is_forbidden` foresees, such as
+selecting a locked effect, are masked out without touching the state. Picks of
+councils that ignore `effect_index` only differ by that index, so only
+`effect_index` 0 of them is legal.
+"""
+from typing import Union
+
+import numpy as np
+import numpy.typing as npt
+
+from pylixir.application.reducer import (
+    PickCouncilAndEnchantAndRerollAction,
+    RerollAction,
+)
+from pylixir.application.service import CouncilPool
+from pylixir.core.state import GameState
+
+BoolArray = npt.NDArray[np.bool_]
+MaskAction = Union[PickCouncilAndEnchantAndRerollAction, RerollAction]
+
+EFFECT_COUNT = 5
+SAGE_COUNT = 3
+REROLL_ACTION = EFFECT_COUNT * SAGE_COUNT
+ACTION_SIZE = REROLL_ACTION + 1
+
+
+def get_action(action_index: int) -> MaskAction:
+    if action_index == REROLL_ACTION:
+        return RerollAction()
+
+    effect_index, sage_index = divmod(action_index, SAGE_COUNT)
+    return PickCouncilAndEnchantAndRerollAction(
+        effect_index=effect_index, sage_index=sage_index
+    )
+
+
+def get_action_mask(state: GameState, council_pool: CouncilPool) -> BoolArray:
+    """(ACTION_SIZE,) mask of the legal actions of `state`."""
+    mask = np.zeros(ACTION_SIZE, dtype=np.bool_)
+    if state.progress.turn_left <= 0:
+        return mask
+
+    for sage_index in state.committee.get_valid_slots():
+        council = council_pool.get_council(state.suggestions[sage_index])
+        effect_indices = range(EFFECT_COUNT) if council.uses_effect_index() else [0]
+        for effect_index in effect_indices:
+            mask[effect_index * SAGE_COUNT + sage_index] = not council.is_forbidden(
+                state, effect_index
+            )
+
+    mask[REROLL_ACTION] = state.progress.reroll_left > 0
+    return mask
@@ -0,0 +1,274 @@
+"""
+Trajectory recording.
+
+A `TrajectoryRecorder` attached with `Client.record_to` receives every `pick`
+and `reroll` of the client and appends a row of (episode, seed, turn,
+observation, action, reward, next observation, accepted, done, draws).
+
+Rows are buffered and written by a background thread in shards of `shard_size`
+rows. A shard is a directory of one `.npy` file per column, in narrow dtypes and
+uncompressed, so `load_shards` memory-maps it instead of reading it. Draws vary
+in length; they are stored flat, and `draw_offsets` delimits the draws of every
+row.
+
+Recorders may share a directory, e.g. one per env of a `SubprocVecEnv`. Each
+claims a recorder id there, which names its shards and prefixes its episodes, so
+neither shards nor episode ids collide.
+"""
+from __future__ import annotations
+
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable, Optional, Sequence
+
+import numpy as np
+import numpy.typing as npt
+
+if TYPE_CHECKING:
+    from pylixir.application.game import Client
+
+ObservationEncoder = Callable[["Client"], Sequence[int]]
+ValueFunction = Callable[["Client"], float]
+RewardShaping = Callable[[float], float]
+
+COLUMN_DTYPES: dict[str, npt.DTypeLike] = {
+    "episode": np.int64,
+    "seed": np.int64,
+    "turn": np.int16,
+    "observation": np.int16,
+    "action": np.int8,
+    "reward": np.float32,
+    "next_observation": np.int16,
+    "accepted": np.bool_,
+    "done": np.bool_,
+    "draws": np.int32,
+    "draw_offsets": np.int64,
+}
+# fields of `encode_state`
+STATE_ENCODING: dict[str, slice] = {
+    "values": slice(0, 5),
+    "locked": slice(5, 10),
+    "turn_left": slice(10, 11),
+    "reroll_left": slice(11, 12),
+    "powers": slice(12, 15),
+    "removed": slice(15, 18),
+    "suggestions": slice(18, 21),
+    "lucky_ratio": slice(21, 26),
+    "enchant_prob": slice(26, 31),
+}
+ODDS_SCALE = 1000
+SHARD_PREFIX = "shard-"
+RECORDER_PREFIX = "recorder-"
+# episode ids are `recorder id << EPISODE_BITS | episode of the recorder`.
+EPISODE_BITS = 32
+MAX_PENDING_SHARDS = 4
+
+
+def encode_state(client: Client) -> list[int]:
+    """
+    Raw integer encoding of the state of `client`: effect values and locks, turn
+    and reroll left, sages, suggestions, and enchant odds in per mille; see
+    `STATE_ENCODING`.
+    """
+    state = client.get_state()
+    effects = state.board.effects
+    sages = state.committee.sages
+    return (
+        [effect.value for effect in effects]
+        + [int(effect.locked) for effect in effects]
+        + [state.progress.turn_left, state.progress.reroll_left]
+        + [sage.power for sage in sages]
+        + [int(sage.is_removed) for sage in sages]
+        + list(state.suggestions)
+        + [round(ratio * ODDS_SCALE) for ratio in state.enchanter.query_lucky_ratio()]
+        + [
+            round(prob * ODDS_SCALE)
+            for prob in state.enchanter.query_enchant_prob(state.board.locked_indices())
+        ]
+    )
+
+
+def get_alive_valuation(client: Client) -> float:
+    """Sum of the first two effects that are not locked."""
+    state = client.get_state()
+    return float(
+        sum(effect.value for effect in state.board.effects[:2] if not effect.locked)
+    )
+
+
+class TrajectoryRecorder:
+    def __init__(
+        self,
+        directory: str,
+        encoder: ObservationEncoder = encode_state,
+        value: ValueFunction = get_alive_valuation,
+        rejected_reward: float = 0.0,
+        shard_size: int = 4096,
+        shaping: Optional[RewardShaping] = None,
+    ) -> None:
+        """
+        Rewards are differences of `value`, passed through `shaping` if given, or
+        `rejected_reward` for actions the client refused. Shards are appended
+        after those already in `directory`, including those of other recorders.
+        """
+        os.makedirs(directory, exist_ok=True)
+        self._directory = directory
+        self._encoder = encoder
+        self._value = value
+        self._rejected_reward = rejected_reward
+        self._shard_size = shard_size
+        self._shaping = shaping
+        self.recorder_id = _claim_recorder_id(directory)
+        self._shard_index = 0
+
+        self._rows: dict[str, list[Any]] = _empty_rows()
+        self._draw_count = 0
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._pending: list[Future[None]] = []
+
+        self._episode = (self.recorder_id << EPISODE_BITS) - 1
+        self._seed = 0
+        self._turn = 0
+        self._observation: list[int] = []
+        self._last_value = 0.0
+
+    def begin_episode(self, client: Client, seed: float) -> None:
+        self._episode += 1
+        self._seed = int(seed)
+        self._turn = client.get_state().progress.turn_passed
+        self._observation = list(self._encoder(client))
+        self._last_value = self._value(client)
+
+    def record(
+        self, client: Client, action: int, accepted: bool, draws: Sequence[int]
+    ) -> None:
+        """Appends the step that `client` just took; called by `Client`."""
+        if self._episode < self.recorder_id << EPISODE_BITS:
+            raise RuntimeError("begin_episode should be called before record")
+
+        observation = list(self._encoder(client))
+        value = self._value(client)
+        rows = self._rows
+        rows["episode"].append(self._episode)
+        rows["seed"].append(self._seed)
+        rows["turn"].append(self._turn)
+        rows["observation"].append(self._observation)
+        rows["action"].append(action)
+        reward = value - self._last_value
+        if self._shaping is not None:
+            reward = self._shaping(reward)
+        rows["reward"].append(reward if accepted else self._rejected_reward)
+        rows["next_observation"].append(observation)
+        rows["accepted"].append(accepted)
+        rows["done"].append(client.is_done())
+        rows["draws"] += draws
+        self._draw_count += len(draws)
+        rows["draw_offsets"].append(self._draw_count)
+
+        self._observation, self._last_value = observation, value
+        self._turn = client.get_state().progress.turn_passed
+        if len(rows["episode"]) >= self._shard_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Hands the buffered rows to the writer thread as a new shard."""
+        if len(self._rows["episode"]) == 0:
+            return
+
+        path = os.path.join(
+            self._directory,
+            f"{SHARD_PREFIX}{self.recorder_id:06d}-{self._shard_index:06d}",
+        )
+        self._pending = [future for future in self._pending if not future.done()]
+        if len(self._pending) >= MAX_PENDING_SHARDS:
+            # the game loop outpaces the disk; wait instead of buffering more.
+            self._pending.pop(0).result()
+
+        self._pending.append(self._executor.submit(_write_shard, path, self._rows))
+        self._rows = _empty_rows()
+        self._draw_count = 0
+        self._shard_index += 1
+
+    def close(self) -> None:
+        """Flushes and waits for every shard to be written."""
+        self.flush()
+        for future in self._pending:
+            future.result()
+        self._pending = []
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self) -> TrajectoryRecorder:
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+
+class TrajectoryShard:
+    """Columns of one shard, memory-mapped; see `COLUMN_DTYPES`."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.columns: dict[str, npt.NDArray[Any]] = {
+            name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r")
+            for name in COLUMN_DTYPES
+        }
+
+    def __len__(self) -> int:
+        return len(self.columns["episode"])
+
+    def __getitem__(self, name: str) -> npt.NDArray[Any]:
+        return self.columns[name]
+
+    def get_draws(self, row: int) -> npt.NDArray[np.int32]:
+        offsets = self.columns["draw_offsets"]
+        draws: npt.NDArray[np.int32] = self.columns["draws"][
+            offsets[row] : offsets[row + 1]
+        ]
+        return draws
+
+
+def get_shard_paths(directory: str) -> list[str]:
+    """Written shards of `directory`, by recorder id, then in the order written."""
+    if not os.path.isdir(directory):
+        return []
+
+    return [
+        os.path.join(directory, name)
+        for name in sorted(os.listdir(directory))
+        if name.startswith(SHARD_PREFIX) and not name.endswith(".tmp")
+    ]
+
+
+def load_shards(directory: str) -> list[TrajectoryShard]:
+    return [TrajectoryShard(path) for path in get_shard_paths(directory)]
+
+
+def _claim_recorder_id(directory: str) -> int:
+    # exclusive creation is atomic, so concurrent recorders never share an id.
+    recorder_id = sum(
+        name.startswith(RECORDER_PREFIX) for name in os.listdir(directory)
+    )
+    while True:
+        path = os.path.join(directory, f"{RECORDER_PREFIX}{recorder_id:06d}")
+        try:
+            with open(path, "x", encoding="utf-8") as f:
+                f.write(str(os.getpid()))
+            return recorder_id
+        except FileExistsError:
+            recorder_id += 1
+
+
+def _empty_rows() -> dict[str, list[Any]]:
+    rows: dict[str, list[Any]] = {name: [] for name in COLUMN_DTYPES}
+    rows["draw_offsets"].append(0)
+    return rows
+
+
+def _write_shard(path: str, rows: dict[str, list[Any]]) -> None:
+    # written aside and renamed, so readers never see a partial shard.
+    temporary = f"{path}.tmp"
+    os.makedirs(temporary, exist_ok=True)
+    for name, dtype in COLUMN_DTYPES.items():
+        np.save(os.path.join(temporary, f"{name}.npy"), np.asarray(rows[name], dtype))
+    os.rename(temporary, path)
@@ -1,8 +1,11 @@
+from typing import Sequence, cast
+
 import pydantic
 
 from pylixir.application.enchant import EnchantCommand
 from pylixir.application.service import CouncilPool
-from pylixir.core.base import Randomness
+from pylixir.core.base import DrawSlot, Randomness
+from pylixir.core.compact import CompactGameState
 from pylixir.core.state import GameState
 
 
@@ -15,17 +18,21 @@ class PickCouncilAndEnchantAndRerollAction(Action):
     sage_index: int
 
 
-def pick_council(
+class RerollAction(Action):
+    ...
+
+
+def apply_council_logics(
     action: PickCouncilAndEnchantAndRerollAction,
     state: GameState,
     randomness: Randomness,
     council_pool: CouncilPool,
 ) -> GameState:
-    council_query = state.suggestions[action.sage_index]
-    council = council_pool.get_council(council_query)
+    council = council_pool.get_council(state.suggestions[action.sage_index])
 
     try:
-        for logic in council.logics:
+        for idx, logic in enumerate(council.logics):
+            randomness.use_slot(DrawSlot.operation + idx)
             state = logic.apply(
                 state,
                 action.effect_index,
@@ -35,18 +42,46 @@ def pick_council(
         # print(council.descriptions[action.sage_index])
         raise e
 
+    return state
+
+
+def enchant_and_spend_turn(
+    action: PickCouncilAndEnchantAndRerollAction,
+    state: GameState,
+    randomness: Randomness,
+) -> GameState:
     state.committee.pick(action.sage_index)
 
     enchanted_result = EnchantCommand().enchant(state, randomness)
 
+    return apply_enchant_result(state, enchanted_result)
+
+
+def apply_enchant_result(
+    state: GameState, enchanted_result: Sequence[int]
+) -> GameState:
+    """Raises the board by `enchanted_result` and spends the turn."""
     for idx, amount in enumerate(enchanted_result):
         state.board.modify_effect_count(idx, amount)
 
-    state.enchanter.get_enchant_effect_count()
     state.progress.spent_turn(1)
     state.enchanter.elapse_turn()
+
+    return state
+
+
+def pick_council(
+    action: PickCouncilAndEnchantAndRerollAction,
+    state: GameState,
+    randomness: Randomness,
+    council_pool: CouncilPool,
+) -> GameState:
+    randomness.seek(state.progress.turn_passed + 1)
+    state = apply_council_logics(action, state, randomness, council_pool)
+    state = enchant_and_spend_turn(action, state, randomness)
+
     if state.progress.get_turn_left() != 0:
-        state.suggestions = council_pool.get_council_queries(
+        state.suggestions = council_pool.get_suggestions(
             state,
             randomness=randomness,
             is_reroll=False,
@@ -60,7 +95,9 @@ def reroll(
     randomness: Randomness,
     council_pool: CouncilPool,
 ) -> GameState:
-    state.suggestions = council_pool.get_council_queries(
+    # a reroll leaves fewer rerolls than the one before it in the same turn.
+    randomness.seek(state.progress.turn_passed, state.progress.reroll_left)
+    state.suggestions = council_pool.get_suggestions(
         state,
         randomness=randomness,
         is_reroll=True,
@@ -68,3 +105,28 @@ def reroll(
     state.progress.spent_reroll()
 
     return state
+
+
+def pick_council_compact(
+    action: PickCouncilAndEnchantAndRerollAction,
+    state: CompactGameState,
+    randomness: Randomness,
+    council_pool: CouncilPool,
+) -> CompactGameState:
+    """`pick_council` on `CompactGameState`, which duck-types `GameState`."""
+    return cast(
+        CompactGameState,
+        pick_council(action, cast(GameState, state), randomness, council_pool),
+    )
+
+
+def reroll_compact(
+    state: CompactGameState,
+    randomness: Randomness,
+    council_pool: CouncilPool,
+) -> CompactGameState:
+    """`reroll` on `CompactGameState`, which duck-types `GameState`."""
+    return cast(
+        CompactGameState,
+        reroll(cast(GameState, state), randomness, council_pool),
+    )
@@ -2,16 +2,16 @@ import abc
 
 from pylixir.application.council import Council
 from pylixir.core.base import Randomness
-from pylixir.core.state import CouncilQuery, GameState
+from pylixir.core.state import GameState, Suggestions
 
 
 class CouncilPool(metaclass=abc.ABCMeta):
     @abc.abstractmethod
-    def get_council_queries(
+    def get_suggestions(
         self, state: GameState, randomness: Randomness, is_reroll: bool = False
-    ) -> tuple[CouncilQuery, CouncilQuery, CouncilQuery]:
+    ) -> Suggestions:
         ...
 
     @abc.abstractmethod
-    def get_council(self, query: CouncilQuery) -> Council:
+    def get_council(self, index: int) -> Council:
         ...
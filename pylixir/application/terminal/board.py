@@ -1,5 +1,6 @@
 from typing import Optional
 
+from pylixir.application.enchant import EnchantCommand
 from pylixir.application.terminal.color import bcolors
 from pylixir.core.base import Board, Effect, Enchanter
 
@@ -42,9 +43,16 @@ def show_board(
 ) -> str:
     enchant_probs = enchanter.query_enchant_prob(board.locked_indices())
     lucky_ratios = enchanter.query_lucky_ratio()
+    odds = EnchantCommand().get_enchant_odds(
+        enchant_probs,
+        lucky_ratios,
+        enchanter.get_enchant_effect_count(),
+        enchanter.get_enchant_amount(),
+    )
 
     return "\n".join(
         f"{idx}: {_get_effect_repr(board.get(idx), previous_board.get(idx) if previous_board else None)}\
-  {enchant_probs[idx]*100:.2f}% | [{lucky_ratios[idx]*100:.0f}%]"
+  {enchant_probs[idx]*100:.2f}% | [{lucky_ratios[idx]*100:.0f}%]\
+ | hit {odds[idx].hit*100:.2f}% +{odds[idx].gain:.2f}"
         for idx in range(5)
     )
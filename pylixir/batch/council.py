@@ -0,0 +1,257 @@
+from typing import Hashable
+
+import numpy as np
+
+from pylixir.application.council import CouncilType, Logic
+from pylixir.batch.operation import (
+    NO_TARGET,
+    BatchFeatures,
+    OperationKernel,
+    SelectorKernel,
+    SelectorValidityFunction,
+    ValidityFunction,
+    get_operation_kernel,
+    get_selector_kernel,
+)
+from pylixir.batch.state import (
+    EFFECT_SIZE,
+    SAGE_SIZE,
+    BatchState,
+    BoolArray,
+    FloatArray,
+    IntArray,
+)
+from pylixir.core.committee import MAX_CHAOS, MAX_LAWFUL
+from pylixir.data.council.operation import SetValueRanged
+from pylixir.data.council_pool import ConcreteCouncilPool
+
+COUNCIL_TYPES = [
+    CouncilType.lawfulLock,
+    CouncilType.lawful,
+    CouncilType.chaosLock,
+    CouncilType.chaos,
+    CouncilType.lock,
+    CouncilType.common,
+    CouncilType.exhausted,
+]
+COUNCIL_TYPE_CODES = {
+    council_type: code for code, council_type in enumerate(COUNCIL_TYPES)
+}
+MAX_LOGIC_COUNT = 2
+
+
+def _logic_key(logic: Logic) -> Hashable:
+    operation, target_selector = logic.operation, logic.target_selector
+    return (
+        type(operation),
+        operation.ratio,
+        operation.value,
+        operation.remain_turn,
+        type(target_selector),
+        target_selector.target_condition,
+        target_selector.count,
+    )
+
+
+class BatchCouncilTable:
+    """
+    Council pool compiled into arrays.
+    Councils share identical logics a lot, so validity is evaluated once per
+    unique logic and gathered into a (rows, councils) matrix.
+    """
+
+    def __init__(self, council_pool: ConcreteCouncilPool) -> None:
+        councils = council_pool.get_councils()
+        self.council_ids = [council.id for council in councils]
+
+        self.pickup_ratio: FloatArray = np.array(
+            [council.pickup_ratio for council in councils], dtype=np.float64
+        )
+        self.turn_start: IntArray = np.array(
+            [council.turn_range[0] for council in councils], dtype=np.int64
+        )
+        self.turn_end: IntArray = np.array(
+            [council.turn_range[1] for council in councils], dtype=np.int64
+        )
+        self.slot_type: IntArray = np.array(
+            [council.slot_type for council in councils], dtype=np.int64
+        )
+        self.type_code: IntArray = np.array(
+            [COUNCIL_TYPE_CODES[council.type] for council in councils], dtype=np.int64
+        )
+        self.uses_effect_index: BoolArray = np.array(
+            [council.uses_effect_index() for council in councils], dtype=np.bool_
+        )
+        self.forbidden: BoolArray = np.array(
+            [
+                any(logic.operation.is_forbidden() for logic in council.logics)
+                for council in councils
+            ],
+            dtype=np.bool_,
+        )
+        # (councils, effects) effects selected whatever the state is.
+        self.fixed_targets: BoolArray = np.zeros(
+            (len(councils), EFFECT_SIZE), dtype=np.bool_
+        )
+        for council_index, council in enumerate(councils):
+            for logic in council.logics:
+                for target in logic.target_selector.fixed_targets():
+                    if 0 <= target < EFFECT_SIZE:
+                        self.fixed_targets[council_index, target] = True
+
+        self.logics: list[Logic] = []
+        logic_indices: dict[Hashable, int] = {}
+        self.council_logics: IntArray = np.full(
+            (len(councils), MAX_LOGIC_COUNT), NO_TARGET, dtype=np.int64
+        )
+        for council_index, council in enumerate(councils):
+            if len(council.logics) > MAX_LOGIC_COUNT:
+                raise ValueError(f"Council {council.id} has too many logics")
+
+            for slot, logic in enumerate(council.logics):
+                key = _logic_key(logic)
+                if key not in logic_indices:
+                    logic_indices[key] = len(self.logics)
+                    self.logics.append(logic)
+                self.council_logics[council_index, slot] = logic_indices[key]
+
+        self._kernels: list[tuple[OperationKernel, SelectorKernel]] = []
+        self._validities: list[tuple[ValidityFunction, SelectorValidityFunction]] = []
+        for logic in self.logics:
+            operation_kernel, operation_validity = get_operation_kernel(logic.operation)
+            selector_kernel, selector_validity = get_selector_kernel(
+                logic.target_selector
+            )
+            self._kernels.append((operation_kernel, selector_kernel))
+            self._validities.append((operation_validity, selector_validity))
+
+    def __len__(self) -> int:
+        return len(self.council_ids)
+
+    def get_kernels(self, logic_index: int) -> tuple[OperationKernel, SelectorKernel]:
+        return self._kernels[logic_index]
+
+    def logic_validity(self, features: BatchFeatures) -> BoolArray:
+        """
+        Vectorized `Logic.is_valid`, shape (rows, logics + 1).
+        The trailing column stands for an empty logic slot and is always valid.
+        """
+        validity = np.ones((len(features), len(self.logics) + 1), dtype=np.bool_)
+
+        for logic_index, logic in enumerate(self.logics):
+            operation_validity, selector_validity = self._validities[logic_index]
+            operation, target_selector = logic.operation, logic.target_selector
+            valid = operation_validity(features, operation)
+
+            if operation.is_lock_operation() and hasattr(
+                target_selector, "target_index"
+            ):
+                valid = (
+                    valid
+                    & ~features.locked[:, getattr(target_selector, "target_index")]
+                )
+            else:
+                valid = valid & selector_validity(features, target_selector)
+                if isinstance(operation, SetValueRanged):
+                    valid = valid & (
+                        features.values[:, target_selector.target_condition - 1]
+                        < operation.value[1]
+                    )
+
+            validity[:, logic_index] = valid
+
+        return validity
+
+    def validity(self, state: BatchState, rows: IntArray) -> BoolArray:
+        """Vectorized `Council.is_valid`, shape (rows, councils)."""
+        features = BatchFeatures(state, rows)
+        logic_validity = self.logic_validity(features)
+
+        valid = np.ones((len(rows), len(self)), dtype=np.bool_)
+        for slot in range(MAX_LOGIC_COUNT):
+            valid &= logic_validity[:, self.council_logics[:, slot]]
+
+        current_turn = features.turn_passed[:, None]
+        in_range: BoolArray = (self.turn_start[None, :] == 0) | (
+            (self.turn_start[None, :] <= current_turn)
+            & (current_turn <= self.turn_end[None, :])
+        )
+        return valid & in_range
+
+    def council_types(self, state: BatchState, rows: IntArray) -> IntArray:
+        """Vectorized `ConcreteCouncilPool._get_council_type`, shape (rows, sages)."""
+        features = BatchFeatures(state, rows)
+        requires_lock = features.requires_lock[:, None]
+        power = state.sage_power[rows]
+
+        def _code(council_type: CouncilType) -> int:
+            return COUNCIL_TYPE_CODES[council_type]
+
+        council_type = np.where(
+            requires_lock, _code(CouncilType.lock), _code(CouncilType.common)
+        )
+        council_type = np.where(
+            power == MAX_CHAOS,
+            np.where(
+                requires_lock, _code(CouncilType.chaosLock), _code(CouncilType.chaos)
+            ),
+            council_type,
+        )
+        council_type = np.where(
+            power == MAX_LAWFUL,
+            np.where(
+                requires_lock,
+                _code(CouncilType.lawfulLock),
+                _code(CouncilType.lawful),
+            ),
+            council_type,
+        )
+        return np.where(
+            state.sage_removed[rows], _code(CouncilType.exhausted), council_type
+        )
+
+    def sample(
+        self,
+        state: BatchState,
+        rows: IntArray,
+        rng: np.random.Generator,
+        is_reroll: bool = False,
+    ) -> None:
+        """
+        Vectorized `ConcreteCouncilPool.get_council_set`; writes suggestions.
+        Samples directly from the valid candidates, which yields the same
+        distribution as the rejection sampling of the scalar pool.
+        """
+        if len(rows) == 0:
+            return
+
+        row_range = np.arange(len(rows))
+        valid = self.validity(state, rows)
+        council_types = self.council_types(state, rows)
+        previous = state.suggestions[rows].copy()
+        forbidden = np.zeros((len(rows), len(self)), dtype=np.bool_)
+
+        for sage_index in range(SAGE_SIZE):
+            sage_forbidden = forbidden.copy()
+            if is_reroll:
+                sage_forbidden[row_range, previous[:, sage_index]] = True
+
+            candidates = (
+                valid
+                & ~sage_forbidden
+                & (self.type_code[None, :] == council_types[:, sage_index, None])
+                & np.isin(self.slot_type, (3, sage_index))[None, :]
+            )
+            weights = np.where(candidates, self.pickup_ratio[None, :], 0.0)
+            cumulative = np.cumsum(weights, axis=1)
+            total = cumulative[:, -1]
+            if (total <= 0).any():
+                raise ValueError("No council available for some rows")
+
+            pivot = rng.random(len(rows)) * total
+            # `pivot` may reach the total by rounding; the last weighted one wins.
+            last_index = len(self) - 1 - np.argmax(weights[:, ::-1] > 0, axis=1)
+            chosen = np.minimum((cumulative <= pivot[:, None]).sum(axis=1), last_index)
+
+            state.suggestions[rows, sage_index] = chosen
+            forbidden[row_range, chosen] = True
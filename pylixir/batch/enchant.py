@@ -0,0 +1,71 @@
+import numpy as np
+
+from pylixir.batch.state import FloatArray, IntArray
+
+
+def draw_enchant_uniforms(count: IntArray, rng: np.random.Generator) -> FloatArray:
+    """
+    (step, 2, row) uniforms for `enchant_from_uniforms`: the effect pick and the
+    lucky roll of every step, drawn step after step.
+    """
+    steps = int(count.max(initial=0))
+    uniforms: FloatArray = rng.random((steps, 2, len(count)))
+    return uniforms
+
+
+def enchant_from_uniforms(
+    prob: FloatArray,
+    lucky_ratio: FloatArray,
+    count: IntArray,
+    amount: IntArray,
+    uniforms: FloatArray,
+) -> IntArray:
+    """
+    Batched `EnchantCommand.get_enchant_result` over pre-drawn uniforms.
+    At each step, a row picks one of its unpicked effects by inverse-CDF
+    sampling over `prob` with `uniforms[step, 0]`, as `random.choices` does,
+    and adds `amount` to it, +1 when `uniforms[step, 1]` falls below its lucky
+    ratio. Rows stop after `count` steps or once every effect is picked.
+    """
+    width = prob.shape[1]
+    # effects on the first axis: every operation below runs on contiguous rows.
+    masked_prob = prob.T.copy()
+    lucky_by_effect = lucky_ratio.T
+    result = np.zeros(masked_prob.shape, dtype=np.int64)
+
+    for step in range(uniforms.shape[0]):
+        total = masked_prob.sum(axis=0)
+        active = (step < count) & (total != 0)
+        pivot = uniforms[step, 0] * total
+
+        # index of the first running total above `pivot`, as `bisect_right`.
+        target_index = np.zeros(len(count), dtype=np.int64)
+        cumulative = np.zeros(len(count))
+        for index in range(width - 1):
+            cumulative += masked_prob[index]
+            target_index += cumulative <= pivot
+        # `pivot` may reach the total by rounding; the last weighted effect wins.
+        last_index = width - 1 - np.argmax(masked_prob[::-1] > 0, axis=0)
+        target_index = np.minimum(target_index, last_index)
+
+        for index in range(width):
+            picked = active & (target_index == index)
+            lucky = uniforms[step, 1] < lucky_by_effect[index]
+            result[index] += np.where(picked, amount + lucky, 0)
+            masked_prob[index][picked] = 0
+
+    enchanted: IntArray = result.T
+    return enchanted
+
+
+def sample_enchant(
+    prob: FloatArray,
+    lucky_ratio: FloatArray,
+    count: IntArray,
+    amount: IntArray,
+    rng: np.random.Generator,
+) -> IntArray:
+    """`enchant_from_uniforms` on uniforms drawn from `rng`."""
+    return enchant_from_uniforms(
+        prob, lucky_ratio, count, amount, draw_enchant_uniforms(count, rng)
+    )
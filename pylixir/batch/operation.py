@@ -0,0 +1,903 @@
+"""
+Vectorized counterparts of `pylixir.data.council` operations and selectors.
+
+Every function works on the subset `rows` of a `BatchState`:
+
+- selector kernels return ordered target indices, shape (len(rows), 5),
+  padded with -1.
+- operation kernels update the state in place and return a boolean mask of rows
+  where the scalar operation would have failed. Those rows may be left
+  half-updated; the caller restores them.
+- validity functions mirror `ElixirOperation.is_valid`/`TargetSelector.is_valid`
+  on `BatchFeatures`.
+"""
+from typing import Callable, Type
+
+import numpy as np
+
+from pylixir.application.council import ElixirOperation, TargetSelector
+from pylixir.batch.state import EFFECT_SIZE, BatchState, BoolArray, FloatArray, IntArray
+from pylixir.core.base import MutationTarget
+from pylixir.data.council import operation as op
+from pylixir.data.council import target as selector
+
+NO_TARGET = -1
+
+SelectorKernel = Callable[
+    [BatchState, IntArray, IntArray, TargetSelector, np.random.Generator], IntArray
+]
+OperationKernel = Callable[
+    [BatchState, IntArray, IntArray, ElixirOperation, np.random.Generator],
+    BoolArray,
+]
+
+
+class BatchFeatures:
+    """Per-row quantities that council validity depends on."""
+
+    def __init__(self, state: BatchState, rows: IntArray) -> None:
+        self.values: IntArray = state.values[rows]
+        self.locked: BoolArray = state.locked[rows]
+        self.mutable: BoolArray = ~self.locked & (self.values < state.max_value)
+        self.n_locked: IntArray = self.locked.sum(axis=1)
+        self.n_mutable: IntArray = self.mutable.sum(axis=1)
+        self.turn_left: IntArray = state.turn_left[rows]
+        self.turn_passed: IntArray = state.total_turn - self.turn_left
+        self.n_valid_sages: IntArray = (~state.sage_removed[rows]).sum(axis=1)
+        self.requires_lock: BoolArray = self.turn_left <= 3 - self.n_locked
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+ValidityFunction = Callable[[BatchFeatures, ElixirOperation], BoolArray]
+SelectorValidityFunction = Callable[[BatchFeatures, TargetSelector], BoolArray]
+
+
+def _ordered_targets(mask: BoolArray, keys: FloatArray, limit: int) -> IntArray:
+    order = np.argsort(np.where(mask, keys, np.inf), axis=1, kind="stable")
+    taken = np.minimum(mask.sum(axis=1), limit)
+    return np.where(np.arange(EFFECT_SIZE)[None, :] < taken[:, None], order, NO_TARGET)
+
+
+def _ascending_targets(mask: BoolArray, limit: int = EFFECT_SIZE) -> IntArray:
+    return _ordered_targets(mask, np.zeros(mask.shape), limit)
+
+
+def _fixed_targets(size: int, indices: list[int]) -> IntArray:
+    targets = np.full((size, EFFECT_SIZE), NO_TARGET, dtype=np.int64)
+    targets[:, : len(indices)] = indices
+    return targets
+
+
+def random_index(mask: BoolArray, rng: np.random.Generator) -> IntArray:
+    """Uniformly pick one True column per row; -1 for rows without any."""
+    keys = np.where(mask, rng.random(mask.shape), -1.0)
+    return np.where(mask.any(axis=1), np.argmax(keys, axis=1), NO_TARGET)
+
+
+def _extreme_candidates(
+    values: IntArray, mutable: BoolArray, find_max: bool
+) -> BoolArray:
+    if find_max:
+        extreme = np.where(mutable, values, np.iinfo(np.int64).min).max(axis=1)
+    else:
+        extreme = np.where(mutable, values, np.iinfo(np.int64).max).min(axis=1)
+
+    candidates: BoolArray = mutable & (values == extreme[:, None])
+    return candidates
+
+
+def choose_extreme_index(
+    state: BatchState, rows: IntArray, rng: np.random.Generator, find_max: bool
+) -> IntArray:
+    """Vectorized `choose_max_indices`/`choose_min_indices` with count 1."""
+    mutable = state.mutable()[rows]
+    return random_index(_extreme_candidates(state.values[rows], mutable, find_max), rng)
+
+
+def single_target(targets: IntArray) -> tuple[IntArray, BoolArray]:
+    mismatch = (targets != NO_TARGET).sum(axis=1) != 1
+    return np.where(mismatch, 0, targets[:, 0]), mismatch
+
+
+def redistribute(
+    basis: IntArray,
+    eligible: BoolArray,
+    count: IntArray,
+    max_value: int,
+    rng: np.random.Generator,
+) -> IntArray:
+    """Vectorized `Randomness.redistribute` over the `eligible` columns."""
+    result = basis.copy()
+    remaining = count.copy()
+    row_range = np.arange(len(basis))
+
+    while True:
+        valid = eligible & (result < max_value)
+        active = (remaining > 0) & valid.any(axis=1)
+        if not active.any():
+            return result
+
+        index = random_index(valid, rng)
+        result[row_range[active], index[active]] += 1
+        remaining[active] -= 1
+
+
+def _no_rejection(rows: IntArray) -> BoolArray:
+    return np.zeros(len(rows), dtype=np.bool_)
+
+
+def _all_rejected(rows: IntArray) -> BoolArray:
+    return np.ones(len(rows), dtype=np.bool_)
+
+
+## Selectors
+
+
+def select_none(
+    state: BatchState,
+    rows: IntArray,
+    effect_index: IntArray,
+    target_selector: TargetSelector,
+    rng: np.random.Generator,
+) -> IntArray:
+    return _fixed_targets(len(rows), [])
+
+
+def select_random(
+    state: BatchState,
+    rows: IntArray,
+    effect_index: IntArray,
+    target_selector: TargetSelector,
+    rng: np.random.Generator,
+) -> IntArray:
+    return _ordered_targets(
+        state.mutable()[rows],
+        rng.random((len(rows), EFFECT_SIZE)),
+        target_selector.count,
+    )
+
+
+def select_proposed(
+    state: BatchState,
+    rows: IntArray,
+    effect_index: IntArray,
+    target_selector: TargetSelector,
+    rng: np.random.Generator,
+) -> IntArray:
+    return _fixed_targets(len(rows), [target_selector.target_condition - 1])
+
+
+def _select_extreme(
+    state: BatchState,
+    rows: IntArray,
+    target_selector: TargetSelector,
+    rng: np.random.Generator,
+    find_max: bool,
+) -> IntArray:
+    mutable = state.mutable()[rows]
+    candidates = _extreme_candidates(state.values[rows], mutable, find_max)
+    chosen = _ordered_targets(
+        candidates, rng.random((len(rows), EFFECT_SIZE)), target_selector.count
+    )
+    fallback = _ascending_targets(~state.locked[rows], target_selector.count)
+
+    return np.where(mutable.any(axis=1)[:, None], chosen, fallback)
+
+
+def select_min_value(
+    state: BatchState,
+    rows: IntArray,
+    effect_index: IntArray,
+    target_selector: TargetSelector,
+    rng: np.random.Generator,
+) -> IntArray:
+    return _select_extreme(state, rows, target_selector, rng, find_max=False)
+
+
+def select_max_value(
+    state: BatchState,
+    rows: IntArray,
+    effect_index: IntArray,
+    target_selector: TargetSelector,
+    rng: np.random.Generator,
+) -> IntArray:
+    return _select_extreme(state, rows, target_selector, rng, find_max=True)
+
+
+def select_user(
+    state: BatchState,
+    rows: IntArray,
+    effect_index: IntArray,
+    target_selector: TargetSelector,
+    rng: np.random.Generator,
+) -> IntArray:
+    targets = _fixed_targets(len(rows), [])
+    targets[:, 0] = effect_index
+    return targets
+
+
+def select_lte_value(
+    state: BatchState,
+    rows: IntArray,
+    effect_index: IntArray,
+    target_selector: TargetSelector,
+    rng: np.random.Generator,
+) -> IntArray:
+    return _ascending_targets(
+        state.mutable()[rows] & (state.values[rows] <= target_selector.target_condition)
+    )
+
+
+def select_one_three_five(
+    state: BatchState,
+    rows: IntArray,
+    effect_index: IntArray,
+    target_selector: TargetSelector,
+    rng: np.random.Generator,
+) -> IntArray:
+    return _fixed_targets(len(rows), [0, 2, 4])
+
+
+def select_two_four(
+    state: BatchState,
+    rows: IntArray,
+    effect_index: IntArray,
+    target_selector: TargetSelector,
+    rng: np.random.Generator,
+) -> IntArray:
+    return _fixed_targets(len(rows), [1, 3])
+
+
+## Operations
+
+
+def _add_target_mutations(
+    state: BatchState,
+    rows: IntArray,
+    targets: IntArray,
+    target: MutationTarget,
+    value: float,
+    remain_turn: int,
+) -> None:
+    for column in range(EFFECT_SIZE):
+        selected = targets[:, column] != NO_TARGET
+        state.add_mutation(
+            rows[selected], target, targets[selected, column], value, remain_turn
+        )
+
+
+def mutate_prob(
+    state: BatchState,
+    rows: IntArray,
+    targets: IntArray,
+    operation: ElixirOperation,
+    rng: np.random.Generator,
+) -> BoolArray:
+    _add_target_mutations(
+        state,
+        rows,
+        targets,
+        MutationTarget.prob,
+        operation.value[0] / 10000,
+        operation.remain_turn,
+    )
+    return _no_rejection(rows)
+
+
+def mutate_lucky_ratio(
+    state: BatchState,
+    rows: IntArray,
+    targets: IntArray,
+    operation: ElixirOperation,
+    rng: np.random.Generator,
+) -> BoolArray:
+    _add_target_mutations(
+        state,
+        rows,
+        targets,
+        MutationTarget.lucky_ratio,
+        operation.value[0] / 10000,
+        operation.remain_turn,
+    )
+    return _no_rejection(rows)
+
+
+def increase_target_with_ratio(
+    state: BatchState,
+    rows: IntArray,
+    targets: IntArray,
+    operation: ElixirOperation,
+    rng: np.random.Generator,
+) -> BoolArray:
+    for column in range(EFFECT_SIZE):
+        success = rng.random(len(rows)) < operation.ratio / 10000
+        selected = (targets[:, column] != NO_TARGET) & success
+        state.modify_effect_count(
+            rows[selected], targets[selected, column], operation.value[0]
+        )
+
+    return _no_rejection(rows)
+
+
+def increase_target_ranged(
+    state: BatchState,
+    rows: IntArray,
+    targets: IntArray,
+    operation: ElixirOperation,
+    rng: np.random.Generator,
+) -> BoolArray:
+    target, rejected = single_target(targets)
+    diff_min, diff_max = operation.value
+    state.modify_effect_count(
+        rows, target, rng.integers(diff_min, diff_max + 1, size=len(rows))
+    )
+    return rejected
+
+
+def decrease_turn_left(
+    state: BatchState,
+    rows: IntArray,
+    targets: IntArray,
+    operation: ElixirOperation,
+    rng: np.random.Generator,
+) -> BoolArray:
+    state.turn_left[rows] -= operation.value[0]
+    return _no_rejection(rows)
+
+
+def shuffle_all(
+    state: BatchState,
+    rows: IntArray,
+    targets: IntArray,
+    operation: ElixirOperation,
+    rng: np.random.Generator,
+) -> BoolArray:
+    locked = state.locked[rows]
+    keys = np.where(locked, np.inf, rng.random(locked.shape))
+
+    source = np.argsort(keys, axis=1, kind="stable")
+    destination = np.argsort(locked, axis=1, kind="stable")
+
+    values = state.values[rows]
+    shuffled = values.copy()
+    np.put_along_axis(
+        shuffled, destination, np.take_along_axis(values, source, axis=1), axis=1
+    )
+    state.values[rows] = shuffled
+    return _no_rejection(rows)
+
+
+def set_enchant_target_and_amount(
+    state: BatchState,
+    rows: IntArray,
+    targets: IntArray,
+    operation: ElixirOperation,
+    rng: np.random.Generator,
+) -> BoolArray:
+    target, rejected = single_target(targets)
+    state.add_mutation(rows, MutationTarget.prob, target, 1.0, operation.remain_turn)
+    state.add_mutation(
+        rows, MutationTarget.enchant_increase_amount, -1, operation.value[0], 1
+    )
+    return rejected
+
+
+def unlock_and_lock_other(
+    state: BatchState,
+    rows: IntArray,
+    targets: IntArray,
+    operation: ElixirOperation,
+    rng: np.random.Generator,
+) -> BoolArray:
+    locked = state.locked[rows]
+    will_unlock = random_index(locked, rng)
+    will_lock = random_index(~locked, rng)
+    rejected: BoolArray = (will_unlock == NO_TARGET) | (will_lock == NO_TARGET)
+
+    state.locked[rows, will_lock] = True
+    state.locked[rows, will_unlock] = False
+    return rejected
+
+
+def no_operation(
+    state: BatchState,
+    rows: IntArray,
+    targets: IntArray,
+    operation: ElixirOperation,
+    rng: np.random.Generator,
+) -> BoolArray:
+    return _no_rejection(rows)
+
+
+def forbidden_operation(
+    state: BatchState,
+    rows: IntArray,
+    targets: IntArray,
+    operation: ElixirOperation,
+    rng: np.random.Generator,
+) -> BoolArray:
+    return _all_rejected(rows)
+
+
+def lock_target(
+    state: BatchState,
+    rows: IntArray,
+    targets: IntArray,
+    operation: ElixirOperation,
+    rng: np.random.Generator,
+) -> BoolArray:
+    target, rejected = single_target(targets)
+    state.locked[rows, target] = True
+    return rejected
+
+
+def increase_reroll(
+    state: BatchState,
+    rows: IntArray,
+    targets: IntArray,
+    operation: ElixirOperation,
+    rng: np.random.Generator,
+) -> BoolArray:
+    state.reroll_left[rows] += operation.value[0]
+    return _no_rejection(rows)
+
+
+def set_enchant_increase_amount(
+    state: BatchState,
+    rows: IntArray,
+    targets: IntArray,
+    operation: ElixirOperation,
+    rng: np.random.Generator,
+) -> BoolArray:
+    state.add_mutation(
+        rows, MutationTarget.enchant_increase_amount, -1, operation.value[0], 1
+    )
+    return _no_rejection(rows)
+
+
+def set_enchant_effect_count(
+    state: BatchState,
+    rows: IntArray,
+    targets: IntArray,
+    operation: ElixirOperation,
+    rng: np.random.Generator,
+) -> BoolArray:
+    state.add_mutation(
+        rows, MutationTarget.enchant_effect_count, -1, operation.value[0], 1
+    )
+    return _no_rejection(rows)
+
+
+def set_value_ranged(
+    state: BatchState,
+    rows: IntArray,
+    targets: IntArray,
+    operation: ElixirOperation,
+    rng: np.random.Generator,
+) -> BoolArray:
+    target, rejected = single_target(targets)
+    value_min, value_max = operation.value
+    state.values[rows, target] = rng.integers(value_min, value_max + 1, size=len(rows))
+    return rejected
+
+
+def redistribute_all(
+    state: BatchState,
+    rows: IntArray,
+    targets: IntArray,
+    operation: ElixirOperation,
+    rng: np.random.Generator,
+) -> BoolArray:
+    unlocked = ~state.locked[rows]
+    values = state.values[rows]
+
+    redistributed = redistribute(
+        np.zeros_like(values),
+        unlocked,
+        np.where(unlocked, values, 0).sum(axis=1),
+        state.max_value,
+        rng,
+    )
+    state.values[rows] = np.where(unlocked, redistributed, values)
+    return _no_rejection(rows)
+
+
+def _redistribute_to_others(
+    state: BatchState, rows: IntArray, source: IntArray, rng: np.random.Generator
+) -> None:
+    row_range = np.arange(len(rows))
+    values = state.values[rows]
+    others = ~state.locked[rows] & (np.arange(EFFECT_SIZE)[None, :] != source[:, None])
+
+    redistributed = redistribute(
+        values, others, values[row_range, source], state.max_value, rng
+    )
+    redistributed = np.where(others, redistributed, values)
+    redistributed[row_range, source] = 0
+    state.values[rows] = redistributed
+
+
+def redistribute_selected_to_others(
+    state: BatchState,
+    rows: IntArray,
+    targets: IntArray,
+    operation: ElixirOperation,
+    rng: np.random.Generator,
+) -> BoolArray:
+    target, rejected = single_target(targets)
+    _redistribute_to_others(state, rows, target, rng)
+    return rejected
+
+
+def _redistribute_extreme_to_others(
+    state: BatchState, rows: IntArray, rng: np.random.Generator, find_max: bool
+) -> BoolArray:
+    source = choose_extreme_index(state, rows, rng, find_max=find_max)
+    rejected: BoolArray = source == NO_TARGET
+    _redistribute_to_others(state, rows, np.where(rejected, 0, source), rng)
+    return rejected
+
+
+def redistribute_min_to_others(
+    state: BatchState,
+    rows: IntArray,
+    targets: IntArray,
+    operation: ElixirOperation,
+    rng: np.random.Generator,
+) -> BoolArray:
+    return _redistribute_extreme_to_others(state, rows, rng, find_max=False)
+
+
+def redistribute_max_to_others(
+    state: BatchState,
+    rows: IntArray,
+    targets: IntArray,
+    operation: ElixirOperation,
+    rng: np.random.Generator,
+) -> BoolArray:
+    return _redistribute_extreme_to_others(state, rows, rng, find_max=True)
+
+
+def shift_all(
+    state: BatchState,
+    rows: IntArray,
+    targets: IntArray,
+    operation: ElixirOperation,
+    rng: np.random.Generator,
+) -> BoolArray:
+    locked = state.locked[rows]
+    values = state.values[rows]
+    direction_offset = -1 if (operation.value[0] == 0) else 1
+
+    unlocked_count = np.maximum((~locked).sum(axis=1), 1)
+    positions = np.argsort(locked, axis=1, kind="stable")
+    columns = np.arange(EFFECT_SIZE)[None, :]
+    shifted_slots = (columns + direction_offset) % unlocked_count[:, None]
+    destination = np.where(
+        columns < unlocked_count[:, None],
+        np.take_along_axis(positions, shifted_slots, axis=1),
+        positions,
+    )
+
+    shifted = values.copy()
+    np.put_along_axis(
+        shifted, destination, np.take_along_axis(values, positions, axis=1), axis=1
+    )
+    state.values[rows] = shifted
+    return _no_rejection(rows)
+
+
+def swap_values(
+    state: BatchState,
+    rows: IntArray,
+    targets: IntArray,
+    operation: ElixirOperation,
+    rng: np.random.Generator,
+) -> BoolArray:
+    a_idx, b_idx = operation.value
+    original = state.values[rows]
+    state.values[rows, a_idx] = original[:, b_idx]
+    state.values[rows, b_idx] = original[:, a_idx]
+    return _no_rejection(rows)
+
+
+def _swap_min_max(
+    state: BatchState,
+    rows: IntArray,
+    rng: np.random.Generator,
+    max_decrement: int,
+) -> BoolArray:
+    row_range = np.arange(len(rows))
+    original = state.values[rows]
+    min_index = choose_extreme_index(state, rows, rng, find_max=False)
+    max_index = choose_extreme_index(state, rows, rng, find_max=True)
+    rejected: BoolArray = (min_index == NO_TARGET) | (max_index == NO_TARGET)
+
+    state.values[rows, min_index] = original[row_range, max_index] - max_decrement
+    state.values[rows, max_index] = original[row_range, min_index]
+    return rejected
+
+
+def swap_min_max(
+    state: BatchState,
+    rows: IntArray,
+    targets: IntArray,
+    operation: ElixirOperation,
+    rng: np.random.Generator,
+) -> BoolArray:
+    return _swap_min_max(state, rows, rng, max_decrement=0)
+
+
+def decrease_max_and_swap_min_max(
+    state: BatchState,
+    rows: IntArray,
+    targets: IntArray,
+    operation: ElixirOperation,
+    rng: np.random.Generator,
+) -> BoolArray:
+    return _swap_min_max(state, rows, rng, max_decrement=1)
+
+
+def exhaust(
+    state: BatchState,
+    rows: IntArray,
+    targets: IntArray,
+    operation: ElixirOperation,
+    rng: np.random.Generator,
+) -> BoolArray:
+    state.sage_removed[rows, operation.value[0] - 1] = True
+    return _no_rejection(rows)
+
+
+def _increase_extreme_and_decrease_target(
+    state: BatchState,
+    rows: IntArray,
+    targets: IntArray,
+    operation: ElixirOperation,
+    rng: np.random.Generator,
+    find_max: bool,
+) -> BoolArray:
+    row_range = np.arange(len(rows))
+    original = state.values[rows]
+    extreme_increment, target_increment = operation.value
+
+    chosen = choose_extreme_index(state, rows, rng, find_max=find_max)
+    rejected: BoolArray = chosen == NO_TARGET
+    state.values[rows, chosen] = original[row_range, chosen] + extreme_increment
+
+    for column in range(EFFECT_SIZE):
+        target = targets[:, column]
+        collided = target == chosen
+        # prevents increase-decrease collision
+        replacement = random_index(
+            state.mutable()[rows]
+            & (np.arange(EFFECT_SIZE)[None, :] != chosen[:, None]),
+            rng,
+        )
+        target = np.where(collided, replacement, target)
+        rejected |= collided & (replacement == NO_TARGET)
+
+        selected = target != NO_TARGET
+        state.values[rows[selected], target[selected]] = (
+            original[row_range[selected], target[selected]] + target_increment
+        )
+
+    return rejected
+
+
+def increase_max_and_decrease_target(
+    state: BatchState,
+    rows: IntArray,
+    targets: IntArray,
+    operation: ElixirOperation,
+    rng: np.random.Generator,
+) -> BoolArray:
+    return _increase_extreme_and_decrease_target(
+        state, rows, targets, operation, rng, find_max=True
+    )
+
+
+def increase_min_and_decrease_target(
+    state: BatchState,
+    rows: IntArray,
+    targets: IntArray,
+    operation: ElixirOperation,
+    rng: np.random.Generator,
+) -> BoolArray:
+    return _increase_extreme_and_decrease_target(
+        state, rows, targets, operation, rng, find_max=False
+    )
+
+
+def decrease_first_target_and_swap(
+    state: BatchState,
+    rows: IntArray,
+    targets: IntArray,
+    operation: ElixirOperation,
+    rng: np.random.Generator,
+) -> BoolArray:
+    first_target, second_target = operation.value
+    original = state.values[rows]
+    state.values[rows, second_target] = original[:, first_target] - 1
+    state.values[rows, first_target] = original[:, second_target]
+    return _no_rejection(rows)
+
+
+## Validity
+
+
+def _always_valid(features: BatchFeatures, operation: ElixirOperation) -> BoolArray:
+    return np.ones(len(features), dtype=np.bool_)
+
+
+def _decrease_turn_left_valid(
+    features: BatchFeatures, operation: ElixirOperation
+) -> BoolArray:
+    return features.turn_left > operation.value[0] + features.n_locked + 3
+
+
+def _unlock_and_lock_other_valid(
+    features: BatchFeatures, operation: ElixirOperation
+) -> BoolArray:
+    has_locked: BoolArray = features.n_locked != 0
+    return has_locked
+
+
+def _lock_target_valid(
+    features: BatchFeatures, operation: ElixirOperation
+) -> BoolArray:
+    return features.requires_lock
+
+
+def _set_enchant_effect_count_valid(
+    features: BatchFeatures, operation: ElixirOperation
+) -> BoolArray:
+    return features.n_mutable >= operation.value[0]
+
+
+def _swap_values_valid(
+    features: BatchFeatures, operation: ElixirOperation
+) -> BoolArray:
+    a_idx, b_idx = operation.value
+    valid: BoolArray = (
+        (features.turn_passed > 0)
+        & features.mutable[:, a_idx]
+        & features.mutable[:, b_idx]
+    )
+    return valid
+
+
+def _turn_passed_valid(
+    features: BatchFeatures, operation: ElixirOperation
+) -> BoolArray:
+    return features.turn_passed > 0
+
+
+def _exhaust_valid(features: BatchFeatures, operation: ElixirOperation) -> BoolArray:
+    all_valid: BoolArray = features.n_valid_sages == 3
+    return all_valid
+
+
+def _redistribute_min_to_others_valid(
+    features: BatchFeatures, operation: ElixirOperation
+) -> BoolArray:
+    has_empty: BoolArray = (features.mutable & (features.values <= 0)).any(axis=1)
+    return ~has_empty
+
+
+def _decrease_first_target_and_swap_valid(
+    features: BatchFeatures, operation: ElixirOperation
+) -> BoolArray:
+    first_target, second_target = operation.value
+    valid: BoolArray = (
+        (features.turn_passed > 0)
+        & features.mutable[:, first_target]
+        & features.mutable[:, second_target]
+        & (features.values[:, first_target] > features.values[:, second_target])
+    )
+    return valid
+
+
+def _selector_always_valid(
+    features: BatchFeatures, target_selector: TargetSelector
+) -> BoolArray:
+    return np.ones(len(features), dtype=np.bool_)
+
+
+def _proposed_valid(
+    features: BatchFeatures, target_selector: TargetSelector
+) -> BoolArray:
+    return features.mutable[:, target_selector.target_condition - 1]
+
+
+def _any_mutable_valid(
+    features: BatchFeatures, target_selector: TargetSelector
+) -> BoolArray:
+    return features.n_mutable > 0
+
+
+def _operation_entries() -> dict[
+    Type[ElixirOperation], tuple[OperationKernel, ValidityFunction]
+]:
+    return {
+        op.MutateProb: (mutate_prob, _always_valid),
+        op.MutateLuckyRatio: (mutate_lucky_ratio, _always_valid),
+        op.IncreaseTargetWithRatio: (increase_target_with_ratio, _always_valid),
+        op.IncreaseTargetRanged: (increase_target_ranged, _always_valid),
+        op.DecreaseTurnLeft: (decrease_turn_left, _decrease_turn_left_valid),
+        op.ShuffleAll: (shuffle_all, _always_valid),
+        op.SetEnchantTargetAndAmount: (set_enchant_target_and_amount, _always_valid),
+        op.UnlockAndLockOther: (unlock_and_lock_other, _unlock_and_lock_other_valid),
+        op.ChangeEffect: (no_operation, _always_valid),
+        op.LockTarget: (lock_target, _lock_target_valid),
+        op.IncreaseReroll: (increase_reroll, _always_valid),
+        op.DecreasePrice: (no_operation, _always_valid),
+        op.Restart: (forbidden_operation, _always_valid),
+        op.SetEnchantIncreaseAmount: (set_enchant_increase_amount, _always_valid),
+        op.SetEnchantEffectCount: (
+            set_enchant_effect_count,
+            _set_enchant_effect_count_valid,
+        ),
+        op.SetValueRanged: (set_value_ranged, _always_valid),
+        op.RedistributeAll: (redistribute_all, _always_valid),
+        op.RedistributeSelectedToOthers: (
+            redistribute_selected_to_others,
+            _always_valid,
+        ),
+        op.ShiftAll: (shift_all, _always_valid),
+        op.SwapMinMax: (swap_min_max, _turn_passed_valid),
+        op.SwapValues: (swap_values, _swap_values_valid),
+        op.Exhaust: (exhaust, _exhaust_valid),
+        op.Exhausted: (forbidden_operation, _always_valid),
+        op.IncreaseMaxAndDecreaseTarget: (
+            increase_max_and_decrease_target,
+            _always_valid,
+        ),
+        op.IncreaseMinAndDecreaseTarget: (
+            increase_min_and_decrease_target,
+            _always_valid,
+        ),
+        op.RedistributeMinToOthers: (
+            redistribute_min_to_others,
+            _redistribute_min_to_others_valid,
+        ),
+        op.RedistributeMaxToOthers: (redistribute_max_to_others, _always_valid),
+        op.DecreaseMaxAndSwapMinMax: (
+            decrease_max_and_swap_min_max,
+            _turn_passed_valid,
+        ),
+        op.DecreaseFirstTargetAndSwap: (
+            decrease_first_target_and_swap,
+            _decrease_first_target_and_swap_valid,
+        ),
+    }
+
+
+def _selector_entries() -> dict[
+    Type[TargetSelector], tuple[SelectorKernel, SelectorValidityFunction]
+]:
+    return {
+        selector.NoneSelector: (select_none, _selector_always_valid),
+        selector.RandomSelector: (select_random, _selector_always_valid),
+        selector.ProposedSelector: (select_proposed, _proposed_valid),
+        selector.MinValueSelector: (select_min_value, _any_mutable_valid),
+        selector.MaxValueSelector: (select_max_value, _any_mutable_valid),
+        selector.UserSelector: (select_user, _selector_always_valid),
+        selector.LteValueSelector: (select_lte_value, _selector_always_valid),
+        selector.OneThreeFiveSelector: (select_one_three_five, _selector_always_valid),
+        selector.TwoFourSelector: (select_two_four, _selector_always_valid),
+    }
+
+
+def get_operation_kernel(
+    operation: ElixirOperation,
+) -> tuple[OperationKernel, ValidityFunction]:
+    return _operation_entries()[type(operation)]
+
+
+def get_selector_kernel(
+    target_selector: TargetSelector,
+) -> tuple[SelectorKernel, SelectorValidityFunction]:
+    return _selector_entries()[type(target_selector)]
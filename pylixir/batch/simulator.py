@@ -0,0 +1,193 @@
+from typing import Any, Optional
+
+import numpy as np
+import numpy.typing as npt
+
+from pylixir.application.mask import ACTION_SIZE, REROLL_ACTION
+from pylixir.batch.council import MAX_LOGIC_COUNT, BatchCouncilTable
+from pylixir.batch.enchant import sample_enchant
+from pylixir.batch.operation import NO_TARGET
+from pylixir.batch.state import EFFECT_SIZE, SAGE_SIZE, BatchState, BoolArray, IntArray
+from pylixir.data.council_pool import ConcreteCouncilPool
+
+
+class BatchSimulator:
+    """
+    Advances `size` elixir games in lockstep.
+    Mirrors `Client.pick`/`Client.reroll` row-wise; actions the client would
+    refuse leave the row untouched and are reported through the returned mask.
+    """
+
+    def __init__(
+        self,
+        council_pool: ConcreteCouncilPool,
+        size: int,
+        seed: Optional[int] = None,
+        max_value: int = 10,
+    ) -> None:
+        self.table = BatchCouncilTable(council_pool)
+        self.state = BatchState(size, max_value=max_value)
+        self.rng = np.random.default_rng(seed)
+        self._action_masks: Optional[BoolArray] = None
+        self.reset()
+
+    @property
+    def size(self) -> int:
+        return self.state.size
+
+    def _all_rows(self) -> IntArray:
+        return np.arange(self.size)
+
+    def reset(self, rows: Optional[IntArray] = None) -> None:
+        if rows is None:
+            rows = self._all_rows()
+
+        self._action_masks = None
+        self.state.reset(rows)
+        self.table.sample(self.state, rows, self.rng)
+
+    def is_done(self) -> BoolArray:
+        return self.state.is_done()
+
+    def valuation(self, index: tuple[int, int] = (0, 1)) -> IntArray:
+        """Vectorized `current_valuation` of the environments."""
+        i, j = index
+        alive = ~self.state.locked[:, [i, j]]
+        valuation: IntArray = np.where(alive, self.state.values[:, [i, j]], 0).sum(
+            axis=1
+        )
+        return valuation
+
+    def reroll(self, rows: Optional[IntArray] = None) -> BoolArray:
+        """Rerolls suggestions; returns mask of `rows` without rerolls left."""
+        if rows is None:
+            rows = self._all_rows()
+
+        rejected = self.state.reroll_left[rows] <= 0
+        accepted = rows[~rejected]
+        self._action_masks = None
+
+        self.table.sample(self.state, accepted, self.rng, is_reroll=True)
+        self.state.reroll_left[accepted] -= 1
+        return rejected
+
+    def pick(
+        self,
+        sage_index: IntArray,
+        effect_index: IntArray,
+        rows: Optional[IntArray] = None,
+    ) -> BoolArray:
+        """Picks a council per row; returns mask of `rows` where it was rejected."""
+        if rows is None:
+            rows = self._all_rows()
+
+        state = self.state
+        self._action_masks = None
+        saved = state.save(rows)
+        rejected = state.sage_removed[rows, sage_index].copy()
+        councils = state.suggestions[rows, sage_index]
+
+        for slot in range(MAX_LOGIC_COUNT):
+            logic_indices = self.table.council_logics[councils, slot]
+            for logic_index in np.unique(logic_indices[logic_indices != NO_TARGET]):
+                members = np.flatnonzero(logic_indices == logic_index)
+                rejected[members] |= self._apply_logic(
+                    int(logic_index), rows[members], effect_index[members]
+                )
+
+        state.restore(rows[rejected], _take(saved, rejected))
+        accepted = rows[~rejected]
+
+        state.pick_sage(accepted, sage_index[~rejected])
+        enchanted = sample_enchant(
+            state.query_enchant_prob(accepted),
+            state.query_lucky_ratio(accepted),
+            state.get_enchant_effect_count(accepted),
+            state.get_enchant_amount(accepted),
+            self.rng,
+        )
+        for index in range(EFFECT_SIZE):
+            state.modify_effect_count(accepted, index, enchanted[:, index])
+
+        state.turn_left[accepted] -= 1
+        state.elapse_turn(accepted)
+        self.table.sample(state, accepted[~state.is_done()[accepted]], self.rng)
+
+        return rejected
+
+    def action_masks(self) -> BoolArray:
+        """
+        Read-only (size, ACTION_SIZE) `get_action_mask` of every row, computed
+        once per `reset`, `pick` or `reroll`.
+        """
+        if self._action_masks is None:
+            self._action_masks = self._compute_action_masks()
+            self._action_masks.flags.writeable = False
+
+        return self._action_masks
+
+    def _compute_action_masks(self) -> BoolArray:
+        state, table = self.state, self.table
+        playing = ~state.is_done()
+        suggestions = state.suggestions
+        # (rows, sage): vectorized `Council.is_forbidden` but for user selection.
+        forbidden = table.forbidden[suggestions] | (
+            table.fixed_targets[suggestions] & state.locked[:, None, :]
+        ).any(axis=2)
+        allowed = ~state.sage_removed & playing[:, None] & ~forbidden
+
+        selecting = table.uses_effect_index[suggestions]
+        # (rows, effect, sage), in the order of action indices.
+        picks = (allowed & selecting)[:, None, :] & ~state.locked[:, :, None]
+        picks[:, 0, :] |= allowed & ~selecting
+
+        masks = np.zeros((self.size, ACTION_SIZE), dtype=np.bool_)
+        masks[:, :REROLL_ACTION] = picks.reshape(self.size, EFFECT_SIZE * SAGE_SIZE)
+        masks[:, REROLL_ACTION] = playing & (state.reroll_left > 0)
+        return masks
+
+    def step(self, actions: IntArray) -> BoolArray:
+        """
+        Applies environment actions (`effect_index * 3 + sage_index`, or
+        `REROLL_ACTION`) to every unfinished row; finished rows are left as is.
+        """
+        rejected = np.zeros(self.size, dtype=np.bool_)
+        is_reroll = actions == REROLL_ACTION
+        alive = ~self.is_done()
+
+        reroll_rows = np.flatnonzero(alive & is_reroll)
+        rejected[reroll_rows] = self.reroll(reroll_rows)
+
+        pick_rows = np.flatnonzero(alive & ~is_reroll)
+        rejected[pick_rows] = self.pick(
+            actions[pick_rows] % 3, actions[pick_rows] // 3, pick_rows
+        )
+
+        return rejected
+
+    def _apply_logic(
+        self, logic_index: int, rows: IntArray, effect_index: IntArray
+    ) -> BoolArray:
+        logic = self.table.logics[logic_index]
+        operation_kernel, selector_kernel = self.table.get_kernels(logic_index)
+
+        targets = selector_kernel(
+            self.state, rows, effect_index, logic.target_selector, self.rng
+        )
+        selected_locked = (
+            (targets != NO_TARGET)
+            & np.take_along_axis(
+                self.state.locked[rows], np.maximum(targets, 0), axis=1
+            )
+        ).any(axis=1)
+
+        rejected: BoolArray = selected_locked | operation_kernel(
+            self.state, rows, targets, logic.operation, self.rng
+        )
+        return rejected
+
+
+def _take(
+    saved: dict[str, npt.NDArray[Any]], mask: BoolArray
+) -> dict[str, npt.NDArray[Any]]:
+    return {name: array[mask] for name, array in saved.items()}
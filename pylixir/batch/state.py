@@ -0,0 +1,328 @@
+from __future__ import annotations
+
+from typing import Any, Sequence
+
+import numpy as np
+import numpy.typing as npt
+
+from pylixir.core.base import (
+    MAX_EFFECT_COUNT,
+    Board,
+    Effect,
+    Enchanter,
+    Mutation,
+    MutationTarget,
+)
+from pylixir.core.committee import MAX_CHAOS, MAX_LAWFUL, Sage, SageCommittee
+from pylixir.core.progress import GamePhase, Progress
+from pylixir.core.state import MAX_TURN_COUNT, GameState
+
+IntArray = npt.NDArray[np.int64]
+FloatArray = npt.NDArray[np.float64]
+BoolArray = npt.NDArray[np.bool_]
+
+EFFECT_SIZE = 5
+SAGE_SIZE = 3
+
+NO_MUTATION = -1
+MUTATION_CODES: dict[MutationTarget, int] = {
+    MutationTarget.prob: 0,
+    MutationTarget.lucky_ratio: 1,
+    MutationTarget.enchant_increase_amount: 2,
+    MutationTarget.enchant_effect_count: 3,
+}
+MUTATION_TARGETS = {code: target for target, code in MUTATION_CODES.items()}
+
+
+class BatchState:
+    """
+    Structure-of-arrays form of `size` independent GameStates.
+    Row `n` of every array belongs to game `n`; suggestions hold council indices
+    of the council pool, as `GameState.suggestions` does.
+    Enchanter mutations are kept in insertion order, left-aligned per row.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        max_value: int = 10,
+        total_turn: int = MAX_TURN_COUNT,
+        reroll: int = 2,
+        mutation_capacity: int = 16,
+    ) -> None:
+        self.size = size
+        self.max_value = max_value
+        self.total_turn = total_turn
+        self.initial_reroll = reroll
+
+        self.values: IntArray = np.zeros((size, EFFECT_SIZE), dtype=np.int64)
+        self.locked: BoolArray = np.zeros((size, EFFECT_SIZE), dtype=np.bool_)
+        self.turn_left: IntArray = np.full(size, total_turn, dtype=np.int64)
+        self.reroll_left: IntArray = np.full(size, reroll, dtype=np.int64)
+        self.sage_power: IntArray = np.zeros((size, SAGE_SIZE), dtype=np.int64)
+        self.sage_removed: BoolArray = np.zeros((size, SAGE_SIZE), dtype=np.bool_)
+        self.suggestions: IntArray = np.zeros((size, SAGE_SIZE), dtype=np.int64)
+
+        self.mutation_count: IntArray = np.zeros(size, dtype=np.int64)
+        self.mutation_target: IntArray = np.full(
+            (size, mutation_capacity), NO_MUTATION, dtype=np.int64
+        )
+        self.mutation_index: IntArray = np.zeros(
+            (size, mutation_capacity), dtype=np.int64
+        )
+        self.mutation_value: FloatArray = np.zeros(
+            (size, mutation_capacity), dtype=np.float64
+        )
+        self.mutation_remain: IntArray = np.zeros(
+            (size, mutation_capacity), dtype=np.int64
+        )
+
+    def _arrays(self) -> dict[str, npt.NDArray[Any]]:
+        return {
+            "values": self.values,
+            "locked": self.locked,
+            "turn_left": self.turn_left,
+            "reroll_left": self.reroll_left,
+            "sage_power": self.sage_power,
+            "sage_removed": self.sage_removed,
+            "suggestions": self.suggestions,
+            "mutation_count": self.mutation_count,
+            "mutation_target": self.mutation_target,
+            "mutation_index": self.mutation_index,
+            "mutation_value": self.mutation_value,
+            "mutation_remain": self.mutation_remain,
+        }
+
+    def reset(self, rows: IntArray) -> None:
+        self.values[rows] = 0
+        self.locked[rows] = False
+        self.turn_left[rows] = self.total_turn
+        self.reroll_left[rows] = self.initial_reroll
+        self.sage_power[rows] = 0
+        self.sage_removed[rows] = False
+        self.suggestions[rows] = 0
+        self.mutation_count[rows] = 0
+        self.mutation_target[rows] = NO_MUTATION
+
+    def save(self, rows: IntArray) -> dict[str, npt.NDArray[Any]]:
+        return {name: array[rows].copy() for name, array in self._arrays().items()}
+
+    def restore(self, rows: IntArray, saved: dict[str, npt.NDArray[Any]]) -> None:
+        for name, array in self._arrays().items():
+            value = saved[name]
+            if value.ndim == 2 and value.shape[1] < array.shape[1]:
+                # mutation capacity may have grown since `save`
+                value = np.pad(
+                    value,
+                    ((0, 0), (0, array.shape[1] - value.shape[1])),
+                    constant_values=NO_MUTATION if name == "mutation_target" else 0,
+                )
+            array[rows] = value
+
+    def mutable(self) -> BoolArray:
+        return ~self.locked & (self.values < self.max_value)
+
+    def is_done(self) -> BoolArray:
+        return self.turn_left <= 0
+
+    def modify_effect_count(self, rows: IntArray, index: Any, amount: Any) -> None:
+        self.values[rows, index] = np.clip(
+            self.values[rows, index] + amount, 0, MAX_EFFECT_COUNT
+        )
+
+    def add_mutation(
+        self,
+        rows: IntArray,
+        target: MutationTarget,
+        index: Any,
+        value: float,
+        remain_turn: int,
+    ) -> None:
+        if len(rows) == 0:
+            return
+
+        self._ensure_mutation_capacity(int(self.mutation_count[rows].max()) + 1)
+        slots = self.mutation_count[rows]
+        self.mutation_target[rows, slots] = MUTATION_CODES[target]
+        self.mutation_index[rows, slots] = index
+        self.mutation_value[rows, slots] = value
+        self.mutation_remain[rows, slots] = remain_turn
+        self.mutation_count[rows] += 1
+
+    def _ensure_mutation_capacity(self, capacity: int) -> None:
+        current = self.mutation_target.shape[1]
+        if capacity <= current:
+            return
+
+        extra = max(capacity, current * 2) - current
+        self.mutation_target = np.pad(
+            self.mutation_target, ((0, 0), (0, extra)), constant_values=NO_MUTATION
+        )
+        self.mutation_index = np.pad(self.mutation_index, ((0, 0), (0, extra)))
+        self.mutation_value = np.pad(self.mutation_value, ((0, 0), (0, extra)))
+        self.mutation_remain = np.pad(self.mutation_remain, ((0, 0), (0, extra)))
+
+    def elapse_turn(self, rows: IntArray) -> None:
+        active = self.mutation_target[rows] != NO_MUTATION
+        remain = self.mutation_remain[rows] - active
+        keep = active & (remain > 0)
+
+        order = np.argsort(~keep, axis=1, kind="stable")
+        kept = np.take_along_axis(keep, order, axis=1)
+
+        self.mutation_target[rows] = np.where(
+            kept,
+            np.take_along_axis(self.mutation_target[rows], order, axis=1),
+            NO_MUTATION,
+        )
+        self.mutation_index[rows] = np.take_along_axis(
+            self.mutation_index[rows], order, axis=1
+        )
+        self.mutation_value[rows] = np.take_along_axis(
+            self.mutation_value[rows], order, axis=1
+        )
+        self.mutation_remain[rows] = np.take_along_axis(remain, order, axis=1)
+        self.mutation_count[rows] = keep.sum(axis=1)
+
+    def query_enchant_prob(self, rows: IntArray) -> FloatArray:
+        """Vectorized `Enchanter.query_enchant_prob`."""
+        locked = self.locked[rows]
+        row_range = np.arange(len(rows))
+
+        available = EFFECT_SIZE - locked.sum(axis=1)
+        probs = np.where(locked, 0.0, (1.0 / available)[:, None])
+
+        for slot in range(int(self.mutation_count[rows].max(initial=0))):
+            index = self.mutation_index[rows, slot]
+            active = (
+                self.mutation_target[rows, slot] == MUTATION_CODES[MutationTarget.prob]
+            )
+            index = np.where(active, index, 0)
+            active &= ~locked[row_range, index]
+
+            target_prob = probs[row_range, index]
+            updated_prob = np.clip(target_prob + self.mutation_value[rows, slot], 0, 1)
+            actual_diff = updated_prob - target_prob
+
+            certain = target_prob == 1
+            scale = 1 - actual_diff / np.where(certain, 1.0, 1.0 - target_prob)
+            mutated = np.where(certain[:, None], probs, probs * scale[:, None])
+            mutated[row_range, index] = updated_prob
+
+            probs = np.where(active[:, None], mutated, probs)
+
+        return probs
+
+    def query_lucky_ratio(self, rows: IntArray) -> FloatArray:
+        """Vectorized `Enchanter.query_lucky_ratio`."""
+        row_range = np.arange(len(rows))
+        lucky_ratios = np.full((len(rows), EFFECT_SIZE), 0.1)
+
+        for slot in range(int(self.mutation_count[rows].max(initial=0))):
+            active = (
+                self.mutation_target[rows, slot]
+                == MUTATION_CODES[MutationTarget.lucky_ratio]
+            )
+            index = np.where(active, self.mutation_index[rows, slot], 0)
+            updated = np.clip(
+                lucky_ratios[row_range, index] + self.mutation_value[rows, slot], 0, 1
+            )
+            lucky_ratios[row_range, index] = np.where(
+                active, updated, lucky_ratios[row_range, index]
+            )
+
+        return lucky_ratios
+
+    def _first_mutation_value(self, rows: IntArray, target: MutationTarget) -> IntArray:
+        matched = self.mutation_target[rows] == MUTATION_CODES[target]
+        first = np.argmax(matched, axis=1)
+        value = self.mutation_value[rows, first].astype(np.int64)
+        return np.where(matched.any(axis=1), value, 1)
+
+    def get_enchant_amount(self, rows: IntArray) -> IntArray:
+        return self._first_mutation_value(rows, MutationTarget.enchant_increase_amount)
+
+    def get_enchant_effect_count(self, rows: IntArray) -> IntArray:
+        return self._first_mutation_value(rows, MutationTarget.enchant_effect_count)
+
+    def pick_sage(self, rows: IntArray, sage_index: IntArray) -> None:
+        """Vectorized `SageCommittee.pick`."""
+        power = self.sage_power[rows]
+        selected = np.arange(SAGE_SIZE)[None, :] == sage_index[:, None]
+
+        selected_power = np.where((power < 0) | (power == MAX_LAWFUL), 0, power) + 1
+        discarded_power = np.where((power > 0) | (power == MAX_CHAOS), 0, power) - 1
+
+        self.sage_power[rows] = np.where(selected, selected_power, discarded_power)
+
+    @classmethod
+    def from_game_states(cls, states: Sequence[GameState]) -> BatchState:
+        batch = cls(
+            len(states),
+            max_value=states[0].board.get_max_value(),
+            total_turn=states[0].progress.total_turn,
+        )
+        for row, state in enumerate(states):
+            batch.values[row] = state.board.get_effect_values()
+            batch.locked[row] = [effect.locked for effect in state.board.effects]
+            batch.turn_left[row] = state.progress.turn_left
+            batch.reroll_left[row] = state.progress.reroll_left
+            batch.sage_power[row] = [sage.power for sage in state.committee.sages]
+            batch.sage_removed[row] = [
+                sage.is_removed for sage in state.committee.sages
+            ]
+            batch.suggestions[row] = state.suggestions
+            for mutation in state.enchanter.get_mutations():
+                batch.add_mutation(
+                    np.array([row]),
+                    mutation.target,
+                    mutation.index,
+                    mutation.value,
+                    mutation.remain_turn,
+                )
+
+        return batch
+
+    def to_game_state(self, row: int) -> GameState:
+        effect_a, effect_b, effect_c, effect_d, effect_e = (
+            Effect(
+                name=name,
+                value=int(self.values[row, idx]),
+                locked=bool(self.locked[row, idx]),
+                max_value=self.max_value,
+            )
+            for idx, name in enumerate("ABCDE")
+        )
+        sage_a, sage_b, sage_c = (
+            Sage(
+                power=int(self.sage_power[row, slot]),
+                is_removed=bool(self.sage_removed[row, slot]),
+                slot=slot,
+            )
+            for slot in range(SAGE_SIZE)
+        )
+        index_a, index_b, index_c = (int(index) for index in self.suggestions[row])
+
+        enchanter = Enchanter()
+        for slot in range(int(self.mutation_count[row])):
+            enchanter.apply_mutation(
+                Mutation(
+                    target=MUTATION_TARGETS[int(self.mutation_target[row, slot])],
+                    index=int(self.mutation_index[row, slot]),
+                    value=float(self.mutation_value[row, slot]),
+                    remain_turn=int(self.mutation_remain[row, slot]),
+                )
+            )
+
+        return GameState(
+            board=Board(effects=(effect_a, effect_b, effect_c, effect_d, effect_e)),
+            enchanter=enchanter,
+            progress=Progress(
+                turn_left=int(self.turn_left[row]),
+                total_turn=self.total_turn,
+                reroll_left=int(self.reroll_left[row]),
+                phase=GamePhase.council,
+            ),
+            suggestions=(index_a, index_b, index_c),
+            committee=SageCommittee(sages=(sage_a, sage_b, sage_c)),
+        )
@@ -2,13 +2,31 @@ from __future__ import annotations
 
 import abc
 import enum
-from typing import TypeVar
+from typing import Any, Optional, Sequence, TypeVar
 
 import pydantic
 
 T = TypeVar("T")
 
 
+class DrawSlot(enum.IntEnum):
+    """
+    What a draw of a step is for. Slots of a step are separate streams of
+    counter-based randomness, so that two policies reaching the same turn face
+    the same luck in each of them. `council` and `operation` are offset by the
+    sage slot and the logic index.
+    """
+
+    default = 0
+    enchant = 1
+    lucky = 2
+    council = 3
+    operation = 6
+
+
+SLOT_COUNT = 8
+
+
 class Randomness(metaclass=abc.ABCMeta):
     @abc.abstractmethod
     def binomial(self, prob: float) -> bool:
@@ -34,6 +52,38 @@ class Randomness(metaclass=abc.ABCMeta):
     def weighted_sampling_target(self, probs: list[float], target: list[T]) -> T:
         ...
 
+    def cumulative_weighted_sampling_target(
+        self, cum_weights: list[float], target: list[T]
+    ) -> T:
+        """`weighted_sampling_target` given running totals of the weights."""
+        probs = [
+            weight - previous
+            for previous, weight in zip([0.0] + cum_weights[:-1], cum_weights)
+        ]
+        return self.weighted_sampling_target(probs, target)
+
+    def seek(self, turn: int, stream: int = 0) -> None:
+        """
+        Moves to the draws of `stream` in `turn`; reducers call it before every
+        step. Sequential generators ignore it.
+        """
+        return None
+
+    def use_slot(self, slot: int) -> None:
+        """
+        Draws for `slot` of the current step follow; see `DrawSlot`. Sequential
+        generators ignore it.
+        """
+        return None
+
+    @abc.abstractmethod
+    def get_generator_state(self) -> Any:
+        """State to resume the draws from with `set_generator_state`."""
+
+    @abc.abstractmethod
+    def set_generator_state(self, state: Any) -> None:
+        ...
+
     def redistribute(self, basis: list[int], count: int, max_count: int) -> list[int]:
         result = list(basis)
         desired_sum = sum(basis) + count
@@ -71,6 +121,148 @@ class Mutation(pydantic.BaseModel):
         return self.remain_turn <= 0
 
 
+EnchanterSnapshot = tuple[tuple[MutationTarget, int, float, int], ...]
+
+
+def get_enchant_amount(mutations: Sequence[Mutation]) -> int:
+    for mutation in mutations:
+        if mutation.target == MutationTarget.enchant_increase_amount:
+            return int(mutation.value)
+
+    return 1
+
+
+def get_enchant_effect_count(mutations: Sequence[Mutation]) -> int:
+    for mutation in mutations:
+        if mutation.target == MutationTarget.enchant_effect_count:
+            return int(mutation.value)
+
+    return 1
+
+
+def query_enchant_prob(
+    mutations: Sequence[Mutation], locked: Sequence[int], size: int = 5
+) -> list[float]:
+    available_slots = size - len(locked)
+    distributed_prob = 1.0 / available_slots
+
+    pick_ratios = [(0 if (idx in locked) else distributed_prob) for idx in range(5)]
+
+    for mutation in mutations:
+        _apply_prob_mutation(pick_ratios, mutation, locked)
+
+    return pick_ratios
+
+
+def query_lucky_ratio(mutations: Sequence[Mutation]) -> list[float]:
+    lucky_ratios = [0.1 for _ in range(5)]
+
+    for mutation in mutations:
+        _apply_lucky_ratio_mutation(lucky_ratios, mutation)
+
+    return lucky_ratios
+
+
+def _apply_prob_mutation(
+    pick_ratios: list[float], mutation: Mutation, locked: Sequence[int]
+) -> None:
+    if mutation.target != MutationTarget.prob or mutation.index in locked:
+        return
+
+    target_prob = pick_ratios[mutation.index]
+    updated_prob = max(min(target_prob + mutation.value, 1.0), 0)
+    actual_diff = updated_prob - target_prob
+
+    for idx in range(5):
+        if idx == mutation.index:
+            pick_ratios[idx] = updated_prob
+        else:
+            if target_prob == 1:
+                pick_ratios[idx] == actual_diff  # pylint:disable=W0104
+            else:
+                pick_ratios[idx] = pick_ratios[idx] * (
+                    1 - actual_diff / (1.0 - target_prob)
+                )
+
+
+def _apply_lucky_ratio_mutation(lucky_ratios: list[float], mutation: Mutation) -> None:
+    if mutation.target != MutationTarget.lucky_ratio:
+        return
+
+    lucky_ratios[mutation.index] = max(
+        min(lucky_ratios[mutation.index] + mutation.value, 1), 0
+    )
+
+
+def get_mutations_snapshot(mutations: Sequence[Mutation]) -> EnchanterSnapshot:
+    return tuple(
+        (mutation.target, mutation.index, mutation.value, mutation.remain_turn)
+        for mutation in mutations
+    )
+
+
+def restore_mutations(snapshot: EnchanterSnapshot) -> list[Mutation]:
+    return [
+        Mutation.construct(
+            target=target, index=index, value=value, remain_turn=remain_turn
+        )
+        for target, index, value, remain_turn in snapshot
+    ]
+
+
+class EnchanterCache:
+    """
+    Enchant probabilities and lucky ratios derived from a list of mutations.
+    Appended mutations are applied to the cached vectors, so repeated queries
+    are lookups; enchanters replace their cache when a mutation expires.
+    """
+
+    __slots__ = ("_enchant_probs", "_lucky_ratio")
+
+    def __init__(
+        self,
+        enchant_probs: Optional[dict[tuple[int, ...], tuple[float, ...]]] = None,
+        lucky_ratio: Optional[tuple[float, ...]] = None,
+    ) -> None:
+        self._enchant_probs = enchant_probs if enchant_probs is not None else {}
+        self._lucky_ratio = lucky_ratio
+
+    def copy(self) -> EnchanterCache:
+        return EnchanterCache(dict(self._enchant_probs), self._lucky_ratio)
+
+    def query_enchant_prob(
+        self, mutations: Sequence[Mutation], locked: Sequence[int], size: int
+    ) -> tuple[float, ...]:
+        key = tuple(locked)
+        enchant_prob = self._enchant_probs.get(key)
+        if enchant_prob is None:
+            enchant_prob = tuple(query_enchant_prob(mutations, locked, size))
+            self._enchant_probs[key] = enchant_prob
+
+        return enchant_prob
+
+    def query_lucky_ratio(self, mutations: Sequence[Mutation]) -> tuple[float, ...]:
+        if self._lucky_ratio is None:
+            self._lucky_ratio = tuple(query_lucky_ratio(mutations))
+
+        return self._lucky_ratio
+
+    def append(self, mutation: Mutation) -> None:
+        if mutation.target == MutationTarget.prob:
+            for locked, enchant_prob in self._enchant_probs.items():
+                pick_ratios = list(enchant_prob)
+                _apply_prob_mutation(pick_ratios, mutation, locked)
+                self._enchant_probs[locked] = tuple(pick_ratios)
+
+        if (
+            mutation.target == MutationTarget.lucky_ratio
+            and self._lucky_ratio is not None
+        ):
+            lucky_ratios = list(self._lucky_ratio)
+            _apply_lucky_ratio_mutation(lucky_ratios, mutation)
+            self._lucky_ratio = tuple(lucky_ratios)
+
+
 class Effect(pydantic.BaseModel, metaclass=abc.ABCMeta):
     name: str
     value: int
@@ -89,6 +281,8 @@ class Effect(pydantic.BaseModel, metaclass=abc.ABCMeta):
 
 MAX_EFFECT_COUNT = 10
 
+BoardSnapshot = tuple[tuple[int, bool], ...]
+
 
 class Board(pydantic.BaseModel):
     effects: tuple[Effect, Effect, Effect, Effect, Effect]
@@ -133,9 +327,20 @@ class Board(pydantic.BaseModel):
         # TODO: as unique prop.
         return self.effects[0].max_value
 
+    def snapshot(self) -> BoardSnapshot:
+        return tuple((effect.value, effect.locked) for effect in self.effects)
+
+    def restore(self, snapshot: BoardSnapshot) -> None:
+        """Writes `snapshot` back into the effects of this board, in place."""
+        for effect, (value, locked) in zip(self.effects, snapshot):
+            effect.value = value
+            effect.locked = locked
+
 
 class Enchanter(pydantic.BaseModel):
     _mutations: list[Mutation] = pydantic.PrivateAttr(default_factory=list)
+    # shared with `_mutations` by shallow copies; replaced whenever it is.
+    _cache: EnchanterCache = pydantic.PrivateAttr(default_factory=EnchanterCache)
     size: int = 5
 
     def elapse_turn(self) -> None:
@@ -145,66 +350,40 @@ class Enchanter(pydantic.BaseModel):
             if not mutation.is_expired():
                 mutations_left.append(mutation)
 
+        if len(mutations_left) == len(self._mutations):
+            self._cache = self._cache.copy()
+        else:
+            self._cache = EnchanterCache()
         self._mutations = mutations_left
 
     def get_enchant_amount(self) -> int:
-        for mutation in self._mutations:
-            if mutation.target == MutationTarget.enchant_increase_amount:
-                return int(mutation.value)
-
-        return 1
+        return get_enchant_amount(self._mutations)
 
     def get_enchant_effect_count(self) -> int:
-        for mutation in self._mutations:
-            if mutation.target == MutationTarget.enchant_effect_count:
-                return int(mutation.value)
-
-        return 1
+        return get_enchant_effect_count(self._mutations)
 
-    def query_enchant_prob(self, locked: list[int]) -> list[float]:
-        available_slots = self.size - len(locked)
-        distributed_prob = 1.0 / available_slots
+    def query_enchant_prob(self, locked: Sequence[int]) -> tuple[float, ...]:
+        return self._cache.query_enchant_prob(self._mutations, locked, self.size)
 
-        pick_ratios = [(0 if (idx in locked) else distributed_prob) for idx in range(5)]
+    def query_lucky_ratio(self) -> tuple[float, ...]:
+        return self._cache.query_lucky_ratio(self._mutations)
 
-        for mutation in self._mutations:
-            if mutation.target != MutationTarget.prob or mutation.index in locked:
-                continue
+    def get_mutations(self) -> list[Mutation]:
+        return list(self._mutations)
 
-            target_prob = pick_ratios[mutation.index]
-            updated_prob = max(min(target_prob + mutation.value, 1.0), 0)
-            actual_diff = updated_prob - target_prob
+    def snapshot(self) -> EnchanterSnapshot:
+        return get_mutations_snapshot(self._mutations)
 
-            for idx in range(5):
-                if idx == mutation.index:
-                    pick_ratios[idx] = updated_prob
-                else:
-                    if target_prob == 1:
-                        pick_ratios[idx] == actual_diff  # pylint:disable=W0104
-                    else:
-                        pick_ratios[idx] = pick_ratios[idx] * (
-                            1 - actual_diff / (1.0 - target_prob)
-                        )
-
-        return pick_ratios
-
-    def query_lucky_ratio(self) -> list[float]:
-        lucky_ratios = [0.1 for _ in range(5)]
-
-        for mutation in self._mutations:
-            if mutation.target != MutationTarget.lucky_ratio:
-                continue
-
-            lucky_ratios[mutation.index] = max(
-                min(lucky_ratios[mutation.index] + mutation.value, 1), 0
-            )
-        return lucky_ratios
+    def restore(self, snapshot: EnchanterSnapshot) -> None:
+        self._mutations = restore_mutations(snapshot)
+        self._cache = EnchanterCache()
 
     def apply_mutation(self, mutation: Mutation) -> None:
         self._mutations.append(mutation)
+        self._cache.append(mutation)
 
     def mutate_prob(self, index: int, prob: float, remain_turn: int) -> None:
-        self._mutations.append(
+        self.apply_mutation(
             Mutation(
                 target=MutationTarget.prob,
                 index=index,
@@ -214,7 +393,7 @@ class Enchanter(pydantic.BaseModel):
         )
 
     def mutate_lucky_ratio(self, index: int, prob: float, remain_turn: int) -> None:
-        self._mutations.append(
+        self.apply_mutation(
             Mutation(
                 target=MutationTarget.lucky_ratio,
                 index=index,
@@ -224,7 +403,7 @@ class Enchanter(pydantic.BaseModel):
         )
 
     def increase_enchant_amount(self, value: int) -> None:
-        self._mutations.append(
+        self.apply_mutation(
             Mutation(
                 target=MutationTarget.enchant_increase_amount,
                 index=-1,
@@ -234,7 +413,7 @@ class Enchanter(pydantic.BaseModel):
         )
 
     def change_enchant_effect_count(self, value: int) -> None:
-        self._mutations.append(
+        self.apply_mutation(
             Mutation(
                 target=MutationTarget.enchant_effect_count,
                 index=-1,
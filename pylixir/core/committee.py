@@ -12,6 +12,8 @@ class SageType(enum.Enum):
 MAX_LAWFUL = 3
 MAX_CHAOS = -6
 
+CommitteeSnapshot = tuple[tuple[int, bool, int], ...]
+
 
 class Sage(pydantic.BaseModel):
     power: int
@@ -52,3 +54,12 @@ class SageCommittee(pydantic.BaseModel):
                 sage.selected()
             else:
                 sage.discarded()
+
+    def snapshot(self) -> CommitteeSnapshot:
+        return tuple((sage.power, sage.is_removed, sage.slot) for sage in self.sages)
+
+    def restore(self, snapshot: CommitteeSnapshot) -> None:
+        for sage, (power, is_removed, slot) in zip(self.sages, snapshot):
+            sage.power = power
+            sage.is_removed = is_removed
+            sage.slot = slot
@@ -0,0 +1,497 @@
+"""
+Slotted, validation-free mirror of `GameState` for simulation hot paths.
+
+Every class here exposes the same methods as its pydantic counterpart and keeps
+the same aliasing behavior on `copy()` (shallow copies share children), so
+operations and reducers written against `GameState` produce identical results
+on a `CompactGameState` for the same randomness.
+"""
+from __future__ import annotations
+
+from typing import Any, Optional, Sequence
+
+from pylixir.core.base import (
+    MAX_EFFECT_COUNT,
+    Board,
+    BoardSnapshot,
+    Effect,
+    Enchanter,
+    EnchanterCache,
+    EnchanterSnapshot,
+    Mutation,
+    MutationTarget,
+    get_enchant_amount,
+    get_enchant_effect_count,
+    get_mutations_snapshot,
+    restore_mutations,
+)
+from pylixir.core.committee import (
+    MAX_CHAOS,
+    MAX_LAWFUL,
+    CommitteeSnapshot,
+    Sage,
+    SageCommittee,
+)
+from pylixir.core.progress import (
+    GamePhase,
+    Progress,
+    ProgressException,
+    ProgressSnapshot,
+)
+from pylixir.core.state import GameState, StateSnapshot, Suggestions
+
+
+def _new_mutation(
+    target: MutationTarget, index: int, value: float, remain_turn: int
+) -> Mutation:
+    return Mutation.construct(
+        target=target, index=index, value=value, remain_turn=remain_turn
+    )
+
+
+class CompactEffect:
+    __slots__ = ("name", "value", "locked", "max_value")
+
+    def __init__(self, name: str, value: int, locked: bool, max_value: int) -> None:
+        self.name = name
+        self.value = value
+        self.locked = locked
+        self.max_value = max_value
+
+    def lock(self) -> None:
+        self.locked = True
+
+    def unlock(self) -> None:
+        self.locked = False
+
+    def is_mutable(self) -> bool:
+        return not self.locked and self.value < self.max_value
+
+    def copy(self, deep: bool = False) -> CompactEffect:
+        return CompactEffect(self.name, self.value, self.locked, self.max_value)
+
+
+class CompactBoard:
+    __slots__ = ("effects",)
+
+    def __init__(self, effects: tuple[CompactEffect, ...]) -> None:
+        self.effects = effects
+
+    @classmethod
+    def from_board(cls, board: Board) -> CompactBoard:
+        return cls(
+            tuple(
+                CompactEffect(
+                    effect.name, effect.value, effect.locked, effect.max_value
+                )
+                for effect in board.effects
+            )
+        )
+
+    def to_board(self) -> Board:
+        effect_a, effect_b, effect_c, effect_d, effect_e = (
+            Effect(
+                name=effect.name,
+                value=effect.value,
+                locked=effect.locked,
+                max_value=effect.max_value,
+            )
+            for effect in self.effects
+        )
+        return Board(effects=(effect_a, effect_b, effect_c, effect_d, effect_e))
+
+    def copy(self, deep: bool = False) -> CompactBoard:
+        if deep:
+            return CompactBoard(tuple(effect.copy() for effect in self.effects))
+
+        return CompactBoard(self.effects)
+
+    def diff(self, prev: CompactBoard) -> list[int]:
+        return [self.effects[idx].value - prev.effects[idx].value for idx in range(5)]
+
+    def lock(self, effect_index: int) -> None:
+        self.effects[effect_index].lock()
+
+    def unlock(self, effect_index: int) -> None:
+        self.effects[effect_index].unlock()
+
+    def mutable_indices(self) -> list[int]:
+        return [idx for idx, effect in enumerate(self.effects) if effect.is_mutable()]
+
+    def get_effect_values(self) -> list[int]:
+        return [effect.value for effect in self.effects]
+
+    def modify_effect_count(self, effect_index: int, amount: int) -> None:
+        basis = self.effects[effect_index].value
+        basis += amount
+        basis = min(max(0, basis), MAX_EFFECT_COUNT)
+        self.effects[effect_index].value = basis
+
+    def set_effect_count(self, effect_index: int, amount: int) -> None:
+        self.effects[effect_index].value = amount
+
+    def unlocked_indices(self) -> list[int]:
+        return [idx for idx, effect in enumerate(self.effects) if not effect.locked]
+
+    def locked_indices(self) -> list[int]:
+        return [idx for idx, effect in enumerate(self.effects) if effect.locked]
+
+    def get(self, idx: int) -> CompactEffect:
+        return self.effects[idx]
+
+    def __len__(self) -> int:
+        return len(self.effects)
+
+    def get_max_value(self) -> int:
+        return self.effects[0].max_value
+
+    def snapshot(self) -> BoardSnapshot:
+        return tuple((effect.value, effect.locked) for effect in self.effects)
+
+    def restore(self, snapshot: BoardSnapshot) -> None:
+        for effect, (value, locked) in zip(self.effects, snapshot):
+            effect.value = value
+            effect.locked = locked
+
+
+class CompactEnchanter:
+    __slots__ = ("_mutations", "_cache", "size")
+
+    def __init__(
+        self,
+        mutations: Optional[list[Mutation]] = None,
+        size: int = 5,
+        cache: Optional[EnchanterCache] = None,
+    ) -> None:
+        self._mutations: list[Mutation] = mutations if mutations is not None else []
+        # shared with `_mutations` by shallow copies; replaced whenever it is.
+        self._cache = cache if cache is not None else EnchanterCache()
+        self.size = size
+
+    @classmethod
+    def from_enchanter(cls, enchanter: Enchanter) -> CompactEnchanter:
+        # pylint:disable=protected-access
+        return cls(
+            [mutation.copy() for mutation in enchanter._mutations],
+            enchanter.size,
+            enchanter._cache.copy(),
+        )
+
+    def to_enchanter(self) -> Enchanter:
+        enchanter = Enchanter(size=self.size)
+        for mutation in self._mutations:
+            enchanter.apply_mutation(Mutation(**mutation.dict()))
+
+        return enchanter
+
+    def copy(self, deep: bool = False) -> CompactEnchanter:
+        if deep:
+            return CompactEnchanter(
+                [mutation.copy() for mutation in self._mutations],
+                self.size,
+                self._cache.copy(),
+            )
+
+        return CompactEnchanter(self._mutations, self.size, self._cache)
+
+    def elapse_turn(self) -> None:
+        mutations_left = []
+        for mutation in self._mutations:
+            mutation.elapse_turn()
+            if not mutation.is_expired():
+                mutations_left.append(mutation)
+
+        if len(mutations_left) == len(self._mutations):
+            self._cache = self._cache.copy()
+        else:
+            self._cache = EnchanterCache()
+        self._mutations = mutations_left
+
+    def get_enchant_amount(self) -> int:
+        return get_enchant_amount(self._mutations)
+
+    def get_enchant_effect_count(self) -> int:
+        return get_enchant_effect_count(self._mutations)
+
+    def query_enchant_prob(self, locked: Sequence[int]) -> tuple[float, ...]:
+        return self._cache.query_enchant_prob(self._mutations, locked, self.size)
+
+    def query_lucky_ratio(self) -> tuple[float, ...]:
+        return self._cache.query_lucky_ratio(self._mutations)
+
+    def get_mutations(self) -> list[Mutation]:
+        return list(self._mutations)
+
+    def snapshot(self) -> EnchanterSnapshot:
+        return get_mutations_snapshot(self._mutations)
+
+    def restore(self, snapshot: EnchanterSnapshot) -> None:
+        self._mutations = restore_mutations(snapshot)
+        self._cache = EnchanterCache()
+
+    def apply_mutation(self, mutation: Mutation) -> None:
+        self._mutations.append(mutation)
+        self._cache.append(mutation)
+
+    def mutate_prob(self, index: int, prob: float, remain_turn: int) -> None:
+        self.apply_mutation(
+            _new_mutation(MutationTarget.prob, index, prob, remain_turn)
+        )
+
+    def mutate_lucky_ratio(self, index: int, prob: float, remain_turn: int) -> None:
+        self.apply_mutation(
+            _new_mutation(MutationTarget.lucky_ratio, index, prob, remain_turn)
+        )
+
+    def increase_enchant_amount(self, value: int) -> None:
+        self.apply_mutation(
+            _new_mutation(MutationTarget.enchant_increase_amount, -1, value, 1)
+        )
+
+    def change_enchant_effect_count(self, value: int) -> None:
+        self.apply_mutation(
+            _new_mutation(MutationTarget.enchant_effect_count, -1, value, 1)
+        )
+
+
+class CompactProgress:
+    __slots__ = ("turn_left", "total_turn", "reroll_left", "phase")
+
+    def __init__(
+        self, turn_left: int, total_turn: int, reroll_left: int, phase: GamePhase
+    ) -> None:
+        self.turn_left = turn_left
+        self.total_turn = total_turn
+        self.reroll_left = reroll_left
+        self.phase = phase
+
+    @classmethod
+    def from_progress(cls, progress: Progress) -> CompactProgress:
+        return cls(
+            progress.turn_left,
+            progress.total_turn,
+            progress.reroll_left,
+            progress.phase,
+        )
+
+    def to_progress(self) -> Progress:
+        return Progress(
+            turn_left=self.turn_left,
+            total_turn=self.total_turn,
+            reroll_left=self.reroll_left,
+            phase=self.phase,
+        )
+
+    def copy(self, deep: bool = False) -> CompactProgress:
+        return CompactProgress(
+            self.turn_left, self.total_turn, self.reroll_left, self.phase
+        )
+
+    def get_turn_left(self) -> int:
+        return self.turn_left
+
+    def get_reroll_left(self) -> int:
+        return self.reroll_left
+
+    def spent_turn(self, count: int) -> None:
+        self.turn_left -= count
+
+    def get_current_turn(self) -> int:
+        return self.total_turn - self.turn_left
+
+    def modify_reroll(self, amount: int) -> None:
+        self.reroll_left += amount
+
+    def snapshot(self) -> ProgressSnapshot:
+        return (self.turn_left, self.total_turn, self.reroll_left, self.phase)
+
+    def restore(self, snapshot: ProgressSnapshot) -> None:
+        self.turn_left, self.total_turn, self.reroll_left, self.phase = snapshot
+
+    def spent_reroll(self) -> None:
+        if self.reroll_left <= 0:
+            raise ProgressException("Reroll only available when reroll left")
+
+        self.reroll_left -= 1
+
+    @property
+    def turn_passed(self) -> int:
+        return self.total_turn - self.turn_left
+
+
+class CompactSage:
+    __slots__ = ("power", "is_removed", "slot")
+
+    def __init__(self, power: int, is_removed: bool, slot: int) -> None:
+        self.power = power
+        self.is_removed = is_removed
+        self.slot = slot
+
+    def copy(self, deep: bool = False) -> CompactSage:
+        return CompactSage(self.power, self.is_removed, self.slot)
+
+    def selected(self) -> None:
+        if self.power < 0 or self.power == MAX_LAWFUL:
+            self.power = 0
+
+        self.power += 1
+
+    def discarded(self) -> None:
+        if self.power > 0 or self.power == MAX_CHAOS:
+            self.power = 0
+
+        self.power -= 1
+
+    def is_lawful_max(self) -> bool:
+        return self.power == MAX_LAWFUL
+
+    def is_chaos_max(self) -> bool:
+        return self.power == MAX_CHAOS
+
+
+class CompactCommittee:
+    __slots__ = ("sages",)
+
+    def __init__(self, sages: tuple[CompactSage, CompactSage, CompactSage]) -> None:
+        self.sages = sages
+
+    @classmethod
+    def from_committee(cls, committee: SageCommittee) -> CompactCommittee:
+        sage_a, sage_b, sage_c = (
+            CompactSage(sage.power, sage.is_removed, sage.slot)
+            for sage in committee.sages
+        )
+        return cls((sage_a, sage_b, sage_c))
+
+    def to_committee(self) -> SageCommittee:
+        sage_a, sage_b, sage_c = (
+            Sage(power=sage.power, is_removed=sage.is_removed, slot=sage.slot)
+            for sage in self.sages
+        )
+        return SageCommittee(sages=(sage_a, sage_b, sage_c))
+
+    def copy(self, deep: bool = False) -> CompactCommittee:
+        if deep:
+            sage_a, sage_b, sage_c = self.sages
+            return CompactCommittee((sage_a.copy(), sage_b.copy(), sage_c.copy()))
+
+        return CompactCommittee(self.sages)
+
+    def set_exhaust(self, slot: int) -> None:
+        self.sages[slot].is_removed = True
+
+    def get_valid_slots(self) -> list[int]:
+        return [idx for idx, sage in enumerate(self.sages) if not sage.is_removed]
+
+    def pick(self, picked_slot: int) -> None:
+        for sage in self.sages:
+            if sage.slot == picked_slot:
+                sage.selected()
+            else:
+                sage.discarded()
+
+    def snapshot(self) -> CommitteeSnapshot:
+        return tuple((sage.power, sage.is_removed, sage.slot) for sage in self.sages)
+
+    def restore(self, snapshot: CommitteeSnapshot) -> None:
+        for sage, (power, is_removed, slot) in zip(self.sages, snapshot):
+            sage.power = power
+            sage.is_removed = is_removed
+            sage.slot = slot
+
+
+class CompactGameState:
+    """
+    Drop-in replacement of `GameState` without pydantic validation or copying.
+    Convert with `from_state` / `to_state`.
+    """
+
+    __slots__ = ("board", "enchanter", "progress", "suggestions", "committee")
+
+    def __init__(
+        self,
+        board: CompactBoard,
+        enchanter: CompactEnchanter,
+        progress: CompactProgress,
+        suggestions: Suggestions,
+        committee: CompactCommittee,
+    ) -> None:
+        self.board = board
+        self.enchanter = enchanter
+        self.progress = progress
+        self.suggestions = suggestions
+        self.committee = committee
+
+    @classmethod
+    def from_state(cls, state: GameState) -> CompactGameState:
+        return cls(
+            board=CompactBoard.from_board(state.board),
+            enchanter=CompactEnchanter.from_enchanter(state.enchanter),
+            progress=CompactProgress.from_progress(state.progress),
+            suggestions=state.suggestions,
+            committee=CompactCommittee.from_committee(state.committee),
+        )
+
+    def to_state(self) -> GameState:
+        return GameState(
+            board=self.board.to_board(),
+            enchanter=self.enchanter.to_enchanter(),
+            progress=self.progress.to_progress(),
+            suggestions=self.suggestions,
+            committee=self.committee.to_committee(),
+        )
+
+    def copy(
+        self, update: Optional[dict[str, Any]] = None, deep: bool = False
+    ) -> CompactGameState:
+        if deep:
+            copied = CompactGameState(
+                self.board.copy(deep=True),
+                self.enchanter.copy(deep=True),
+                self.progress.copy(deep=True),
+                self.suggestions,
+                self.committee.copy(deep=True),
+            )
+        else:
+            copied = CompactGameState(
+                self.board,
+                self.enchanter,
+                self.progress,
+                self.suggestions,
+                self.committee,
+            )
+
+        for key, value in (update or {}).items():
+            setattr(copied, key, value)
+
+        return copied
+
+    def snapshot(self) -> StateSnapshot:
+        return StateSnapshot(
+            board=self.board.snapshot(),
+            enchanter=self.enchanter.snapshot(),
+            progress=self.progress.snapshot(),
+            committee=self.committee.snapshot(),
+            suggestions=self.suggestions,
+        )
+
+    def restore(self, snapshot: StateSnapshot) -> None:
+        self.board.restore(snapshot.board)
+        self.enchanter.restore(snapshot.enchanter)
+        self.progress.restore(snapshot.progress)
+        self.committee.restore(snapshot.committee)
+        self.suggestions = snapshot.suggestions
+
+    def deepcopy(self, **kwargs: bool) -> CompactGameState:
+        update = {
+            target: getattr(self, target).copy(deep=True)
+            for target, value in kwargs.items()
+            if value
+        }
+        return self.copy(update=update)
+
+    def requires_lock(self) -> bool:
+        locked_effect_count = len(self.board.locked_indices())
+        required_locks = 3 - locked_effect_count
+
+        return self.progress.turn_left <= required_locks
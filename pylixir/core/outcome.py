@@ -0,0 +1,139 @@
+"""
+Exact enumeration of computations driven by `Randomness`.
+
+`enumerate_outcomes` runs a computation once per combination of random draws,
+replaying every draw with `EnumeratingRandomness`. Computations are re-run from
+scratch, so they must not mutate anything shared between runs.
+"""
+import itertools
+from collections import defaultdict
+from typing import Any, Callable, Hashable, Optional, Sequence, TypeVar
+
+from pylixir.core.base import Randomness
+
+T = TypeVar("T")
+Outcome = tuple[float, T]
+
+
+class EnumeratingRandomness(Randomness):
+    """
+    Randomness that follows `script`, a list of branch indices, one per draw.
+    Draws beyond the script take their first branch.
+    """
+
+    def __init__(self, script: Sequence[int]) -> None:
+        self._script = list(script)
+        self._choices: list[int] = []
+        self._sizes: list[int] = []
+        self.probability = 1.0
+
+    def _draw(self, options: Sequence[Outcome[Any]]) -> Any:
+        options = [(prob, value) for prob, value in options if prob > 0]
+        if len(options) == 0:
+            raise IndexError("Cannot draw from an empty set")
+
+        depth = len(self._choices)
+        choice = self._script[depth] if depth < len(self._script) else 0
+        self._choices.append(choice)
+        self._sizes.append(len(options))
+
+        prob, value = options[choice]
+        self.probability *= prob
+        return value
+
+    def next_script(self) -> Optional[list[int]]:
+        """Script of the next unexplored branch, or None if all were explored."""
+        for depth in reversed(range(len(self._choices))):
+            if self._choices[depth] + 1 < self._sizes[depth]:
+                return self._choices[:depth] + [self._choices[depth] + 1]
+
+        return None
+
+    def binomial(self, prob: float) -> bool:
+        return bool(self._draw([(prob, True), (1 - prob, False)]))
+
+    def uniform_int(self, min_range: int, max_range: int) -> int:
+        size = max_range - min_range + 1
+        return int(
+            self._draw([(1 / size, value) for value in range(min_range, max_range + 1)])
+        )
+
+    def shuffle(self, values: list[int]) -> list[int]:
+        permutations = list(itertools.permutations(values))
+        return list(
+            self._draw([(1 / len(permutations), list(perm)) for perm in permutations])
+        )
+
+    def pick(self, values: list[int]) -> int:
+        return int(self._draw([(1 / len(values), value) for value in values]))
+
+    def weighted_sampling(self, probs: list[float]) -> int:
+        total = sum(probs)
+        return int(self._draw([(prob / total, idx) for idx, prob in enumerate(probs)]))
+
+    def weighted_sampling_target(self, probs: list[float], target: list[T]) -> T:
+        total = sum(probs)
+        drawn: T = self._draw(
+            [(prob / total, value) for prob, value in zip(probs, target)]
+        )
+        return drawn
+
+    def get_generator_state(self) -> Any:
+        return (tuple(self._choices), tuple(self._sizes), self.probability)
+
+    def set_generator_state(self, state: Any) -> None:
+        choices, sizes, self.probability = state
+        self._choices, self._sizes = list(choices), list(sizes)
+
+    def redistribute(self, basis: list[int], count: int, max_count: int) -> list[int]:
+        """Draws the final vector at once instead of enumerating every pick."""
+        distribution: dict[tuple[int, ...], float] = {tuple(basis): 1.0}
+
+        for _ in range(count):
+            redistributed: dict[tuple[int, ...], float] = defaultdict(float)
+            for result, prob in distribution.items():
+                valid_indices = [
+                    idx for idx in range(len(basis)) if result[idx] < max_count
+                ]
+                if len(valid_indices) == 0:
+                    redistributed[result] += prob
+                    continue
+
+                for idx in valid_indices:
+                    increased = list(result)
+                    increased[idx] += 1
+                    redistributed[tuple(increased)] += prob / len(valid_indices)
+
+            distribution = redistributed
+
+        return list(self._draw([(prob, list(r)) for r, prob in distribution.items()]))
+
+
+def enumerate_outcomes(computation: Callable[[Randomness], T]) -> list[Outcome[T]]:
+    """Every result of `computation` with its probability; probabilities sum to 1."""
+    outcomes: list[Outcome[T]] = []
+    script: Optional[list[int]] = []
+
+    while script is not None:
+        randomness = EnumeratingRandomness(script)
+        result = computation(randomness)
+        outcomes.append((randomness.probability, result))
+        script = randomness.next_script()
+
+    return outcomes
+
+
+def merge_outcomes(
+    outcomes: Sequence[Outcome[T]], key: Callable[[T], Hashable]
+) -> list[Outcome[T]]:
+    """Sums probabilities of outcomes with equal `key`, keeping the first result."""
+    merged: dict[Hashable, Outcome[T]] = {}
+    for prob, result in outcomes:
+        result_key = key(result)
+        if result_key in merged:
+            merged_prob, merged_result = merged[result_key]
+            merged[result_key] = (merged_prob + prob, merged_result)
+        else:
+            merged[result_key] = (prob, result)
+
+    return list(merged.values())
@@ -12,6 +12,9 @@ class GamePhase(enum.Enum):
     done = "done"
 
 
+ProgressSnapshot = tuple[int, int, int, GamePhase]
+
+
 class ProgressException(Exception):
     ...
 
@@ -37,6 +40,12 @@ class Progress(pydantic.BaseModel):
     def modify_reroll(self, amount: int) -> None:
         self.reroll_left += amount
 
+    def snapshot(self) -> ProgressSnapshot:
+        return (self.turn_left, self.total_turn, self.reroll_left, self.phase)
+
+    def restore(self, snapshot: ProgressSnapshot) -> None:
+        self.turn_left, self.total_turn, self.reroll_left, self.phase = snapshot
+
     def spent_reroll(self) -> None:
         if self.reroll_left <= 0:
             raise ProgressException("Reroll only available when reroll left")
@@ -1,10 +1,15 @@
+import bisect
 from random import Random
-from typing import TypeVar
+from typing import Any, TypeVar
 
-from pylixir.core.base import Randomness
+import numpy as np
+
+from pylixir.core.base import SLOT_COUNT, DrawSlot, Randomness
 
 T = TypeVar("T")
 
+_KEY_MASK = (1 << 64) - 1
+
 
 class SeededRandomness(Randomness):
     def __init__(self, seed: float) -> None:
@@ -25,15 +30,238 @@ class SeededRandomness(Randomness):
         return self.shuffle(values)[0]
 
     def weighted_sampling(self, probs: list[float]) -> int:
-        return self._rng.choices(
-            list(range(len(probs))),
-            weights=probs,
-            k=1,
-        )[0]
+        # `random.choices` without its lists; draws the same numbers.
+        total = _get_total(probs)
+        return _inverse_cdf(probs, self._rng.random() * total)
+
+    def weighted_sampling_target(self, probs: list[float], target: list[T]) -> T:
+        return target[self.weighted_sampling(probs)]
+
+    def cumulative_weighted_sampling_target(
+        self, cum_weights: list[float], target: list[T]
+    ) -> T:
+        pivot = self._rng.random() * cum_weights[-1]
+        return target[bisect.bisect(cum_weights, pivot, 0, len(cum_weights) - 1)]
+
+    def get_generator_state(self) -> Any:
+        return self._rng.getstate()
+
+    def set_generator_state(self, state: Any) -> None:
+        self._rng.setstate(state)
+
+
+class CounterRandomness(Randomness):
+    """
+    Counter-based randomness on Philox: the `draw`-th uniform of `slot` in
+    `stream` of `turn` is a pure function of
+    `(seed, episode, turn, stream, slot, draw)`.
+    Reducers `seek` to the step they play and tag their draws with `DrawSlot`,
+    so a draw does not depend on how many draws came before it. Two policies
+    played on the same seed share their luck wherever they reach the same turn
+    (common random numbers), and any episode can be played by any worker
+    without sharing a generator.
+
+    The first `ROW_SIZE` uniforms of every slot are drawn at once per step;
+    `pick` and the weighted samplings consume one uniform without allocating.
+    """
+
+    ROW_SIZE = 16
+
+    def __init__(self, seed: int, episode: int = 0) -> None:
+        self._key = np.array([seed & _KEY_MASK, episode & _KEY_MASK], dtype=np.uint64)
+        self._generator = np.random.Generator(np.random.Philox(key=self._key))
+        self._turn, self._stream = 0, 0
+        self._block: list[float] = []
+        self._overflows: dict[int, list[float]] = {}
+        self._positions = [0 for _ in range(SLOT_COUNT)]
+        self._slot = DrawSlot.default.value
+
+    def seek(self, turn: int, stream: int = 0) -> None:
+        self._turn, self._stream = turn & _KEY_MASK, stream & _KEY_MASK
+        self._block = []
+        self._overflows = {}
+        self._positions = [0 for _ in range(SLOT_COUNT)]
+        self._slot = DrawSlot.default.value
+
+    def use_slot(self, slot: int) -> None:
+        if not 0 <= slot < SLOT_COUNT:
+            raise ValueError(f"Slot should be in [0, {SLOT_COUNT}), got {slot}")
+
+        self._slot = slot
+
+    def get_generator_state(self) -> Any:
+        # rows drawn so far are a cache; they are drawn again on demand.
+        return (self._turn, self._stream, tuple(self._positions), self._slot)
+
+    def set_generator_state(self, state: Any) -> None:
+        self.seek(state[0], state[1])
+        self._positions = list(state[2])
+        self._slot = state[3]
+
+    def binomial(self, prob: float) -> bool:
+        return self._uniform() < prob
+
+    def uniform_int(self, min_range: int, max_range: int) -> int:
+        return min_range + int(self._uniform() * (max_range - min_range + 1))
+
+    def shuffle(self, values: list[int]) -> list[int]:
+        results = list(values)
+        for idx in range(len(results) - 1, 0, -1):
+            swap = int(self._uniform() * (idx + 1))
+            results[idx], results[swap] = results[swap], results[idx]
+
+        return results
+
+    def pick(self, values: list[int]) -> int:
+        return values[int(self._uniform() * len(values))]
+
+    def weighted_sampling(self, probs: list[float]) -> int:
+        total = _get_total(probs)
+        return _inverse_cdf(probs, self._uniform() * total)
 
     def weighted_sampling_target(self, probs: list[float], target: list[T]) -> T:
-        return self._rng.choices(
-            target,
-            weights=probs,
-            k=1,
-        )[0]
+        return target[self.weighted_sampling(probs)]
+
+    def cumulative_weighted_sampling_target(
+        self, cum_weights: list[float], target: list[T]
+    ) -> T:
+        total = cum_weights[-1]
+        if total <= 0:
+            raise ValueError("Summation of probability cannot be 0")
+
+        idx = bisect.bisect_right(cum_weights, self._uniform() * total)
+        return target[min(idx, len(target) - 1)]
+
+    def _uniform(self) -> float:
+        slot = self._slot
+        draw = self._positions[slot]
+        self._positions[slot] = draw + 1
+
+        if draw < self.ROW_SIZE:
+            if not self._block:
+                # first `ROW_SIZE` uniforms of every slot, slot after slot.
+                self._block = self._draw(0, SLOT_COUNT * self.ROW_SIZE)
+            return self._block[slot * self.ROW_SIZE + draw]
+
+        overflow = self._overflows.setdefault(slot, [])
+        while len(overflow) <= draw - self.ROW_SIZE:
+            # the rest of a slot lives far past the first rows, 4 uniforms a count.
+            offset = ((slot + 1) << 32) + len(overflow) // 4
+            overflow += self._draw(offset, self.ROW_SIZE)
+
+        return overflow[draw - self.ROW_SIZE]
+
+    def _draw(self, offset: int, count: int) -> list[float]:
+        bit_generator = self._generator.bit_generator
+        bit_generator.state = {
+            "bit_generator": "Philox",
+            "state": {
+                "counter": np.array(
+                    [offset, self._stream, self._turn, 0], dtype=np.uint64
+                ),
+                "key": self._key,
+            },
+            "buffer": np.zeros(4, dtype=np.uint64),
+            "buffer_pos": 4,
+            "has_uint32": 0,
+            "uinteger": 0,
+        }
+        uniforms: list[float] = self._generator.random(count).tolist()
+        return uniforms
+
+
+class RecordingRandomness(Randomness):
+    """
+    Wraps `randomness` and logs every draw as integers: the results of
+    `binomial`, `uniform_int` and `pick`, the order of `shuffle`, and the index
+    picked by weighted samplings. It draws exactly what `randomness` would.
+    """
+
+    def __init__(self, randomness: Randomness) -> None:
+        self.randomness = randomness
+        self._draws: list[int] = []
+
+    def take_draws(self) -> list[int]:
+        """Draws logged since the last call."""
+        draws, self._draws = self._draws, []
+        return draws
+
+    def binomial(self, prob: float) -> bool:
+        result = self.randomness.binomial(prob)
+        self._draws.append(int(result))
+        return result
+
+    def uniform_int(self, min_range: int, max_range: int) -> int:
+        result = self.randomness.uniform_int(min_range, max_range)
+        self._draws.append(result)
+        return result
+
+    def shuffle(self, values: list[int]) -> list[int]:
+        results = self.randomness.shuffle(values)
+        self._draws += results
+        return results
+
+    def pick(self, values: list[int]) -> int:
+        result = self.randomness.pick(values)
+        self._draws.append(result)
+        return result
+
+    def weighted_sampling(self, probs: list[float]) -> int:
+        index = self.randomness.weighted_sampling(probs)
+        self._draws.append(index)
+        return index
+
+    def weighted_sampling_target(self, probs: list[float], target: list[T]) -> T:
+        index = self.randomness.weighted_sampling_target(
+            probs, list(range(len(target)))
+        )
+        self._draws.append(index)
+        return target[index]
+
+    def cumulative_weighted_sampling_target(
+        self, cum_weights: list[float], target: list[T]
+    ) -> T:
+        index = self.randomness.cumulative_weighted_sampling_target(
+            cum_weights, list(range(len(target)))
+        )
+        self._draws.append(index)
+        return target[index]
+
+    def seek(self, turn: int, stream: int = 0) -> None:
+        self.randomness.seek(turn, stream)
+
+    def use_slot(self, slot: int) -> None:
+        self.randomness.use_slot(slot)
+
+    def get_generator_state(self) -> Any:
+        return self.randomness.get_generator_state()
+
+    def set_generator_state(self, state: Any) -> None:
+        self.randomness.set_generator_state(state)
+
+
+def _get_total(weights: list[float]) -> float:
+    total = 0.0
+    for weight in weights:
+        total += weight
+
+    if total <= 0:
+        raise ValueError("Summation of probability cannot be 0")
+
+    return total
+
+
+def _inverse_cdf(weights: list[float], pivot: float) -> int:
+    """Index of the first running total of `weights` above `pivot`."""
+    cumulative = 0.0
+    last = 0
+    for idx, weight in enumerate(weights):
+        if weight <= 0:
+            continue
+
+        cumulative += weight
+        last = idx
+        if pivot < cumulative:
+            return idx
+
+    return last  # `pivot` may reach the total by rounding.
@@ -1,25 +1,40 @@
 from __future__ import annotations
 
-from typing import Callable
+from typing import Callable, Hashable, NamedTuple
 
 import pydantic
 
-from pylixir.core.base import Board, Enchanter, Randomness
-from pylixir.core.committee import SageCommittee
-from pylixir.core.progress import Progress
+from pylixir.core.base import (
+    Board,
+    BoardSnapshot,
+    Enchanter,
+    EnchanterSnapshot,
+    Randomness,
+)
+from pylixir.core.committee import CommitteeSnapshot, SageCommittee
+from pylixir.core.progress import Progress, ProgressSnapshot
 
 MAX_TURN_COUNT = 13
 
 
-class CouncilQuery(pydantic.BaseModel):
-    id: str
+Suggestions = tuple[int, int, int]  # indices of councils in the council pool
+
+
+class StateSnapshot(NamedTuple):
+    """Value of a `GameState`; cheap to take and hashable."""
+
+    board: BoardSnapshot
+    enchanter: EnchanterSnapshot
+    progress: ProgressSnapshot
+    committee: CommitteeSnapshot
+    suggestions: Suggestions
 
 
 class GameState(pydantic.BaseModel):
     board: Board
     enchanter: Enchanter = pydantic.Field(default_factory=Enchanter)
     progress: Progress
-    suggestions: tuple[CouncilQuery, CouncilQuery, CouncilQuery]
+    suggestions: Suggestions
     committee: SageCommittee
 
     class Config:
@@ -34,6 +49,27 @@ class GameState(pydantic.BaseModel):
         }
         return self.copy(update=update)
 
+    def snapshot(self) -> StateSnapshot:
+        return StateSnapshot(
+            board=self.board.snapshot(),
+            enchanter=self.enchanter.snapshot(),
+            progress=self.progress.snapshot(),
+            committee=self.committee.snapshot(),
+            suggestions=self.suggestions,
+        )
+
+    def restore(self, snapshot: StateSnapshot) -> None:
+        """
+        Writes `snapshot` back into this state in place, undoing reducers applied
+        since it was taken. Effects, sages and progress are overwritten, so
+        shallow copies sharing them are restored as well.
+        """
+        self.board.restore(snapshot.board)
+        self.enchanter.restore(snapshot.enchanter)
+        self.progress.restore(snapshot.progress)
+        self.committee.restore(snapshot.committee)
+        self.suggestions = snapshot.suggestions
+
     def requires_lock(self) -> bool:
         locked_effect_count = len(self.board.locked_indices())
         required_locks = 3 - locked_effect_count
@@ -42,3 +78,28 @@ class GameState(pydantic.BaseModel):
 
 
 Reducer = Callable[[GameState, Randomness], GameState]
+StateKey = tuple[Hashable, ...]
+
+
+def get_state_key(state: GameState) -> StateKey:
+    """
+    Canonical key of everything that decides the future of `state` except its
+    suggestions: board, turn and reroll left, sages and active mutations.
+    Mutations keep their order since probability mutations do not commute.
+    """
+    return (
+        tuple(effect.value for effect in state.board.effects),
+        tuple(effect.locked for effect in state.board.effects),
+        state.progress.turn_left,
+        state.progress.reroll_left,
+        tuple((sage.power, sage.is_removed) for sage in state.committee.sages),
+        tuple(
+            (
+                mutation.target.value,
+                mutation.index,
+                mutation.value,
+                mutation.remain_turn,
+            )
+            for mutation in state.enchanter.get_mutations()
+        ),
+    )
@@ -1,28 +1,45 @@
+import itertools
+
 from pylixir.core.base import Board, Randomness
 
 
-def choose_max_indices(
-    board: Board, randomness: Randomness, count: int = 1
-) -> list[int]:
+def get_max_candidates(board: Board) -> list[int]:
     availabla_indices = board.mutable_indices()
     maximum_value = max([board.get(idx).value for idx in availabla_indices])
 
-    candidates = [
+    return [
         idx for idx in availabla_indices if board.get(idx).value == maximum_value
     ]  # since tatget_condition starts with 1
-    return randomness.shuffle(candidates)[:count]
 
 
-def choose_min_indices(
-    board: Board, randomness: Randomness, count: int = 1
-) -> list[int]:
+def get_min_candidates(board: Board) -> list[int]:
     availabla_indices = board.mutable_indices()
     minimum_value = min([board.get(idx).value for idx in availabla_indices])
 
-    candidates = [
+    return [
         idx for idx in availabla_indices if board.get(idx).value == minimum_value
     ]  # since tatget_condition starts with 1
-    return randomness.shuffle(candidates)[:count]
+
+
+def choose_max_indices(
+    board: Board, randomness: Randomness, count: int = 1
+) -> list[int]:
+    return randomness.shuffle(get_max_candidates(board))[:count]
+
+
+def choose_min_indices(
+    board: Board, randomness: Randomness, count: int = 1
+) -> list[int]:
+    return randomness.shuffle(get_min_candidates(board))[:count]
+
+
+def get_shuffled_prefix_outcomes(
+    candidates: list[int], count: int
+) -> list[tuple[float, list[int]]]:
+    """Exact distribution of `randomness.shuffle(candidates)[:count]`."""
+    prefixes = list(itertools.permutations(candidates, min(count, len(candidates))))
+
+    return [(1 / len(prefixes), list(prefix)) for prefix in prefixes]
 
 
 def choose_random_indices_with_exclusion(
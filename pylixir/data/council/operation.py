@@ -252,6 +252,9 @@ class Restart(AlwaysValidOperation):
     ) -> GameState:
         raise ForbiddenActionException()  ## TODO
 
+    def is_forbidden(self) -> bool:
+        return True
+
 
 class SetEnchantIncreaseAmount(AlwaysValidOperation):
     """이번에 연성되는 효과는 <2>단계 올라갈거야."""
@@ -311,6 +314,9 @@ class SetValueRanged(AlwaysValidOperation):
         target_index = proposed_target_selector.target_index
         return state.board.get_effect_values()[target_index] < self.value[1]
 
+    def is_value_dependent(self) -> bool:
+        return True
+
 
 class RedistributeAll(AlwaysValidOperation):
     def reduce(
@@ -472,6 +478,9 @@ class Exhausted(AlwaysValidOperation):
     ) -> GameState:
         raise ForbiddenActionException()
 
+    def is_forbidden(self) -> bool:
+        return True
+
 
 class IncreaseMaxAndDecreaseTarget(AlwaysValidOperation):
     """<최고 단계> 효과 <1>개의 단계를 <1> 올려주지. 하지만 <최하 단계> 효과 <1>개의 단계는 <1> 내려갈 거야."""
@@ -571,6 +580,9 @@ class RedistributeMinToOthers(ElixirOperation):
             state.board.get(idx).value > 0 for idx in state.board.mutable_indices()
         )
 
+    def is_value_dependent(self) -> bool:
+        return True
+
 
 class RedistributeMaxToOthers(AlwaysValidOperation):
     def reduce(
@@ -647,6 +659,9 @@ class DecreaseFirstTargetAndSwap(ElixirOperation):
             state.board.get(first_target).value > state.board.get(second_target).value
         )
 
+    def is_value_dependent(self) -> bool:
+        return True
+
 
 def get_operation_classes() -> list[Type[ElixirOperation]]:
     operations: list[Type[ElixirOperation]] = [
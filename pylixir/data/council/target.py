@@ -3,8 +3,15 @@ from typing import Optional, Type
 
 from pylixir.application.council import TargetSelector
 from pylixir.core.base import Randomness
+from pylixir.core.outcome import Outcome
 from pylixir.core.state import GameState
-from pylixir.data.council.common import choose_max_indices, choose_min_indices
+from pylixir.data.council.common import (
+    choose_max_indices,
+    choose_min_indices,
+    get_max_candidates,
+    get_min_candidates,
+    get_shuffled_prefix_outcomes,
+)
 
 
 class InvalidSelectionException(Exception):
@@ -32,6 +39,11 @@ class RandomSelector(TargetSelector):
     def is_valid(self, state: GameState) -> bool:
         return True
 
+    def outcomes(
+        self, state: GameState, effect_index: Optional[int]
+    ) -> list[Outcome[list[int]]]:
+        return get_shuffled_prefix_outcomes(state.board.mutable_indices(), self.count)
+
 
 class ProposedSelector(TargetSelector):
     def select_targets(
@@ -45,6 +57,9 @@ class ProposedSelector(TargetSelector):
     def is_valid(self, state: GameState) -> bool:
         return self.target_index in state.board.mutable_indices()
 
+    def fixed_targets(self) -> tuple[int, ...]:
+        return (self.target_index,)
+
     @property
     def target_index(self) -> int:
         return self.target_condition - 1
@@ -65,6 +80,17 @@ class MinValueSelector(TargetSelector):
     def is_valid(self, state: GameState) -> bool:
         return len(state.board.mutable_indices()) > 0
 
+    def outcomes(
+        self, state: GameState, effect_index: Optional[int]
+    ) -> list[Outcome[list[int]]]:
+        if self.target_condition != 0:
+            raise InvalidSelectionException("Invalid proposed selector")
+
+        if len(state.board.mutable_indices()) == 0:
+            return [(1.0, state.board.unlocked_indices()[: self.count])]
+
+        return get_shuffled_prefix_outcomes(get_min_candidates(state.board), self.count)
+
 
 class MaxValueSelector(TargetSelector):
     def select_targets(
@@ -81,6 +107,17 @@ class MaxValueSelector(TargetSelector):
     def is_valid(self, state: GameState) -> bool:
         return len(state.board.mutable_indices()) > 0
 
+    def outcomes(
+        self, state: GameState, effect_index: Optional[int]
+    ) -> list[Outcome[list[int]]]:
+        if self.target_condition != 0:
+            raise InvalidSelectionException("Invalid proposed selector")
+
+        if len(state.board.mutable_indices()) == 0:
+            return [(1.0, state.board.unlocked_indices()[: self.count])]
+
+        return get_shuffled_prefix_outcomes(get_max_candidates(state.board), self.count)
+
 
 class UserSelector(TargetSelector):
     def select_targets(
@@ -94,6 +131,12 @@ class UserSelector(TargetSelector):
     def is_valid(self, state: GameState) -> bool:
         return True
 
+    def uses_effect_index(self) -> bool:
+        return True
+
+    def selects_locked(self, state: GameState, effect_index: int) -> bool:
+        return effect_index in state.board.locked_indices()
+
 
 class LteValueSelector(TargetSelector):
     def select_targets(
@@ -120,6 +163,9 @@ class OneThreeFiveSelector(TargetSelector):
     def is_valid(self, state: GameState) -> bool:
         return True
 
+    def fixed_targets(self) -> tuple[int, ...]:
+        return (0, 2, 4)
+
 
 class TwoFourSelector(TargetSelector):
     def select_targets(
@@ -130,6 +176,9 @@ class TwoFourSelector(TargetSelector):
     def is_valid(self, state: GameState) -> bool:
         return True
 
+    def fixed_targets(self) -> tuple[int, ...]:
+        return (1, 3)
+
 
 class CouncilTargetType(enum.Enum):
     none = "none"
@@ -1,12 +1,34 @@
-from typing import cast
+import itertools
 
 from pylixir.application.council import Council, CouncilType
 from pylixir.application.service import CouncilPool
-from pylixir.core.base import Randomness
+from pylixir.core.base import DrawSlot, Randomness
 from pylixir.core.committee import Sage
-from pylixir.core.state import CouncilQuery, GameState
+from pylixir.core.state import GameState, Suggestions
 
 CouncilSet = tuple[Council, Council, Council]
+ValidityKey = tuple[int, int, tuple[bool, ...], tuple[bool, ...], bool]
+
+
+class CouncilSampler:
+    """
+    Candidates of a (sage slot, council type) that may be valid under a
+    `ValidityKey`, with cumulative weights for a single weighted pick.
+    Value-dependent councils cannot be decided by the key alone; they are kept
+    and checked against the state once drawn.
+    """
+
+    def __init__(self, councils: list[Council]) -> None:
+        self.councils = councils
+        self.cum_weights = list(
+            itertools.accumulate(float(council.pickup_ratio) for council in councils)
+        )
+        self._value_dependent_ids = {
+            council.id for council in councils if council.is_value_dependent()
+        }
+
+    def is_valid(self, council: Council, state: GameState) -> bool:
+        return council.id not in self._value_dependent_ids or council.is_valid(state)
 
 
 class ConcreteCouncilPool(CouncilPool):
@@ -14,8 +36,11 @@ class ConcreteCouncilPool(CouncilPool):
         self, councils: list[Council], trials_before_exact_sampling: int = 5
     ) -> None:
         self._councils = councils
-        self._council_id_map = {council.id: council for council in self._councils}
+        self._index_map = {council.id: idx for idx, council in enumerate(councils)}
         self._trials_before_exact_sampling = trials_before_exact_sampling
+        self._sampler_cache: dict[
+            tuple[int, CouncilType, ValidityKey], CouncilSampler
+        ] = {}
         self._council_type_cache = {}
         for sage_slot in range(3):
             for council_type in [
@@ -34,24 +59,38 @@ class ConcreteCouncilPool(CouncilPool):
     def __len__(self) -> int:
         return len(self._councils)
 
+    def get_councils(self) -> list[Council]:
+        return list(self._councils)
+
     def get_index_map(self) -> dict[str, int]:
-        return {self._councils[idx].id: idx for idx in range(len(self))}
+        return dict(self._index_map)
+
+    def get_index(self, council: Council) -> int:
+        return self._index_map[council.id]
 
-    def get_council_queries(
+    def get_suggestions(
         self, state: GameState, randomness: Randomness, is_reroll: bool = False
-    ) -> tuple[CouncilQuery, CouncilQuery, CouncilQuery]:
-        council_set = self.get_council_set(
+    ) -> Suggestions:
+        council_a, council_b, council_c = self.get_council_set(
             state, state.committee.sages, randomness, is_reroll=is_reroll
         )
-
-        queries = cast(
-            tuple[CouncilQuery, CouncilQuery, CouncilQuery],
-            tuple(CouncilQuery(id=c.id) for c in council_set),
+        return (
+            self._index_map[council_a.id],
+            self._index_map[council_b.id],
+            self._index_map[council_c.id],
         )
-        return queries
 
-    def get_council(self, query: CouncilQuery) -> Council:
-        return self._council_id_map[query.id].copy()
+    def get_council(self, index: int) -> Council:
+        return self._councils[index]
+
+    def get_suggestion_ids(self, suggestions: Suggestions) -> tuple[str, str, str]:
+        """Council ids of `suggestions`, for display and serialization."""
+        index_a, index_b, index_c = suggestions
+        return (
+            self._councils[index_a].id,
+            self._councils[index_b].id,
+            self._councils[index_c].id,
+        )
 
     def get_council_set(
         self,
@@ -64,21 +103,28 @@ class ConcreteCouncilPool(CouncilPool):
         sage_a, sage_b, sage_c = sages
 
         if is_reroll:
-            council_1 = self.sample_council(
-                state, sage_a, randomness, [state.suggestions[0].id]
+            previous_a, previous_b, previous_c = self.get_suggestion_ids(
+                state.suggestions
             )
+            randomness.use_slot(DrawSlot.council + 0)
+            council_1 = self.sample_council(state, sage_a, randomness, [previous_a])
+            randomness.use_slot(DrawSlot.council + 1)
             council_2 = self.sample_council(
-                state, sage_b, randomness, [state.suggestions[1].id, council_1.id]
+                state, sage_b, randomness, [previous_b, council_1.id]
             )
+            randomness.use_slot(DrawSlot.council + 2)
             council_3 = self.sample_council(
                 state,
                 sage_c,
                 randomness,
-                [state.suggestions[2].id, council_1.id, council_2.id],
+                [previous_c, council_1.id, council_2.id],
             )
         else:
+            randomness.use_slot(DrawSlot.council + 0)
             council_1 = self.sample_council(state, sage_a, randomness, [])
+            randomness.use_slot(DrawSlot.council + 1)
             council_2 = self.sample_council(state, sage_b, randomness, [council_1.id])
+            randomness.use_slot(DrawSlot.council + 2)
             council_3 = self.sample_council(
                 state, sage_c, randomness, [council_1.id, council_2.id]
             )
@@ -92,25 +138,76 @@ class ConcreteCouncilPool(CouncilPool):
         randomness: Randomness,
         forbidden_council_ids: list[str],
     ) -> Council:
+        sampler = self._get_sampler(state, sage)
+
         def _is_valid(target_council: Council) -> bool:
             return (
-                target_council.is_valid(state)
+                sampler.is_valid(target_council, state)
                 and target_council.id not in forbidden_council_ids
             )
 
-        council_type = self._get_council_type(state, sage)
-        candidates, weights = self.get_available_councils(sage.slot, council_type)
-
         for _ in range(self._trials_before_exact_sampling):
-            council = randomness.weighted_sampling_target(weights, candidates)
+            council = randomness.cumulative_weighted_sampling_target(
+                sampler.cum_weights, sampler.councils
+            )
             if _is_valid(council):
                 return council
 
-        refined_council = [council for council in candidates if _is_valid(council)]
+        refined_council = [
+            council for council in sampler.councils if _is_valid(council)
+        ]
 
         refined_weights = [float(council.pickup_ratio) for council in refined_council]
         return randomness.weighted_sampling_target(refined_weights, refined_council)
 
+    def get_council_distribution(
+        self,
+        state: GameState,
+        sage: Sage,
+        forbidden_council_ids: list[str],
+    ) -> list[tuple[float, Council]]:
+        """Exact distribution that `sample_council` draws from."""
+        sampler = self._get_sampler(state, sage)
+
+        refined_council = [
+            council
+            for council in sampler.councils
+            if sampler.is_valid(council, state)
+            and council.id not in forbidden_council_ids
+        ]
+        total = sum(council.pickup_ratio for council in refined_council)
+
+        return [(council.pickup_ratio / total, council) for council in refined_council]
+
+    def _get_sampler(self, state: GameState, sage: Sage) -> CouncilSampler:
+        council_type = self._get_council_type(state, sage)
+        cache_key = (sage.slot, council_type, self._get_validity_key(state))
+
+        sampler = self._sampler_cache.get(cache_key)
+        if sampler is None:
+            candidates, _ = self.get_available_councils(sage.slot, council_type)
+            sampler = CouncilSampler(
+                [
+                    council
+                    for council in candidates
+                    if council.is_value_dependent() or council.is_valid(state)
+                ]
+            )
+            self._sampler_cache[cache_key] = sampler
+
+        return sampler
+
+    def _get_validity_key(self, state: GameState) -> ValidityKey:
+        """Everything but effect values that `Council.is_valid` depends on."""
+        effects = state.board.effects
+        return (
+            state.progress.turn_left,
+            state.progress.total_turn,
+            tuple(effect.locked for effect in effects),
+            tuple(effect.is_mutable() for effect in effects),
+            len(state.committee.get_valid_slots()) == 3,
+        )
+
     def get_available_councils(
         self, sage_slot: int, council_type: CouncilType
     ) -> tuple[list[Council], list[float]]:
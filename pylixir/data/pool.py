@@ -3,6 +3,7 @@ from __future__ import annotations
 import json
 import os
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import pydantic
 
@@ -12,6 +13,9 @@ from pylixir.data.council.target import get_target_classes
 from pylixir.data.council_pool import ConcreteCouncilPool
 from pylixir.data.loader import ElixirOperationLoader, ElixirTargetSelectorLoader
 
+if TYPE_CHECKING:
+    from pylixir.data.snapshot import PoolSnapshot
+
 
 class LogicMeta(pydantic.BaseModel):
     type: str
@@ -42,8 +46,11 @@ class CouncilMeta(pydantic.BaseModel):
 
 
 def get_metadatas() -> dict[str, CouncilMeta]:
+    return dict(_get_ingame_snapshot().metadatas)
+
+
+def read_metadatas(resource_file_path: str) -> dict[str, CouncilMeta]:
     metas: dict[str, CouncilMeta] = {}
-    resource_file_path = get_ingame_resource_path()
     with open(resource_file_path, encoding="utf-8") as f:
         raws = json.load(f)
 
@@ -66,11 +73,11 @@ class CouncilLoader:
     def get_council(self, meta: CouncilMeta) -> Council:
         return Council(
             id=meta.id,
-            logics=[self._get_logic(logic_meta) for logic_meta in meta.logics],
+            logics=tuple(self._get_logic(logic_meta) for logic_meta in meta.logics),
             pickup_ratio=meta.pickupRatio,
             turn_range=meta.range,
             slot_type=meta.slotType,
-            descriptions=list(meta.descriptions),
+            descriptions=tuple(meta.descriptions),
             type=CouncilType(meta.type),
         )
 
@@ -92,36 +99,29 @@ class CouncilLoader:
         )
 
 
-def _get_pool_from_file_and_loader(
-    resource_file_path: str, council_loader: CouncilLoader, skip: bool
-) -> ConcreteCouncilPool:
-    with open(resource_file_path, encoding="utf-8") as f:
-        raws = json.load(f)
+def get_ingame_resource_path() -> str:
+    return str(Path(os.path.dirname(__file__)) / "resource" / "council.json")
 
-    councils = []
-    for raw in raws:
-        meta = CouncilMeta.parse_obj(raw)
-        try:
-            councils.append(council_loader.get_council(meta))
-        except KeyError as e:
-            if skip:
-                continue
 
-            raise e
+def get_ingame_council_loader() -> CouncilLoader:
+    return CouncilLoader(
+        ElixirOperationLoader(get_operation_classes()),
+        ElixirTargetSelectorLoader(get_target_classes()),
+    )
 
-    return ConcreteCouncilPool(councils)
 
+def get_ingame_council_pool(skip: bool = False) -> ConcreteCouncilPool:
+    snapshot = _get_ingame_snapshot()
+    if not skip and snapshot.skipped_ids:
+        raise KeyError(f"Unknown logics in councils {snapshot.skipped_ids}")
 
-def get_ingame_resource_path() -> str:
-    return str(Path(os.path.dirname(__file__)) / "resource" / "council.json")
+    return ConcreteCouncilPool(snapshot.councils)
 
 
-def get_ingame_council_pool(skip: bool = False) -> ConcreteCouncilPool:
-    return _get_pool_from_file_and_loader(
-        get_ingame_resource_path(),
-        CouncilLoader(
-            ElixirOperationLoader(get_operation_classes()),
-            ElixirTargetSelectorLoader(get_target_classes()),
-        ),
-        skip=skip,
+def _get_ingame_snapshot() -> PoolSnapshot:
+    # snapshot is compiled by this module; import lazily to avoid a cycle.
+    from pylixir.data.snapshot import (  # pylint:disable=import-outside-toplevel
+        get_ingame_snapshot,
     )
+
+    return get_ingame_snapshot()
@@ -0,0 +1,194 @@
+"""
+Precompiled council resource.
+
+Compiling `council.json` (parsing, validating every `CouncilMeta` and building
+councils and feature index maps) dominates the startup of clients and envs.
+`write_snapshot` pickles the compiled objects, keyed by `SNAPSHOT_VERSION`, the
+hash of the json and the hash of the source of every pylixir module the pickle
+refers to, so editing a pickled class invalidates it. `get_ingame_snapshot` loads
+it once per process and falls back to compiling the json when the snapshot is
+missing, stale or fails to unpickle.
+
+Build it with `poetry run poe snapshot`.
+"""
+import functools
+import hashlib
+import importlib.util
+import io
+import os
+import pickle
+from pathlib import Path
+from typing import IO, Any, Iterable, Optional
+
+import pydantic
+
+from pylixir.application.council import Council
+from pylixir.data.pool import (
+    CouncilLoader,
+    CouncilMeta,
+    get_ingame_council_loader,
+    get_ingame_resource_path,
+    read_metadatas,
+)
+
+SNAPSHOT_VERSION = 3
+SOURCE_PACKAGE = "pylixir"
+
+
+class SnapshotHeader(pydantic.BaseModel):
+    version: int
+    resource_hash: str
+    source_hashes: dict[str, str] = {}  # by module; filled by `write_snapshot`
+
+
+class PoolSnapshot:
+    def __init__(
+        self,
+        header: SnapshotHeader,
+        councils: list[Council],
+        skipped_ids: list[str],
+        metadatas: dict[str, CouncilMeta],
+        feature_index_maps: dict[str, dict[Any, int]],
+    ) -> None:
+        self.header = header
+        self.councils = councils
+        self.skipped_ids = skipped_ids
+        self.metadatas = metadatas
+        self.feature_index_maps = feature_index_maps
+
+
+def get_resource_hash(resource_file_path: str) -> str:
+    with open(resource_file_path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def get_source_hashes(modules: Iterable[str]) -> dict[str, str]:
+    """Hash of the source of every module, empty if its source cannot be found."""
+    hashes = {}
+    for module in sorted(modules):
+        spec = importlib.util.find_spec(module)
+        if spec is None or spec.origin is None or not os.path.isfile(spec.origin):
+            hashes[module] = ""
+        else:
+            hashes[module] = get_resource_hash(spec.origin)
+
+    return hashes
+
+
+class _ModuleRecordingPickler(pickle.Pickler):
+    """Pickler that collects the pylixir modules defining the pickled objects."""
+
+    def __init__(self, file: IO[bytes]) -> None:
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.modules: set[str] = set()
+
+    def persistent_id(self, obj: Any) -> None:
+        owner = obj if isinstance(obj, type) else type(obj)
+        # base classes shape instances too, e.g. by their fields.
+        for cls in owner.__mro__:
+            if cls.__module__.split(".")[0] == SOURCE_PACKAGE:
+                self.modules.add(cls.__module__)
+        return None
+
+
+def get_ingame_snapshot_path() -> str:
+    return str(Path(os.path.dirname(__file__)) / "resource" / "council.snapshot.pkl")
+
+
+def compile_snapshot(
+    resource_file_path: str, council_loader: CouncilLoader
+) -> PoolSnapshot:
+    # envs builds its features upon data; import lazily to keep layers acyclic.
+    from pylixir.envs.feature import (  # pylint:disable=import-outside-toplevel
+        build_feature_index_maps,
+    )
+
+    metadatas = read_metadatas(resource_file_path)
+
+    councils, skipped_ids = [], []
+    for meta in metadatas.values():
+        try:
+            councils.append(council_loader.get_council(meta))
+        except KeyError:
+            skipped_ids.append(meta.id)
+
+    return PoolSnapshot(
+        header=SnapshotHeader(
+            version=SNAPSHOT_VERSION,
+            resource_hash=get_resource_hash(resource_file_path),
+        ),
+        councils=councils,
+        skipped_ids=skipped_ids,
+        metadatas=metadatas,
+        feature_index_maps=build_feature_index_maps(metadatas),
+    )
+
+
+def write_snapshot(snapshot: PoolSnapshot, snapshot_path: str) -> None:
+    buffer = io.BytesIO()
+    pickler = _ModuleRecordingPickler(buffer)
+    pickler.dump(snapshot)
+    header = snapshot.header.copy(
+        update={"source_hashes": get_source_hashes(pickler.modules)}
+    )
+
+    with open(snapshot_path, "wb") as f:
+        pickle.dump(header.dict(), f, protocol=pickle.HIGHEST_PROTOCOL)
+        f.write(buffer.getvalue())
+
+
+def load_snapshot(
+    snapshot_path: str, resource_file_path: str
+) -> Optional[PoolSnapshot]:
+    """
+    Snapshot at `snapshot_path`, or None if it is missing, stale or cannot be
+    unpickled.
+    """
+    expected = SnapshotHeader(
+        version=SNAPSHOT_VERSION, resource_hash=get_resource_hash(resource_file_path)
+    )
+
+    try:
+        with open(snapshot_path, "rb") as f:
+            header: dict[str, Any] = pickle.load(f)
+            if (
+                not isinstance(header, dict)
+                or header.get("version") != expected.version
+                or header.get("resource_hash") != expected.resource_hash
+            ):
+                return None
+
+            source_hashes = header.get("source_hashes", {})
+            if source_hashes != get_source_hashes(source_hashes):
+                return None
+
+            snapshot = pickle.load(f)
+    except Exception:  # pylint:disable=broad-except
+        # classes changed in ways the source hashes cannot see, e.g. a library.
+        return None
+
+    if not isinstance(snapshot, PoolSnapshot):
+        return None
+    return snapshot
+
+
+@functools.lru_cache(maxsize=None)
+def get_ingame_snapshot() -> PoolSnapshot:
+    """Compiled in-game resource, loaded once per process."""
+    resource_file_path = get_ingame_resource_path()
+    snapshot = load_snapshot(get_ingame_snapshot_path(), resource_file_path)
+    if snapshot is None:
+        snapshot = compile_snapshot(resource_file_path, get_ingame_council_loader())
+
+    return snapshot
+
+
+def build_ingame_snapshot() -> str:
+    snapshot_path = get_ingame_snapshot_path()
+    write_snapshot(
+        compile_snapshot(get_ingame_resource_path(), get_ingame_council_loader()),
+        snapshot_path,
+    )
+    get_ingame_snapshot.cache_clear()
+
+    return snapshot_path
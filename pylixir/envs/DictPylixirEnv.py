@@ -3,17 +3,29 @@ import random
 from typing import Any, Dict, Optional, TypedDict, Union
 
 import gymnasium as gym
+import numpy as np
 from gymnasium import spaces
 
-from pylixir.data.council.target import UserSelector
+from pylixir.application.mask import REROLL_ACTION, BoolArray
+from pylixir.application.recorder import TrajectoryRecorder, encode_state
 from pylixir.envs.observation import DictObservation
 from pylixir.interface.cli import ClientBuilder
+from pylixir.interface.replay import GameRecord
+
+REJECTED_REWARD = -3.0
 
 
 class ObsOutofBoundsException(Exception):
     ...
 
 
+def shape_reward(reward: float) -> float:
+    """Losses weigh a third of gains."""
+    if reward < 0:
+        return reward / 3
+    return reward
+
+
 class ObservationType(enum.Enum):
     discrete = "discrete"
     continuous = "continuous"
@@ -104,18 +116,33 @@ def get_observation_schema() -> DictObservationSchema:
 
 
 class DictPylixirEnv(gym.Env[Any, Any]):
+    """
+    With `record_to`, every step is appended to a `TrajectoryRecorder` on that
+    directory, which is flushed on `close`. Dict observations do not fit in a
+    column, so `encode_state` is recorded instead; see
+    `DictObservation.observations_from_encodings`.
+    """
+
     observation_space: spaces.Dict
     action_space: spaces.Discrete
     metadata: Dict[str, Any] = {"render_modes": ["human"]}
 
     def __init__(
-        self, render_mode: str = "human", completeness_threshold: int = 16
+        self,
+        render_mode: str = "human",
+        completeness_threshold: int = 16,
+        common_random_numbers: bool = False,
+        record_to: Optional[str] = None,
     ) -> None:
         self.render_mode = render_mode
-        self._client_builder = ClientBuilder()
+        self._client_builder = ClientBuilder(common_random_numbers)
+        self._common_random_numbers = common_random_numbers
 
         self._completeness_threshold = completeness_threshold
         self._client = self._client_builder.get_client(0)
+        self._game_record = GameRecord(
+            seed=0, common_random_numbers=common_random_numbers
+        )
         self._embedding_provider = DictObservation(
             self._client.get_council_pool_index_map()
         )
@@ -124,6 +151,16 @@ class DictPylixirEnv(gym.Env[Any, Any]):
         self.observation_space = get_observation_schema().get_space()  # fmt: on
         self.action_space = spaces.Discrete(15 + 1)
 
+        self._recorder: Optional[TrajectoryRecorder] = None
+        if record_to is not None:
+            self._recorder = TrajectoryRecorder(
+                record_to,
+                encoder=encode_state,
+                value=self._embedding_provider.current_total_reward,
+                rejected_reward=REJECTED_REWARD,
+                shaping=shape_reward,
+            )
+
     def _get_obs(self) -> dict[str, Union[int, list[float]]]:
         return self._embedding_provider.create_observation(self._client)
 
@@ -138,6 +175,7 @@ class DictPylixirEnv(gym.Env[Any, Any]):
             "current_valuation": self._embedding_provider.current_valuation(
                 self._client
             ),
+            "action_mask": self.action_masks(),
         }
 
     def render(self) -> None:
@@ -151,6 +189,11 @@ class DictPylixirEnv(gym.Env[Any, Any]):
             seed = random.randint(0, 1 << 16)
         super().reset(seed=seed)
         self._client = self._client_builder.get_client(seed)
+        self._game_record = GameRecord(
+            seed=seed, common_random_numbers=self._common_random_numbers
+        )
+        if self._recorder is not None:
+            self._client.record_to(self._recorder, seed)
         return self._get_obs(), self._get_info()
 
     def step(
@@ -164,18 +207,17 @@ class DictPylixirEnv(gym.Env[Any, Any]):
         else:
             action_object = self._embedding_provider.action_index_to_action(action)
             ok = self._client.pick(action_object.sage_index, action_object.effect_index)
+        self._log_action(action)
         state = self._get_obs()
         reward = (
             self._embedding_provider.current_total_reward(self._client)
             - previous_total_reward
         )
         info = self._get_info()
-
-        if reward < 0:
-            reward = reward / 3
+        reward = shape_reward(reward)
 
         if not ok:
-            reward = -3
+            reward = REJECTED_REWARD
             # observation, reward, terminated, truncated, info
             return state, reward, False, False, info
 
@@ -184,27 +226,26 @@ class DictPylixirEnv(gym.Env[Any, Any]):
         # observation, reward, terminated, truncated, info
         return state, reward, done, False, info
 
+    def _log_action(self, action: int) -> None:
+        self._game_record.actions.append(int(action))
+
     def close(self) -> None:
-        return None
+        if self._recorder is not None:
+            self._recorder.close()
+            self._recorder = None
+
+    def action_masks(self) -> BoolArray:
+        """
+        Legal actions of the current state, as `sb3_contrib.MaskablePPO` expects;
+        see `pylixir.application.mask`. Also reported as `info["action_mask"]`.
+        """
+        return self._client.get_action_mask()
+
+    def get_game_record(self) -> GameRecord:
+        """Seed and actions of the episode so far; see `ReplayEngine`."""
+        return self._game_record.copy(deep=True)
 
     def legal_actions(self) -> list[int]:
-        actions = []
-        for effect_index in range(5):
-            for sage_index in range(3):
-                if (
-                    sage_index
-                    not in self._client.get_state().committee.get_valid_slots()
-                ):
-                    continue
-                if (
-                    isinstance(
-                        self._client.get_current_councils()[sage_index]
-                        .logics[0]
-                        .target_selector,
-                        UserSelector,
-                    )
-                    and effect_index > 0
-                ):
-                    continue
-                actions += [effect_index * 3 + sage_index]
-        return actions
+        """Legal picks of the current state, excluding the reroll."""
+        picks = self.action_masks()[:REROLL_ACTION]
+        return [int(action) for action in np.flatnonzero(picks)]
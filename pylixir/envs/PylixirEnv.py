@@ -1,4 +1,3 @@
-import pickle
 import random
 from typing import Any, Dict, Optional
 
@@ -6,9 +5,11 @@ import gymnasium as gym
 import numpy as np
 from gymnasium import spaces
 
-from pylixir.data.council.target import UserSelector
+from pylixir.application.mask import REROLL_ACTION, BoolArray
+from pylixir.application.recorder import TrajectoryRecorder
 from pylixir.envs.observation import EmbeddingProvider
 from pylixir.interface.cli import ClientBuilder
+from pylixir.interface.replay import GameRecord, hash_state
 
 
 class ObsOutofBoundsException(Exception):
@@ -66,18 +67,39 @@ def get_observation_schema() -> ObservationSchema:
 
 
 class PylixirEnv(gym.Env[Any, Any]):
+    """
+    Observations of an episode are written into one reusable buffer; copy an
+    observation to keep it past the next `step`. `reset` starts a new buffer, so
+    the last observation of an episode, as kept by vector envs when they reset
+    it, is never overwritten. With `debug`, every observation is
+    checked against `observation_space`. With `common_random_numbers`, a seed
+    gives every policy the same luck; see `CounterRandomness`. With `record_to`,
+    every step is appended to a `TrajectoryRecorder` on that directory, which is
+    flushed on `close`. Actions of the episode are logged for `get_game_record`,
+    with state hashes under `debug`.
+    """
+
     observation_space: spaces.MultiDiscrete
     action_space: spaces.Discrete
     metadata: Dict[str, Any] = {"render_modes": ["human"]}
 
     def __init__(
-        self, render_mode: str = "human", completeness_threshold: int = 16
+        self,
+        render_mode: str = "human",
+        completeness_threshold: int = 16,
+        debug: bool = False,
+        common_random_numbers: bool = False,
+        record_to: Optional[str] = None,
     ) -> None:
         self.render_mode = render_mode
-        self._client_builder = ClientBuilder()
+        self._client_builder = ClientBuilder(common_random_numbers)
+        self._common_random_numbers = common_random_numbers
 
         self._completeness_threshold = completeness_threshold
         self._client = self._client_builder.get_client(0)
+        self._game_record = GameRecord(
+            seed=0, common_random_numbers=common_random_numbers
+        )
         self._embedding_provider = EmbeddingProvider(
             self._client.get_council_pool_index_map()
         )
@@ -86,22 +108,38 @@ class PylixirEnv(gym.Env[Any, Any]):
         self.observation_space = get_observation_schema().get_space()  # fmt: on
         self.action_space = spaces.Discrete(15 + 1)
 
+        self._debug = debug
+        self._observation = np.zeros(self.observation_space.shape, dtype=np.int64)
+
+        self._recorder: Optional[TrajectoryRecorder] = None
+        if record_to is not None:
+            self._recorder = TrajectoryRecorder(
+                record_to,
+                encoder=self._embedding_provider.create_observation,
+                value=self._embedding_provider.current_total_reward,
+                rejected_reward=-1.0,
+            )
+
     def _get_obs(self) -> np.typing.NDArray[np.int64]:
-        observation = np.array(
-            self._embedding_provider.create_observation(self._client)
-        )
-        validation = observation >= self.observation_space.nvec
+        observation = self._observation
+        self._embedding_provider.write_observation(self._client, observation)
+
+        if self._debug:
+            self._validate_obs(observation)
+        return observation
+
+    def _validate_obs(self, observation: np.typing.NDArray[np.int64]) -> None:
+        validation = (observation < 0) | (observation >= self.observation_space.nvec)
         if validation.any():
             indices = validation.nonzero()[0]
             idx = ", ".join(map(str, indices))
             value = ", ".join(map(str, observation[indices]))
 
-            with open("client.pkl", "wb") as f:
-                pickle.dump(self, f)
             raise ObsOutofBoundsException(
-                f"Observation encoding out of bounds: index {idx}, got {value}"
+                f"Observation encoding out of bounds: index {idx}, got {value}\n"
+                f"{self._client.view()}\n"
+                f"replay: {self._game_record.json()}"
             )
-        return observation
 
     def _get_info(self) -> Dict[Any, Any]:
         total_reward = self._embedding_provider.current_total_reward(self._client)
@@ -114,6 +152,7 @@ class PylixirEnv(gym.Env[Any, Any]):
             "current_valuation": self._embedding_provider.current_valuation(
                 self._client
             ),
+            "action_mask": self.action_masks(),
         }
 
     def render(self) -> None:
@@ -126,7 +165,13 @@ class PylixirEnv(gym.Env[Any, Any]):
         if seed is None:
             seed = random.randint(0, 1 << 16)
         super().reset(seed=seed)
+        self._observation = np.zeros(self.observation_space.shape, dtype=np.int64)
         self._client = self._client_builder.get_client(seed)
+        self._game_record = GameRecord(
+            seed=seed, common_random_numbers=self._common_random_numbers
+        )
+        if self._recorder is not None:
+            self._client.record_to(self._recorder, seed)
         return self._get_obs(), self._get_info()
 
     def step(
@@ -140,6 +185,7 @@ class PylixirEnv(gym.Env[Any, Any]):
         else:
             action_object = self._embedding_provider.action_index_to_action(action)
             ok = self._client.pick(action_object.sage_index, action_object.effect_index)
+        self._log_action(action)
         state = self._get_obs()
         reward = (
             self._embedding_provider.current_total_reward(self._client)
@@ -157,27 +203,28 @@ class PylixirEnv(gym.Env[Any, Any]):
         # observation, reward, terminated, truncated, info
         return state, reward, done, False, info
 
+    def _log_action(self, action: int) -> None:
+        self._game_record.actions.append(int(action))
+        if self._debug:
+            self._game_record.hashes.append(hash_state(self._client.get_state()))
+
     def close(self) -> None:
-        return None
+        if self._recorder is not None:
+            self._recorder.close()
+            self._recorder = None
+
+    def action_masks(self) -> BoolArray:
+        """
+        Legal actions of the current state, as `sb3_contrib.MaskablePPO` expects;
+        see `pylixir.application.mask`. Also reported as `info["action_mask"]`.
+        """
+        return self._client.get_action_mask()
+
+    def get_game_record(self) -> GameRecord:
+        """Seed and actions of the episode so far; see `ReplayEngine`."""
+        return self._game_record.copy(deep=True)
 
     def legal_actions(self) -> list[int]:
-        actions = []
-        for effect_index in range(5):
-            for sage_index in range(3):
-                if (
-                    sage_index
-                    not in self._client.get_state().committee.get_valid_slots()
-                ):
-                    continue
-                if (
-                    isinstance(
-                        self._client.get_current_councils()[sage_index]
-                        .logics[0]
-                        .target_selector,
-                        UserSelector,
-                    )
-                    and effect_index > 0
-                ):
-                    continue
-                actions += [effect_index * 3 + sage_index]
-        return actions
+        """Legal picks of the current state, excluding the reroll."""
+        picks = self.action_masks()[:REROLL_ACTION]
+        return [int(action) for action in np.flatnonzero(picks)]
@@ -0,0 +1,313 @@
+"""
+Vectorized counterparts of `PylixirEnv` and `DictPylixirEnv`.
+
+Sub-environments advance in lockstep on `BatchSimulator` arrays, and the
+observations of all of them are encoded at once. Finished sub-environments are
+reset in place (gymnasium autoreset): their last observation and info are
+reported in `info["final_observation"]` and `info["final_info"]`.
+Every row shares one random generator, so a seed does not reproduce the games
+of the scalar envs.
+"""
+import abc
+from typing import Any, Dict, Optional, Union
+
+import numpy as np
+import numpy.typing as npt
+from gymnasium import spaces
+from gymnasium.vector import VectorEnv
+
+from pylixir.application.mask import REROLL_ACTION
+from pylixir.batch.simulator import BatchSimulator
+from pylixir.batch.state import EFFECT_SIZE, SAGE_SIZE, BoolArray, IntArray
+from pylixir.data.pool import get_ingame_council_pool
+from pylixir.envs.DictPylixirEnv import (
+    get_observation_schema as get_dict_observation_schema,
+)
+from pylixir.envs.feature import get_feature_matrix
+from pylixir.envs.PylixirEnv import get_observation_schema
+
+FloatArray = npt.NDArray[np.float64]
+Observation = Union[IntArray, dict[str, npt.NDArray[Any]]]
+
+
+class BaseVectorPylixirEnv(VectorEnv, metaclass=abc.ABCMeta):
+    metadata: Dict[str, Any] = {"render_modes": []}
+
+    def __init__(
+        self,
+        num_envs: int,
+        observation_space: spaces.Space[Any],
+        completeness_threshold: int = 16,
+        max_episode_steps: int = 300,
+        seed: Optional[int] = None,
+    ) -> None:
+        council_pool = get_ingame_council_pool()
+        self._simulator = BatchSimulator(council_pool, num_envs, seed=seed)
+        self._completeness_threshold = completeness_threshold
+        self._max_episode_steps = max_episode_steps
+        self._elapsed_steps: IntArray = np.zeros(num_envs, dtype=np.int64)
+        self._actions: IntArray = np.zeros(num_envs, dtype=np.int64)
+        feature_matrix = get_feature_matrix()
+        self._feature_keys = feature_matrix.keys
+        self._feature_table = feature_matrix.index_table(council_pool.get_index_map())
+
+        super().__init__(
+            num_envs, observation_space, spaces.Discrete(REROLL_ACTION + 1)
+        )
+        self.render_mode = None
+
+    @abc.abstractmethod
+    def _get_obs(self, rows: IntArray) -> Observation:
+        ...
+
+    @abc.abstractmethod
+    def _total_reward(self, rows: IntArray) -> FloatArray:
+        ...
+
+    @abc.abstractmethod
+    def _get_reward(
+        self, previous: FloatArray, current: FloatArray, rejected: BoolArray
+    ) -> FloatArray:
+        ...
+
+    def reset_wait(
+        self,
+        seed: Optional[Union[int, list[int]]] = None,
+        options: Optional[dict[str, Any]] = None,
+    ) -> tuple[Observation, dict[str, Any]]:
+        if seed is not None:
+            self._simulator.rng = np.random.default_rng(seed)
+
+        self._simulator.reset()
+        self._elapsed_steps[:] = 0
+
+        rows = np.arange(self.num_envs)
+        return self._get_obs(rows), self._get_info(rows)
+
+    def step_async(self, actions: npt.ArrayLike) -> None:
+        self._actions = np.asarray(actions, dtype=np.int64)
+
+    def step_wait(
+        self, **kwargs: Any
+    ) -> tuple[Observation, FloatArray, BoolArray, BoolArray, dict[str, Any]]:
+        rows = np.arange(self.num_envs)
+        previous_total_reward = self._total_reward(rows)
+
+        rejected = self._simulator.step(self._actions)
+        self._elapsed_steps += 1
+
+        reward = self._get_reward(
+            previous_total_reward, self._total_reward(rows), rejected
+        )
+        terminated: BoolArray = self._simulator.is_done()
+        truncated: BoolArray = (
+            self._elapsed_steps >= self._max_episode_steps
+        ) & ~terminated
+
+        observation = self._get_obs(rows)
+        info = self._get_info(rows)
+
+        finished = np.flatnonzero(terminated | truncated)
+        if len(finished) > 0:
+            self._add_final(info, observation, finished)
+            self._simulator.reset(finished)
+            self._elapsed_steps[finished] = 0
+            _assign_rows(observation, finished, self._get_obs(finished))
+            # the next action of a reset row is chosen from its new game; copy so
+            # that `final_info`, which views the old rows, is left as it was.
+            action_mask = info["action_mask"].copy()
+            action_mask[finished] = self._simulator.action_masks()[finished]
+            info["action_mask"] = action_mask
+
+        return observation, reward, terminated, truncated, info
+
+    def close_extras(self, **kwargs: Any) -> None:
+        return None
+
+    def action_masks(self) -> BoolArray:
+        """
+        (num_envs, 16) legal actions of every sub-environment, also reported as
+        `info["action_mask"]`.
+        """
+        return self._simulator.action_masks()
+
+    def _get_info(self, rows: IntArray) -> dict[str, Any]:
+        values = self._simulator.state.values[rows]
+        locked = self._simulator.state.locked[rows]
+        # two largest alive values; at most three of five effects are locked.
+        top_two = np.sort(np.where(locked, -1, values), axis=1)[:, -2:].sum(axis=1)
+
+        info = {
+            "total_reward": self._total_reward(rows),
+            "complete": top_two >= self._completeness_threshold,
+            "current_valuation": self._simulator.valuation()[rows],
+            "action_mask": self._simulator.action_masks()[rows],
+        }
+        for key in list(info.keys()):
+            info[f"_{key}"] = np.ones(len(rows), dtype=np.bool_)
+
+        return info
+
+    def _add_final(
+        self, info: dict[str, Any], observation: Observation, finished: IntArray
+    ) -> None:
+        final_observation = np.full(self.num_envs, None, dtype=object)
+        final_info = np.full(self.num_envs, None, dtype=object)
+        mask = np.zeros(self.num_envs, dtype=np.bool_)
+
+        for row in finished:
+            final_observation[row] = _take_row(observation, row)
+            final_info[row] = {
+                key: value[row]
+                for key, value in info.items()
+                if not key.startswith("_")
+            }
+        mask[finished] = True
+
+        info["final_observation"] = final_observation
+        info["_final_observation"] = mask
+        info["final_info"] = final_info
+        info["_final_info"] = mask.copy()
+
+    def _suggestion_features(self, rows: IntArray) -> IntArray:
+        """(rows, sage, feature) features of the suggested councils."""
+        features: IntArray = self._feature_table[
+            self._simulator.state.suggestions[rows]
+        ]
+        return features
+
+    def _sage_integers(self, rows: IntArray) -> IntArray:
+        state = self._simulator.state
+        sage: IntArray = np.where(
+            state.sage_removed[rows], 0, state.sage_power[rows] + 7
+        )
+        return sage
+
+    def _alive_values(self, rows: IntArray, index: tuple[int, int]) -> IntArray:
+        state = self._simulator.state
+        columns = list(index)
+        values: IntArray = np.where(
+            state.locked[rows][:, columns], 0, state.values[rows][:, columns]
+        )
+        return values
+
+
+class VectorPylixirEnv(BaseVectorPylixirEnv):
+    """Vectorized `PylixirEnv`: stacked `MultiDiscrete` observations."""
+
+    def __init__(
+        self,
+        num_envs: int,
+        completeness_threshold: int = 16,
+        max_episode_steps: int = 300,
+        seed: Optional[int] = None,
+    ) -> None:
+        super().__init__(
+            num_envs,
+            get_observation_schema().get_space(),
+            completeness_threshold=completeness_threshold,
+            max_episode_steps=max_episode_steps,
+            seed=seed,
+        )
+
+    def _get_obs(self, rows: IntArray) -> IntArray:
+        state = self._simulator.state
+        observation: IntArray = np.concatenate(
+            [
+                self._sage_integers(rows),
+                state.turn_left[rows, None],
+                state.reroll_left[rows, None],
+                state.values[rows],
+                (state.query_lucky_ratio(rows) * 100).astype(np.int64),
+                (state.query_enchant_prob(rows) * 100).astype(np.int64),
+                self._suggestion_features(rows).reshape(len(rows), -1),
+            ],
+            axis=1,
+        )
+        return observation
+
+    def _total_reward(self, rows: IntArray) -> FloatArray:
+        reward: FloatArray = (2.0 ** self._alive_values(rows, (0, 1))).sum(axis=1)
+        return reward
+
+    def _get_reward(
+        self, previous: FloatArray, current: FloatArray, rejected: BoolArray
+    ) -> FloatArray:
+        reward: FloatArray = np.where(rejected, -1.0, current - previous)
+        return reward
+
+
+class DictVectorPylixirEnv(BaseVectorPylixirEnv):
+    """Vectorized `DictPylixirEnv`: a dict of per-key stacked observations."""
+
+    def __init__(
+        self,
+        num_envs: int,
+        completeness_threshold: int = 16,
+        max_episode_steps: int = 300,
+        seed: Optional[int] = None,
+    ) -> None:
+        super().__init__(
+            num_envs,
+            get_dict_observation_schema().get_space(),
+            completeness_threshold=completeness_threshold,
+            max_episode_steps=max_episode_steps,
+            seed=seed,
+        )
+
+    def _get_obs(self, rows: IntArray) -> dict[str, npt.NDArray[Any]]:
+        state = self._simulator.state
+        observation: dict[str, npt.NDArray[Any]] = {
+            "enchant_lucky": state.query_lucky_ratio(rows).astype(np.float32),
+            "enchant_prob": state.query_enchant_prob(rows).astype(np.float32),
+            "turn_left": state.turn_left[rows],
+            "reroll": state.reroll_left[rows],
+        }
+
+        sage_integers = self._sage_integers(rows)
+        for idx in range(SAGE_SIZE):
+            observation[f"committee_{idx}"] = sage_integers[:, idx]
+
+        board = np.where(state.locked[rows], 11, state.values[rows])
+        for idx in range(EFFECT_SIZE):
+            observation[f"board_{idx}"] = board[:, idx]
+
+        features = self._suggestion_features(rows)
+        for idx in range(SAGE_SIZE):
+            for key_index, key in enumerate(self._feature_keys):
+                observation[f"suggestion_{idx}_{key}"] = features[:, idx, key_index]
+
+        return observation
+
+    def _total_reward(self, rows: IntArray) -> FloatArray:
+        reward: FloatArray = (
+            self._alive_values(rows, (0, 1)).sum(axis=1).astype(np.float64)
+        )
+        return reward
+
+    def _get_reward(
+        self, previous: FloatArray, current: FloatArray, rejected: BoolArray
+    ) -> FloatArray:
+        diff = current - previous
+        reward: FloatArray = np.where(
+            rejected, -3.0, np.where(diff < 0, diff / 3, diff)
+        )
+        return reward
+
+
+def _take_row(observation: Observation, row: int) -> Any:
+    # copies, as the rows of finished games are overwritten by their reset.
+    if isinstance(observation, dict):
+        return {key: value[row].copy() for key, value in observation.items()}
+
+    return observation[row].copy()
+
+
+def _assign_rows(observation: Observation, rows: IntArray, values: Observation) -> None:
+    if isinstance(observation, dict):
+        assert isinstance(values, dict)
+        for key, value in values.items():
+            observation[key][rows] = value
+    else:
+        assert not isinstance(values, dict)
+        observation[rows] = values
@@ -2,6 +2,7 @@ from gymnasium.envs.registration import register
 
 from pylixir.envs.DictPylixirEnv import DictPylixirEnv
 from pylixir.envs.PylixirEnv import PylixirEnv
+from pylixir.envs.VectorPylixirEnv import DictVectorPylixirEnv, VectorPylixirEnv
 
 
 def register_env() -> None:
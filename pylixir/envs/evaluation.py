@@ -0,0 +1,234 @@
+"""
+Seed-sharded policy evaluation.
+
+Every seed is an independent episode of a scalar env, so seeds are split into
+contiguous shards and played by a process pool; each worker builds its policy
+and env once. Results are merged in seed order, so the report does not depend
+on the number of workers.
+
+Two policies are compared seed by seed with `compare_seeds`. On envs with
+`common_random_numbers`, both face the same luck wherever they reach the same
+turn, so the paired difference has a far smaller standard error than two
+independent evaluations.
+"""
+import math
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Optional, Sequence
+
+import gymnasium as gym
+import pydantic
+
+Policy = Callable[[Any], int]
+PolicyFactory = Callable[[], Policy]
+EnvFactory = Callable[[], gym.Env[Any, Any]]
+
+_worker: Optional[tuple[Policy, gym.Env[Any, Any]]] = None
+
+
+class EpisodeResult(pydantic.BaseModel):
+    seed: int
+    length: int
+    reward: float
+    valuation: float
+    finished: bool  # terminated within `max_ticks` steps
+
+
+def _is_success(result: EpisodeResult, threshold: int) -> bool:
+    return result.finished and result.valuation >= threshold
+
+
+class EvaluationReport(pydantic.BaseModel):
+    episodes: int
+    mean_length: float
+    mean_reward: float
+    success_rate: float
+    success_rate_14: float
+    success_rate_16: float
+    success_rate_18: float
+    unfinished: int
+
+    @classmethod
+    def from_results(
+        cls, results: Sequence[EpisodeResult], threshold: int = 14
+    ) -> "EvaluationReport":
+        results = sorted(results, key=lambda result: result.seed)
+        count = len(results)
+
+        def _success_rate(bound: int) -> float:
+            return sum(_is_success(result, bound) for result in results) / count
+
+        return cls(
+            episodes=count,
+            mean_length=sum(result.length for result in results) / count,
+            mean_reward=sum(result.reward for result in results) / count,
+            success_rate=_success_rate(threshold),
+            success_rate_14=_success_rate(14),
+            success_rate_16=_success_rate(16),
+            success_rate_18=_success_rate(18),
+            unfinished=sum(not result.finished for result in results),
+        )
+
+
+class PairedComparison(pydantic.BaseModel):
+    """Success rates of policies `a` and `b` played on the same seeds."""
+
+    threshold: int
+    episodes: int
+    success_rate_a: float
+    success_rate_b: float
+    difference: float  # b - a
+    standard_error: float  # of `difference`, from per-seed differences
+    independent_standard_error: float  # had the seeds not been shared
+    only_a: int  # seeds where only `a` succeeded
+    only_b: int
+
+    @classmethod
+    def from_results(
+        cls,
+        results_a: Sequence[EpisodeResult],
+        results_b: Sequence[EpisodeResult],
+        threshold: int = 14,
+    ) -> "PairedComparison":
+        by_seed = {result.seed: result for result in results_b}
+        if sorted(by_seed) != sorted(result.seed for result in results_a):
+            raise ValueError("Paired results should share their seeds")
+
+        pairs = [
+            (
+                _is_success(result, threshold),
+                _is_success(by_seed[result.seed], threshold),
+            )
+            for result in results_a
+        ]
+        count = len(pairs)
+        rate_a = sum(a for a, _ in pairs) / count
+        rate_b = sum(b for _, b in pairs) / count
+        differences = [int(b) - int(a) for a, b in pairs]
+        difference = sum(differences) / count
+        variance = (
+            sum((value - difference) ** 2 for value in differences) / (count - 1)
+            if count > 1
+            else 0.0
+        )
+
+        return cls(
+            threshold=threshold,
+            episodes=count,
+            success_rate_a=rate_a,
+            success_rate_b=rate_b,
+            difference=difference,
+            standard_error=math.sqrt(variance / count),
+            independent_standard_error=math.sqrt(
+                (rate_a * (1 - rate_a) + rate_b * (1 - rate_b)) / count
+            ),
+            only_a=sum(a and not b for a, b in pairs),
+            only_b=sum(b and not a for a, b in pairs),
+        )
+
+
+def run_episode(
+    policy: Policy,
+    env: gym.Env[Any, Any],
+    seed: int,
+    max_ticks: int = 20,
+    render: bool = False,
+) -> EpisodeResult:
+    observation, info = env.reset(seed=seed)
+    if render:
+        env.render()
+
+    terminated = False
+    reward, ticks = 0.0, 0
+    while not terminated:
+        observation, step_reward, terminated, _, info = env.step(policy(observation))
+        if render:
+            env.render()
+
+        reward += float(step_reward)
+        ticks += 1
+        if ticks > max_ticks:
+            break
+
+    return EpisodeResult(
+        seed=seed,
+        length=ticks,
+        reward=reward,
+        valuation=info["current_valuation"],
+        finished=ticks < max_ticks,
+    )
+
+
+def shard_seeds(seeds: Sequence[int], shard_count: int) -> list[list[int]]:
+    """Splits `seeds` into `shard_count` contiguous shards of near-equal size."""
+    size, remainder = divmod(len(seeds), shard_count)
+    shards, start = [], 0
+    for index in range(shard_count):
+        end = start + size + (1 if index < remainder else 0)
+        shards.append(list(seeds[start:end]))
+        start = end
+
+    return [shard for shard in shards if shard]
+
+
+def evaluate_seeds(
+    policy_factory: PolicyFactory,
+    env_factory: EnvFactory,
+    seeds: Sequence[int],
+    workers: int = 1,
+    max_ticks: int = 20,
+) -> list[EpisodeResult]:
+    """
+    Plays one episode per seed. `policy_factory` and `env_factory` are called once
+    per worker, so they must be picklable when `workers` > 1.
+    """
+    if workers <= 1:
+        policy, env = policy_factory(), env_factory()
+        return [run_episode(policy, env, seed, max_ticks=max_ticks) for seed in seeds]
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_initialize_worker,
+        initargs=(policy_factory, env_factory),
+    ) as executor:
+        shards = shard_seeds(seeds, workers * 4)
+        shard_results = executor.map(_run_shard, shards, [max_ticks for _ in shards])
+        results = [result for shard in shard_results for result in shard]
+
+    return sorted(results, key=lambda result: result.seed)
+
+
+def compare_seeds(
+    policy_factory_a: PolicyFactory,
+    policy_factory_b: PolicyFactory,
+    env_factory: EnvFactory,
+    seeds: Sequence[int],
+    workers: int = 1,
+    max_ticks: int = 20,
+    thresholds: Sequence[int] = (14, 16, 18),
+) -> list[PairedComparison]:
+    """
+    Plays both policies on every seed and compares them per threshold.
+    `env_factory` should build envs with `common_random_numbers`.
+    """
+    results_a = evaluate_seeds(
+        policy_factory_a, env_factory, seeds, workers=workers, max_ticks=max_ticks
+    )
+    results_b = evaluate_seeds(
+        policy_factory_b, env_factory, seeds, workers=workers, max_ticks=max_ticks
+    )
+
+    return [
+        PairedComparison.from_results(results_a, results_b, threshold=threshold)
+        for threshold in thresholds
+    ]
+
+
+def _initialize_worker(policy_factory: PolicyFactory, env_factory: EnvFactory) -> None:
+    global _worker  # pylint:disable=global-statement
+    _worker = (policy_factory(), env_factory())
+
+
+def _run_shard(seeds: list[int], max_ticks: int) -> list[EpisodeResult]:
+    assert _worker is not None, "worker is not initialized"
+    policy, env = _worker
+    return [run_episode(policy, env, seed, max_ticks=max_ticks) for seed in seeds]
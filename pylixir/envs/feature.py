@@ -1,8 +1,12 @@
-from typing import TYPE_CHECKING, Generator, TypeVar
+import functools
+from typing import TYPE_CHECKING, Any, Generator, Sequence, TypeVar
 
+import numpy as np
+import numpy.typing as npt
 from pydantic import BaseModel
 
-from pylixir.data.pool import CouncilMeta, LogicMeta, get_metadatas
+from pylixir.data.pool import CouncilMeta, LogicMeta
+from pylixir.data.snapshot import get_ingame_snapshot
 
 if TYPE_CHECKING:
     from _typeshed import SupportsRichComparison
@@ -11,6 +15,8 @@ if TYPE_CHECKING:
 else:
     T = TypeVar("T")
 
+IntArray = npt.NDArray[np.int64]
+
 
 def _as_index_map(value_set: set[T]) -> dict[T, int]:
     ordered_list = sorted(value_set)
@@ -41,6 +47,23 @@ class CouncilFeatureBuilder(BaseModel):
     logic_ratio: dict[int, int]
     logic_remainTurn: dict[int, int]
 
+    def get_feature_keys(self) -> list[str]:
+        """Feature names in the order suggestions are encoded."""
+        return sorted(self._get_empty_council_keys())
+
+    def build_matrix(self) -> "CouncilFeatureMatrix":
+        keys = self.get_feature_keys()
+        council_ids = list(self.metadata_map.keys())
+        matrix: IntArray = np.array(
+            [
+                [feature[k] for k in keys]
+                for feature in map(self.get_feature_by_id, council_ids)
+            ],
+            dtype=np.int64,
+        ).reshape(len(council_ids), len(keys))
+
+        return CouncilFeatureMatrix(keys, council_ids, matrix)
+
     def get_feature_by_id(self, council_id: str) -> dict[str, int]:
         council_meta = self.metadata_map[council_id]
         return self.get_feature(council_meta)
@@ -87,6 +110,22 @@ class CouncilFeatureBuilder(BaseModel):
             ],
         }
 
+    def _get_empty_council_keys(self) -> list[str]:
+        keys = [
+            "id",
+            "pickupRatio",
+            "range0",
+            "range1",
+            "slotType",
+            "type",
+            "applyLimit",
+            "applyImmediately",
+        ]
+        for idx in range(2):
+            keys += list(self._get_empty_logic_input(idx).keys())
+
+        return keys
+
     def _get_empty_logic_input(self, logic_index: int) -> dict[str, int]:
         return {
             f"logic_{logic_index}_type": 0,
@@ -98,10 +137,60 @@ class CouncilFeatureBuilder(BaseModel):
         }
 
 
+class CouncilFeatureMatrix:
+    """
+    Features of every council as rows of a dense, read-only matrix, so that
+    encoding suggestions is a row gather instead of building feature dicts.
+    """
+
+    def __init__(
+        self, keys: list[str], council_ids: list[str], matrix: IntArray
+    ) -> None:
+        self.keys = keys
+        self.matrix = matrix
+        self.matrix.flags.writeable = False
+        self._row_by_id = {
+            council_id: idx for idx, council_id in enumerate(council_ids)
+        }
+
+    def get_rows(self, council_ids: Sequence[str]) -> list[int]:
+        return [self._row_by_id[council_id] for council_id in council_ids]
+
+    def gather(self, council_ids: Sequence[str]) -> IntArray:
+        """(len(council_ids), len(keys)) features of `council_ids`."""
+        features: IntArray = self.matrix[self.get_rows(council_ids)]
+        return features
+
+    def write(self, council_ids: Sequence[str], out: IntArray) -> None:
+        """
+        Writes the features of `council_ids` into `out` without intermediate
+        copies; `out` may be a (len(council_ids), len(keys)) view of a larger
+        observation buffer.
+        """
+        np.take(self.matrix, self.get_rows(council_ids), axis=0, out=out)
+
+    def index_table(self, index_map: dict[str, int]) -> IntArray:
+        """
+        Features whose row `i` belongs to the council of index `i` in
+        `index_map`, so suggestions of a `GameState` gather their rows directly.
+        """
+        council_ids = sorted(index_map, key=lambda council_id: index_map[council_id])
+        return self.gather(council_ids)
+
+
 def get_feature_builder() -> CouncilFeatureBuilder:
-    metadata_map = get_metadatas()
-    return CouncilFeatureBuilder(
-        metadata_map=metadata_map,
+    snapshot = get_ingame_snapshot()
+    fields: dict[str, Any] = dict(
+        metadata_map=snapshot.metadatas, **snapshot.feature_index_maps
+    )
+    # index maps are compiled with the snapshot; skip re-validating them.
+    return CouncilFeatureBuilder.construct(**fields)
+
+
+def build_feature_index_maps(
+    metadata_map: dict[str, CouncilMeta]
+) -> dict[str, dict[Any, int]]:
+    return dict(
         council_id=_as_index_map(set(meta.id for meta in metadata_map.values())),
         council_pickupRatio=_as_index_map(
             set(meta.pickupRatio for meta in metadata_map.values())
@@ -138,3 +227,9 @@ def get_feature_builder() -> CouncilFeatureBuilder:
             set(logic.remainTurn for logic in _all_logics(metadata_map))
         ),
     )
+
+
+@functools.lru_cache(maxsize=None)
+def get_feature_matrix() -> CouncilFeatureMatrix:
+    """Dense features of the in-game councils, built once per process."""
+    return get_feature_builder().build_matrix()
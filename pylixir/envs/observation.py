@@ -1,15 +1,18 @@
 import enum
-from typing import Union
+from typing import Any, Union
 
+import numpy as np
+import numpy.typing as npt
 import pydantic
 
 from pylixir.application.game import Client
+from pylixir.application.recorder import ODDS_SCALE, STATE_ENCODING
 from pylixir.application.reducer import PickCouncilAndEnchantAndRerollAction
 from pylixir.core.base import Board, Enchanter
 from pylixir.core.committee import Sage, SageCommittee
 from pylixir.core.progress import Progress
-from pylixir.core.state import CouncilQuery
-from pylixir.envs.feature import get_feature_builder
+from pylixir.core.state import Suggestions
+from pylixir.envs.feature import IntArray, get_feature_matrix
 
 
 class EmbeddingName(enum.Enum):
@@ -51,8 +54,8 @@ class EmbeddingProvider:
     """This wil create such integer-set, which may suitable and parsed by  EmbeddingRenderer"""
 
     def __init__(self, index_map: dict[str, int]) -> None:
-        self._council_id_map = index_map
-        self._feature_builder = get_feature_builder()
+        self._feature_matrix = get_feature_matrix()
+        self._feature_table = self._feature_matrix.index_table(index_map)
         self._index_to_action: list[PickCouncilAndEnchantAndRerollAction] = sum(
             [
                 [
@@ -66,9 +69,7 @@ class EmbeddingProvider:
             [],
         )
 
-        self._suggestion_embedding_keys = list(
-            sorted(self._feature_builder.get_feature_by_id("31000").keys())
-        )
+        self._suggestion_embedding_keys = self._feature_matrix.keys
 
     def action_index_to_action(
         self, action_index: int
@@ -96,6 +97,20 @@ class EmbeddingProvider:
             + suggestion_vector
         )
 
+    def write_observation(self, client: Client, out: IntArray) -> None:
+        """Writes `create_observation(client)` into `out` in place."""
+        state = client.get_state()
+
+        for idx, sage in enumerate(state.committee.sages):
+            out[idx] = self._sage_to_integer(sage)
+        out[3] = state.progress.turn_left
+        out[4] = state.progress.reroll_left
+        out[5:10] = state.board.get_effect_values()
+        out[10:20] = self._enchanter_to_vector(
+            state.enchanter, state.board.locked_indices()
+        )
+        self.write_suggestions(state.suggestions, out[20:].reshape(3, -1))
+
     def current_total_reward(self, client: Client) -> float:
         state = client.get_state()
         values = state.board.get_effect_values()
@@ -160,21 +175,21 @@ class EmbeddingProvider:
         sage_indices = [self._sage_to_integer(sage) for sage in committee.sages]
         return sage_indices
 
-    def _suggestions_to_vector(
-        self, suggestions: tuple[CouncilQuery, CouncilQuery, CouncilQuery]
-    ) -> list[int]:
-        council_vector = []
-        for council in suggestions:
-            feature = self._feature_builder.get_feature_by_id(council.id)
-            council_vector += [feature[k] for k in self._suggestion_embedding_keys]
-
+    def _suggestions_to_vector(self, suggestions: Suggestions) -> list[int]:
+        council_vector: list[int] = (
+            self._feature_table[list(suggestions)].ravel().tolist()
+        )
         return council_vector
 
+    def write_suggestions(self, suggestions: Suggestions, out: IntArray) -> None:
+        """Writes suggestion features into `out`, a (3, feature) buffer view."""
+        np.take(self._feature_table, suggestions, axis=0, out=out)
+
 
 class DictObservation:
     def __init__(self, index_map: dict[str, int]) -> None:
-        self._council_id_map = index_map
-        self._feature_builder = get_feature_builder()
+        self._feature_matrix = get_feature_matrix()
+        self._feature_table = self._feature_matrix.index_table(index_map)
         self._index_to_action: list[PickCouncilAndEnchantAndRerollAction] = sum(
             [
                 [
@@ -188,9 +203,7 @@ class DictObservation:
             [],
         )
 
-        self._suggestion_embedding_keys = list(
-            sorted(self._feature_builder.get_feature_by_id("31000").keys())
-        )
+        self._suggestion_embedding_keys = self._feature_matrix.keys
 
     def action_index_to_action(
         self, action_index: int
@@ -213,6 +226,41 @@ class DictObservation:
 
         return vector
 
+    def observations_from_encodings(
+        self, encodings: npt.NDArray[np.integer[Any]]
+    ) -> dict[str, npt.NDArray[Any]]:
+        """
+        Observations of a batch of `encode_state` rows, as arrays with the batch
+        first. Odds are only as precise as the per mille of the encoding.
+        """
+
+        def field(name: str) -> npt.NDArray[np.int64]:
+            return encodings[:, STATE_ENCODING[name]].astype(np.int64)
+
+        observations: dict[str, npt.NDArray[Any]] = {}
+        committee = np.where(field("removed") != 0, 0, field("powers") + 7)
+        for idx in range(3):
+            observations[f"committee_{idx}"] = committee[:, idx]
+        observations["turn_left"] = field("turn_left")[:, 0]
+        observations["reroll"] = field("reroll_left")[:, 0]
+
+        board = np.where(field("locked") != 0, 11, field("values"))
+        for idx in range(5):
+            observations[f"board_{idx}"] = board[:, idx]
+
+        for key, name in [
+            ("enchant_lucky", "lucky_ratio"),
+            ("enchant_prob", "enchant_prob"),
+        ]:
+            observations[key] = (field(name) / ODDS_SCALE).astype(np.float32)
+
+        features = self._feature_table[field("suggestions")]  # (batch, 3, feature)
+        for idx in range(3):
+            for key_index, key in enumerate(self._suggestion_embedding_keys):
+                observations[f"suggestion_{idx}_{key}"] = features[:, idx, key_index]
+
+        return observations
+
     def current_total_reward(self, client: Client) -> float:
         state = client.get_state()
         values = state.board.get_effect_values()
@@ -267,8 +315,8 @@ class DictObservation:
         self, enchanter: Enchanter, locked: list[int]
     ) -> dict[str, list[float]]:
         return {
-            "enchant_lucky": enchanter.query_lucky_ratio(),
-            "enchant_prob": enchanter.query_enchant_prob(locked),
+            "enchant_lucky": list(enchanter.query_lucky_ratio()),
+            "enchant_prob": list(enchanter.query_enchant_prob(locked)),
         }
 
     def _progress_to_vector(self, progress: Progress) -> dict[str, int]:
@@ -285,16 +333,15 @@ class DictObservation:
             for idx, sage in enumerate(committee.sages)
         }
 
-    def _suggestions_to_vector(
-        self, suggestions: tuple[CouncilQuery, CouncilQuery, CouncilQuery]
-    ) -> dict[str, int]:
+    def _suggestions_to_vector(self, suggestions: Suggestions) -> dict[str, int]:
+        features: list[list[int]] = self._feature_table[list(suggestions)].tolist()
+
         council_vector = {}
-        for idx, council in enumerate(suggestions):
-            feature = self._feature_builder.get_feature_by_id(council.id)
+        for idx, feature in enumerate(features):
             council_vector.update(
                 {
-                    f"suggestion_{idx}_{k}": feature[k]
-                    for k in self._suggestion_embedding_keys
+                    f"suggestion_{idx}_{k}": value
+                    for k, value in zip(self._suggestion_embedding_keys, feature)
                 }
             )
 
@@ -0,0 +1,118 @@
+"""
+Offline transitions from recorded trajectories.
+
+`OfflineDataset` serves (observation, action, reward, next observation, done)
+batches from the shards of a `TrajectoryRecorder`. Shards stay memory-mapped;
+a batch only reads the rows it gathers, so a dataset may be far larger than
+memory. Indices are global over the shards, in the order of `get_shard_paths`.
+"""
+from typing import Any, Callable, Iterator, NamedTuple, Optional
+
+import numpy as np
+import numpy.typing as npt
+
+from pylixir.application.recorder import load_shards
+
+ObservationTransform = Callable[[npt.NDArray[Any]], Any]
+
+
+class TransitionBatch(NamedTuple):
+    observations: Any  # recorded rows, or as given by the transform
+    actions: npt.NDArray[np.int64]
+    rewards: npt.NDArray[np.float32]
+    next_observations: Any
+    dones: npt.NDArray[np.bool_]
+
+
+class OfflineDataset:
+    def __init__(
+        self,
+        directory: str,
+        transform: Optional[ObservationTransform] = None,
+        include_rejected: bool = True,
+    ) -> None:
+        """
+        `transform` maps a batch of recorded observations to the observations of
+        the policy, e.g. `DictObservation.observations_from_encodings`. Without
+        `include_rejected`, steps the client refused are skipped.
+        """
+        self._shards = [shard for shard in load_shards(directory) if len(shard) > 0]
+        if len(self._shards) == 0:
+            raise ValueError(f"No recorded shard in {directory}")
+        widths = {shard["observation"].shape[1] for shard in self._shards}
+        if len(widths) > 1:
+            raise ValueError(f"Shards of {directory} have different observations")
+
+        self._transform = transform
+        # rows of each shard to serve; None serves all of them.
+        self._rows: list[Optional[npt.NDArray[np.int64]]] = [
+            None if include_rejected else np.flatnonzero(shard["accepted"])
+            for shard in self._shards
+        ]
+        self._offsets: npt.NDArray[np.int64] = np.cumsum(
+            [0]
+            + [
+                len(shard) if rows is None else len(rows)
+                for shard, rows in zip(self._shards, self._rows)
+            ]
+        )
+        self.observation_width = widths.pop()
+
+    def __len__(self) -> int:
+        return int(self._offsets[-1])
+
+    def get(self, indices: npt.ArrayLike) -> TransitionBatch:
+        """Transitions at `indices`, in that order."""
+        indices = np.asarray(indices, dtype=np.int64)
+        if indices.size > 0 and (indices.min() < 0 or indices.max() >= len(self)):
+            raise IndexError("Transition index out of range")
+
+        count = len(indices)
+        dtype = self._shards[0]["observation"].dtype
+        observations = np.empty((count, self.observation_width), dtype=dtype)
+        next_observations = np.empty_like(observations)
+        actions = np.empty(count, dtype=np.int64)
+        rewards = np.empty(count, dtype=np.float32)
+        dones = np.empty(count, dtype=np.bool_)
+
+        shard_indices = np.searchsorted(self._offsets, indices, side="right") - 1
+        for shard_index in np.unique(shard_indices):
+            selected = shard_indices == shard_index
+            rows = self._shard_rows(shard_index, indices[selected])
+            shard = self._shards[shard_index]
+            observations[selected] = shard["observation"][rows]
+            next_observations[selected] = shard["next_observation"][rows]
+            actions[selected] = shard["action"][rows]
+            rewards[selected] = shard["reward"][rows]
+            dones[selected] = shard["done"][rows]
+
+        return TransitionBatch(
+            observations=self._apply_transform(observations),
+            actions=actions,
+            rewards=rewards,
+            next_observations=self._apply_transform(next_observations),
+            dones=dones,
+        )
+
+    def sample(self, batch_size: int, rng: np.random.Generator) -> TransitionBatch:
+        """Uniform sample of `batch_size` transitions, with replacement."""
+        return self.get(rng.integers(len(self), size=batch_size))
+
+    def iterate(self, batch_size: int) -> Iterator[TransitionBatch]:
+        """Every transition once, in order, in batches of `batch_size`."""
+        for start in range(0, len(self), batch_size):
+            yield self.get(np.arange(start, min(start + batch_size, len(self))))
+
+    def _shard_rows(
+        self, shard_index: int, indices: npt.NDArray[np.int64]
+    ) -> npt.NDArray[np.int64]:
+        rows: npt.NDArray[np.int64] = indices - self._offsets[shard_index]
+        served = self._rows[shard_index]
+        if served is not None:
+            rows = served[rows]
+        return rows
+
+    def _apply_transform(self, observations: npt.NDArray[Any]) -> Any:
+        if self._transform is None:
+            return observations
+        return self._transform(observations)
@@ -1,5 +1,6 @@
 from pylixir.application.game import Client
-from pylixir.core.randomness import SeededRandomness
+from pylixir.core.base import Randomness
+from pylixir.core.randomness import CounterRandomness, SeededRandomness
 from pylixir.data.pool import get_ingame_council_pool
 from pylixir.interface.configuration import state_initializer
 
@@ -20,14 +21,24 @@ def get_client(seed: int, show_previous_board: bool = False) -> Client:
 
 
 class ClientBuilder:
-    def __init__(self) -> None:
+    def __init__(self, common_random_numbers: bool = False) -> None:
+        """
+        With `common_random_numbers`, clients draw from `CounterRandomness`, so
+        policies played on the same seed share their luck.
+        """
         self._council_pool = get_ingame_council_pool()
         self._state_initializer = state_initializer
+        self._common_random_numbers = common_random_numbers
 
     def get_client(self, seed: float) -> Client:
+        randomness: Randomness = (
+            CounterRandomness(int(seed))
+            if self._common_random_numbers
+            else SeededRandomness(seed)
+        )
         return Client(
             self._state_initializer,
             self._state_initializer(),
             council_pool=self._council_pool,
-            randomness=SeededRandomness(seed),
+            randomness=randomness,
         )
@@ -1,7 +1,7 @@
 from pylixir.core.base import Board, Effect
 from pylixir.core.committee import Sage, SageCommittee
 from pylixir.core.progress import GamePhase, Progress
-from pylixir.core.state import CouncilQuery, GameState
+from pylixir.core.state import GameState
 
 
 def create_empty_committee() -> SageCommittee:
@@ -32,5 +32,5 @@ def state_initializer(max_value: int = 10) -> GameState:
             ),
         ),
         committee=create_empty_committee(),
-        suggestions=(CouncilQuery(id=""), CouncilQuery(id=""), CouncilQuery(id="")),
+        suggestions=(0, 0, 0),
     )
@@ -0,0 +1,156 @@
+"""
+Deterministic replay of recorded games.
+
+A game is reproduced from its `GameRecord`: the seed of the client and every
+action played, rejected ones included, since a rejected pick may have drawn
+before it was refused. `ReplayEngine` plays the actions again on a client of
+`ClientBuilder.get_client`, checking the state hash after every step against
+the record, and keeps checkpoints, randomness included, so that jumping to a
+step or a turn only replays the steps since the nearest checkpoint.
+
+Records are plain JSON, so a crash in a long run can be reproduced from its log
+instead of a pickled client.
+"""
+import hashlib
+from typing import NamedTuple, Optional
+
+import pydantic
+
+from pylixir.application.game import Client, ClientSnapshot
+from pylixir.application.mask import REROLL_ACTION, SAGE_COUNT
+from pylixir.core.state import GameState
+from pylixir.interface.cli import ClientBuilder
+
+
+class ReplayMismatchException(Exception):
+    ...
+
+
+class GameRecord(pydantic.BaseModel):
+    seed: int
+    common_random_numbers: bool = False
+    actions: list[int] = []  # `effect_index * 3 + sage_index`, or `REROLL_ACTION`
+    hashes: list[str] = []  # `hash_state` after every action, if known
+
+
+def hash_state(state: GameState) -> str:
+    """Hash of the value of `state`, stable across processes."""
+    digest = hashlib.blake2b(repr(state.snapshot()).encode(), digest_size=8)
+    return digest.hexdigest()
+
+
+def play_action(client: Client, action_index: int) -> bool:
+    """Plays `action_index` on `client`; False if the client refused it."""
+    if action_index == REROLL_ACTION:
+        return client.reroll()
+
+    effect_index, sage_index = divmod(action_index, SAGE_COUNT)
+    return client.pick(sage_index, effect_index)
+
+
+class _Checkpoint(NamedTuple):
+    snapshot: ClientSnapshot
+    turn_passed: int
+
+
+class ReplayEngine:
+    def __init__(
+        self,
+        record: GameRecord,
+        client_builder: Optional[ClientBuilder] = None,
+        checkpoint_interval: int = 4,
+    ) -> None:
+        """
+        A checkpoint is kept every `checkpoint_interval` steps as they are
+        replayed. `client_builder` should match `record.common_random_numbers`.
+        """
+        if client_builder is None:
+            client_builder = ClientBuilder(record.common_random_numbers)
+
+        self._record = record
+        self._client = client_builder.get_client(record.seed)
+        self._checkpoint_interval = max(checkpoint_interval, 1)
+        self._step = 0
+        self._hashes: list[str] = []  # after every step replayed so far
+        self._checkpoints: dict[int, _Checkpoint] = {0: self._checkpoint()}
+
+    @property
+    def step(self) -> int:
+        """Actions replayed so far on `client`."""
+        return self._step
+
+    @property
+    def client(self) -> Client:
+        return self._client
+
+    def __len__(self) -> int:
+        return len(self._record.actions)
+
+    def seek(self, step: int) -> Client:
+        """Client after the first `step` actions of the record."""
+        if not 0 <= step <= len(self):
+            raise IndexError(f"Step should be in [0, {len(self)}], got {step}")
+
+        start = max(index for index in self._checkpoints if index <= step)
+        if step < self._step or start > self._step:
+            self._client.restore(self._checkpoints[start].snapshot)
+            self._step = start
+
+        while self._step < step:
+            self._play_next()
+
+        return self._client
+
+    def seek_turn(self, turn: int) -> Client:
+        """Client at the first step where at least `turn` turns have passed."""
+        self.seek(
+            max(
+                index
+                for index, checkpoint in self._checkpoints.items()
+                if checkpoint.turn_passed < turn or index == 0
+            )
+        )
+        while self._client.get_state().progress.turn_passed < turn:
+            if self._step >= len(self):
+                raise IndexError(f"The record ends before turn {turn}")
+            self._play_next()
+
+        return self._client
+
+    def verify(self) -> list[str]:
+        """Replays the whole record, checking every step; returns the hashes."""
+        self.seek(len(self))
+        return list(self._hashes)
+
+    def _play_next(self) -> None:
+        step = self._step
+        play_action(self._client, self._record.actions[step])
+        self._step += 1
+
+        state_hash = hash_state(self._client.get_state())
+        self._verify(step, state_hash)
+        if step == len(self._hashes):
+            self._hashes.append(state_hash)
+
+        if self._step % self._checkpoint_interval == 0:
+            self._checkpoints.setdefault(self._step, self._checkpoint())
+
+    def _verify(self, step: int, state_hash: str) -> None:
+        expected = None
+        if step < len(self._record.hashes):
+            expected = self._record.hashes[step]
+        elif step < len(self._hashes):
+            expected = self._hashes[step]  # a step replayed before
+
+        if expected is not None and expected != state_hash:
+            raise ReplayMismatchException(
+                f"State after step {step} (action {self._record.actions[step]}) "
+                f"hashes to {state_hash}, expected {expected}\n"
+                f"{self._client.view()}"
+            )
+
+    def _checkpoint(self) -> _Checkpoint:
+        return _Checkpoint(
+            snapshot=self._client.snapshot(with_randomness=True),
+            turn_passed=self._client.get_state().progress.turn_passed,
+        )
@@ -0,0 +1,263 @@
+"""
+Exact expectimax over `pick_council`/`reroll`.
+
+Chance nodes follow the exact distributions of council sampling
+(`ConcreteCouncilPool.get_council_distribution`), council logics and
+`EnchantCommand` (`EnchantCommand.enchant_distribution`, cached); see
+`pylixir.core.outcome`. Values of states before their
+suggestions are drawn are memoized in a bounded transposition table.
+
+The search is exhaustive, so it is tractable only near the end of a game, e.g.
+in the lock phase where few councils are available.
+"""
+import math
+from typing import Callable, Hashable, Optional
+
+import pydantic
+
+from pylixir.application.council import Council, ForbiddenActionException
+from pylixir.application.enchant import EnchantCommand
+from pylixir.application.reducer import (
+    Action,
+    PickCouncilAndEnchantAndRerollAction,
+    RerollAction,
+    apply_council_logics,
+    apply_enchant_result,
+)
+from pylixir.core.base import Randomness
+from pylixir.core.outcome import Outcome, enumerate_outcomes, merge_outcomes
+from pylixir.core.state import GameState, StateKey, get_state_key
+from pylixir.data.council_pool import ConcreteCouncilPool
+from pylixir.search.table import TranspositionTable
+
+Objective = Callable[[GameState], float]
+CouncilTriple = tuple[Council, Council, Council]
+
+FORBIDDEN = -math.inf
+
+
+def get_valuation(state: GameState, index: tuple[int, int] = (0, 1)) -> int:
+    values = state.board.get_effect_values()
+    unlocked_indices = state.board.unlocked_indices()
+
+    return sum(values[idx] for idx in index if idx in unlocked_indices)
+
+
+def success_objective(threshold: int, index: tuple[int, int] = (0, 1)) -> Objective:
+    """1 when the valuation reaches `threshold`, as in sum14/16/18 success rates."""
+
+    def _objective(state: GameState) -> float:
+        return float(get_valuation(state, index) >= threshold)
+
+    return _objective
+
+
+class Solution(pydantic.BaseModel):
+    action: Action
+    value: float
+    action_values: list[tuple[Action, float]]
+
+
+class ExpectimaxSolver:
+    def __init__(
+        self,
+        council_pool: ConcreteCouncilPool,
+        objective: Objective,
+        table_capacity: int = 1_000_000,
+    ) -> None:
+        self._council_pool = council_pool
+        self._objective = objective
+        self._enchant_command = EnchantCommand()
+        self.table: TranspositionTable[float] = TranspositionTable(table_capacity)
+
+    def solve(self, state: GameState) -> Solution:
+        """Optimal action for `state` with its current suggestions."""
+        councils = self._get_suggested_councils(state)
+        action_values: list[tuple[Action, float]] = []
+
+        for sage_index in state.committee.get_valid_slots():
+            for effect_index in self._get_effect_choices(state, councils[sage_index]):
+                pick = PickCouncilAndEnchantAndRerollAction(
+                    effect_index=effect_index, sage_index=sage_index
+                )
+                value = self._action_value(state, councils, pick)
+                if value != FORBIDDEN:
+                    action_values.append((pick, value))
+
+        if state.progress.reroll_left > 0:
+            action_values.append(
+                (RerollAction(), self._reroll_value(state, councils, {}))
+            )
+
+        if len(action_values) == 0:
+            raise ForbiddenActionException("No action is available")
+
+        action, value = max(action_values, key=lambda action_value: action_value[1])
+        return Solution(action=action, value=value, action_values=action_values)
+
+    def value(self, state: GameState) -> float:
+        """Optimal expected objective of `state` before its suggestions are drawn."""
+        if state.progress.turn_left <= 0:
+            return self._objective(state)
+
+        key = ("chance",) + get_state_key(state)
+        cached = self.table.get(key)
+        if cached is not None:
+            return cached
+
+        decision_cache: dict[Hashable, float] = {}
+        value = sum(
+            prob * self._decision_value(state, councils, decision_cache)
+            for prob, councils in self._get_suggestion_distribution(state, None)
+        )
+        self.table.put(key, value)
+        return value
+
+    def _decision_value(
+        self,
+        state: GameState,
+        councils: CouncilTriple,
+        decision_cache: dict[Hashable, float],
+    ) -> float:
+        cache_key = (
+            state.progress.reroll_left,
+            tuple(council.id for council in councils),
+        )
+        if cache_key in decision_cache:
+            return decision_cache[cache_key]
+
+        best = max(
+            (
+                self._pick_value(state, sage_index, councils[sage_index])
+                for sage_index in state.committee.get_valid_slots()
+            ),
+            default=FORBIDDEN,
+        )
+        if state.progress.reroll_left > 0:
+            best = max(best, self._reroll_value(state, councils, decision_cache))
+
+        if best == FORBIDDEN:  # no way to proceed; the board stays as it is.
+            best = self._objective(state)
+
+        decision_cache[cache_key] = best
+        return best
+
+    def _reroll_value(
+        self,
+        state: GameState,
+        councils: CouncilTriple,
+        decision_cache: dict[Hashable, float],
+    ) -> float:
+        progress = state.progress.copy()
+        progress.spent_reroll()
+        rerolled = state.copy(update=dict(progress=progress))
+
+        return sum(
+            prob * self._decision_value(rerolled, next_councils, decision_cache)
+            for prob, next_councils in self._get_suggestion_distribution(
+                rerolled, councils
+            )
+        )
+
+    def _pick_value(self, state: GameState, sage_index: int, council: Council) -> float:
+        key: StateKey = ("pick", sage_index, council.id) + get_state_key(state)
+        cached = self.table.get(key)
+        if cached is not None:
+            return cached
+
+        value = max(
+            self._action_value(
+                state,
+                (council, council, council),
+                PickCouncilAndEnchantAndRerollAction(
+                    effect_index=effect_index, sage_index=sage_index
+                ),
+            )
+            for effect_index in self._get_effect_choices(state, council)
+        )
+        self.table.put(key, value)
+        return value
+
+    def _action_value(
+        self,
+        state: GameState,
+        councils: CouncilTriple,
+        action: PickCouncilAndEnchantAndRerollAction,
+    ) -> float:
+        suggested = state.copy(
+            update=dict(
+                suggestions=tuple(self._council_pool.get_index(c) for c in councils)
+            )
+        )
+
+        def _apply_logics(randomness: Randomness) -> GameState:
+            return apply_council_logics(
+                action, suggested.copy(deep=True), randomness, self._council_pool
+            )
+
+        try:
+            applied = self._enumerate_states(_apply_logics)
+        except ForbiddenActionException:
+            return FORBIDDEN
+
+        value = 0.0
+        for applied_prob, applied_state in applied:
+            applied_state.committee.pick(action.sage_index)
+
+            for enchanted_prob, result in self._enchant_command.enchant_distribution(
+                applied_state
+            ):
+                enchanted_state = apply_enchant_result(
+                    applied_state.copy(deep=True), result
+                )
+                value += applied_prob * enchanted_prob * self.value(enchanted_state)
+
+        return value
+
+    def _enumerate_states(
+        self, computation: Callable[[Randomness], GameState]
+    ) -> list[Outcome[GameState]]:
+        return merge_outcomes(enumerate_outcomes(computation), key=get_state_key)
+
+    def _get_suggestion_distribution(
+        self, state: GameState, previous: Optional[CouncilTriple]
+    ) -> list[Outcome[CouncilTriple]]:
+        """Exact distribution of `ConcreteCouncilPool.get_council_set`."""
+        sage_a, sage_b, sage_c = state.committee.sages
+        pool = self._council_pool
+
+        def _forbidden(slot: int, chosen: list[Council]) -> list[str]:
+            previous_ids = [previous[slot].id] if previous is not None else []
+            return previous_ids + [council.id for council in chosen]
+
+        distribution: list[Outcome[CouncilTriple]] = []
+        for prob_a, council_a in pool.get_council_distribution(
+            state, sage_a, _forbidden(0, [])
+        ):
+            for prob_b, council_b in pool.get_council_distribution(
+                state, sage_b, _forbidden(1, [council_a])
+            ):
+                for prob_c, council_c in pool.get_council_distribution(
+                    state, sage_c, _forbidden(2, [council_a, council_b])
+                ):
+                    distribution.append(
+                        (
+                            prob_a * prob_b * prob_c,
+                            (council_a, council_b, council_c),
+                        )
+                    )
+
+        return distribution
+
+    def _get_suggested_councils(self, state: GameState) -> CouncilTriple:
+        council_a, council_b, council_c = (
+            self._council_pool.get_council(index) for index in state.suggestions
+        )
+        return (council_a, council_b, council_c)
+
+    def _get_effect_choices(self, state: GameState, council: Council) -> list[int]:
+        """`effect_index` only matters to councils that let the user select."""
+        if council.uses_effect_index():
+            return state.board.unlocked_indices()
+
+        return [0]
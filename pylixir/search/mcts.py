@@ -0,0 +1,267 @@
+"""
+Monte Carlo tree search over `pick_council`/`reroll`.
+
+Decision nodes hold the snapshot of a state with its suggestions drawn; one
+working state is restored from them whenever a node is expanded, evaluated or
+acted on, so the tree is grown without copying states. Every action edge is a
+chance node over the states the reducers may return (council logics, enchant
+and the next suggestions), grown with progressive widening: a new outcome is
+sampled only while the edge has fewer than `widening_constant * visits **
+widening_exponent` outcomes, otherwise a known outcome is revisited in
+proportion to how often it was drawn.
+
+Edges are selected with UCT, or with PUCT when a prior hook is given. Leaves are
+valued by a value hook or by playing them out with a rollout policy.
+"""
+import math
+import time
+from typing import Callable, Optional, cast
+
+import pydantic
+
+from pylixir.application.council import ForbiddenActionException
+from pylixir.core.base import Randomness
+from pylixir.core.compact import CompactGameState
+from pylixir.core.randomness import SeededRandomness
+from pylixir.core.state import GameState, StateSnapshot
+from pylixir.data.council_pool import ConcreteCouncilPool
+from pylixir.search.expectimax import Objective
+from pylixir.search.rollout import (
+    AdvisedAction,
+    RolloutPolicy,
+    apply_action_in_place,
+    get_candidate_actions,
+    play_out,
+    random_policy,
+)
+
+PriorFunction = Callable[[GameState, list[AdvisedAction]], list[float]]
+ValueFunction = Callable[[GameState], float]
+
+
+class MCTSConfig(pydantic.BaseModel):
+    simulations: int = 400
+    time_budget: Optional[float] = None
+    exploration: float = 1.4
+    widening_constant: float = 1.0
+    widening_exponent: float = 0.5
+
+
+class DecisionNode:
+    __slots__ = ("snapshot", "visits", "edges")
+
+    def __init__(self, snapshot: StateSnapshot) -> None:
+        self.snapshot = snapshot
+        self.visits = 0
+        self.edges: Optional[list[ActionEdge]] = None
+
+
+class ActionEdge:
+    __slots__ = ("action", "prior", "visits", "value_sum", "outcomes", "draws")
+
+    def __init__(self, action: AdvisedAction, prior: float) -> None:
+        self.action = action
+        self.prior = prior
+        self.visits = 0
+        self.value_sum = 0.0
+        self.outcomes: dict[StateSnapshot, DecisionNode] = {}
+        self.draws: dict[StateSnapshot, int] = {}
+
+    def mean_value(self) -> float:
+        return self.value_sum / self.visits if self.visits > 0 else 0.0
+
+
+class ActionStatistics(pydantic.BaseModel):
+    action: AdvisedAction
+    visits: int
+    value: float
+    prior: float
+
+
+class MCTSAgent:
+    def __init__(
+        self,
+        council_pool: ConcreteCouncilPool,
+        objective: Objective,
+        config: Optional[MCTSConfig] = None,
+        prior: Optional[PriorFunction] = None,
+        value: Optional[ValueFunction] = None,
+        rollout_policy: RolloutPolicy = random_policy,
+        seed: int = 0,
+    ) -> None:
+        self._council_pool = council_pool
+        self._objective = objective
+        self._config = config or MCTSConfig()
+        self._prior = prior
+        self._value = value
+        self._rollout_policy = rollout_policy
+        self._randomness: Randomness = SeededRandomness(seed)
+        self._root: Optional[DecisionNode] = None
+        self._working: Optional[CompactGameState] = None
+
+    def search(self, state: GameState) -> AdvisedAction:
+        """Most visited action of `state` after the simulation budget is spent."""
+        root = self._get_root(state)
+        started = time.monotonic()
+
+        for _ in range(self._config.simulations):
+            self._simulate(root)
+            if (
+                self._config.time_budget is not None
+                and time.monotonic() - started >= self._config.time_budget
+            ):
+                break
+
+        edges = [edge for edge in root.edges or [] if edge.visits > 0]
+        if len(edges) == 0:
+            raise ForbiddenActionException("No action is available")
+
+        return max(edges, key=lambda edge: edge.visits).action
+
+    def advance(self, action: AdvisedAction, state: GameState) -> None:
+        """
+        Keeps the subtree of `state`, reached by playing `action`, for the next
+        `search`; the tree is dropped if `state` was never visited.
+        """
+        root, self._root = self._root, None
+        if root is None or root.edges is None:
+            return
+
+        key = state.snapshot()
+        for edge in root.edges:
+            if edge.action == action and key in edge.outcomes:
+                self._root = edge.outcomes[key]
+
+    def get_statistics(self) -> list[ActionStatistics]:
+        if self._root is None or self._root.edges is None:
+            return []
+
+        return [
+            ActionStatistics(
+                action=edge.action,
+                visits=edge.visits,
+                value=edge.mean_value(),
+                prior=edge.prior,
+            )
+            for edge in self._root.edges
+        ]
+
+    def _get_root(self, state: GameState) -> DecisionNode:
+        self._working = CompactGameState.from_state(state)
+        snapshot = self._working.snapshot()
+        if self._root is None or self._root.snapshot != snapshot:
+            self._root = DecisionNode(snapshot)
+
+        return self._root
+
+    def _load(self, snapshot: StateSnapshot) -> CompactGameState:
+        assert self._working is not None
+        self._working.restore(snapshot)
+        return self._working
+
+    def _simulate(self, node: DecisionNode) -> float:
+        state = self._load(node.snapshot)
+        if state.progress.turn_left <= 0:
+            return self._objective(cast(GameState, state))
+
+        if node.edges is None:
+            node.edges = self._expand(state)
+            node.visits += 1
+            return self._evaluate(state)
+
+        while True:
+            edge = self._select(node)
+            if edge is None:  # no way to proceed; the board stays as it is.
+                node.visits += 1
+                return self._objective(cast(GameState, state))
+
+            child = self._get_outcome(node, edge)
+            if child is not None:
+                break
+
+            node.edges.remove(edge)
+
+        value = self._simulate(child)
+        edge.visits += 1
+        edge.value_sum += value
+        node.visits += 1
+        return value
+
+    def _expand(self, state: CompactGameState) -> list[ActionEdge]:
+        actions = get_candidate_actions(cast(GameState, state), self._council_pool)
+        if len(actions) == 0:
+            return []
+
+        if self._prior is None:
+            priors = [1.0 / len(actions) for _ in actions]
+        else:
+            priors = self._prior(state.to_state(), actions)
+
+        return [ActionEdge(action, prior) for action, prior in zip(actions, priors)]
+
+    def _evaluate(self, state: CompactGameState) -> float:
+        if self._value is not None:
+            return self._value(state.to_state())
+
+        final = play_out(
+            state, self._council_pool, self._randomness, self._rollout_policy
+        )
+        self._working = final
+        return self._objective(cast(GameState, final))
+
+    def _select(self, node: DecisionNode) -> Optional[ActionEdge]:
+        assert node.edges is not None
+        if len(node.edges) == 0:
+            return None
+
+        if self._prior is None:
+            for edge in node.edges:
+                if edge.visits == 0:
+                    return edge
+
+            log_visits = math.log(node.visits)
+            return max(
+                node.edges,
+                key=lambda edge: edge.mean_value()
+                + self._config.exploration * math.sqrt(log_visits / edge.visits),
+            )
+
+        sqrt_visits = math.sqrt(node.visits)
+        return max(
+            node.edges,
+            key=lambda edge: edge.mean_value()
+            + self._config.exploration * edge.prior * sqrt_visits / (1 + edge.visits),
+        )
+
+    def _get_outcome(
+        self, node: DecisionNode, edge: ActionEdge
+    ) -> Optional[DecisionNode]:
+        """Outcome of `edge` for this simulation, or None if it is forbidden."""
+        widening = self._config.widening_constant * (
+            (edge.visits + 1) ** self._config.widening_exponent
+        )
+        if len(edge.outcomes) >= max(widening, 1.0):
+            keys = list(edge.draws.keys())
+            key = self._randomness.weighted_sampling_target(
+                [float(edge.draws[key]) for key in keys], keys
+            )
+            edge.draws[key] += 1
+            return edge.outcomes[key]
+
+        next_state = apply_action_in_place(
+            edge.action,
+            self._load(node.snapshot),
+            self._council_pool,
+            self._randomness,
+        )
+        if next_state is None:
+            return None
+
+        self._working = next_state
+        key = next_state.snapshot()
+        if key not in edge.outcomes:
+            edge.outcomes[key] = DecisionNode(key)
+            edge.draws[key] = 0
+        edge.draws[key] += 1
+
+        return edge.outcomes[key]
@@ -0,0 +1,376 @@
+"""
+Monte Carlo rollout advisor.
+
+Every candidate action of the current state is applied on a working copy, which
+is played to the end by a rollout policy and restored from a snapshot for the
+next rollout. `RolloutAdvisor.advise`
+streams the success rates of every candidate, with Wilson confidence intervals,
+after each round of rollouts until its time budget is spent.
+
+Rounds are split into tasks seeded by `(seed, round, candidate)`, so estimates
+of a given number of rounds do not depend on the number of workers.
+"""
+import contextlib
+import math
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Callable, ContextManager, Iterator, Optional, Sequence, Union, cast
+
+import pydantic
+
+from pylixir.application.council import ForbiddenActionException
+from pylixir.application.mask import (
+    EFFECT_COUNT,
+    REROLL_ACTION,
+    SAGE_COUNT,
+    get_action,
+    get_action_mask,
+)
+from pylixir.application.reducer import (
+    PickCouncilAndEnchantAndRerollAction,
+    RerollAction,
+    pick_council_compact,
+    reroll_compact,
+)
+from pylixir.core.base import Randomness
+from pylixir.core.compact import CompactGameState
+from pylixir.core.randomness import SeededRandomness
+from pylixir.core.state import GameState
+from pylixir.data.council_pool import ConcreteCouncilPool
+from pylixir.search.expectimax import get_valuation
+
+AdvisedAction = Union[PickCouncilAndEnchantAndRerollAction, RerollAction]
+RolloutPolicy = Callable[[CompactGameState, Randomness], AdvisedAction]
+
+DEFAULT_THRESHOLDS = (14, 16, 18)
+
+_worker: Optional[tuple[ConcreteCouncilPool, RolloutPolicy]] = None
+
+
+def random_policy(state: CompactGameState, randomness: Randomness) -> AdvisedAction:
+    """Picks a random sage and effect; never rerolls."""
+    return PickCouncilAndEnchantAndRerollAction(
+        sage_index=randomness.pick(state.committee.get_valid_slots()),
+        effect_index=randomness.pick(state.board.unlocked_indices()),
+    )
+
+
+def get_candidate_actions(
+    state: GameState, council_pool: ConcreteCouncilPool
+) -> list[AdvisedAction]:
+    """
+    Actions that may lead to different outcomes, i.e. the legal actions of
+    `get_action_mask`, ordered by sage and then effect, with the reroll last.
+    """
+    mask = get_action_mask(state, council_pool)
+    return [
+        get_action(effect_index * SAGE_COUNT + sage_index)
+        for sage_index in range(SAGE_COUNT)
+        for effect_index in range(EFFECT_COUNT)
+        if mask[effect_index * SAGE_COUNT + sage_index]
+    ] + ([RerollAction()] if mask[REROLL_ACTION] else [])
+
+
+class Interval(pydantic.BaseModel):
+    lower: float
+    upper: float
+
+
+def wilson_interval(successes: int, count: int, z: float = 1.96) -> Interval:
+    if count == 0:
+        return Interval(lower=0.0, upper=1.0)
+
+    rate = successes / count
+    denominator = 1 + z**2 / count
+    center = (rate + z**2 / (2 * count)) / denominator
+    margin = z * math.sqrt(rate * (1 - rate) / count + z**2 / (4 * count**2))
+    margin /= denominator
+
+    return Interval(lower=max(center - margin, 0.0), upper=min(center + margin, 1.0))
+
+
+class ActionEstimate(pydantic.BaseModel):
+    action: AdvisedAction
+    rollouts: int = 0
+    forbidden: bool = False
+    successes: dict[int, int]
+
+    def success_rate(self, threshold: int) -> float:
+        if self.rollouts == 0:
+            return 0.0
+
+        return self.successes[threshold] / self.rollouts
+
+    def interval(self, threshold: int, z: float = 1.96) -> Interval:
+        return wilson_interval(self.successes[threshold], self.rollouts, z)
+
+
+class AdvisorReport(pydantic.BaseModel):
+    estimates: list[ActionEstimate]
+    rounds: int
+    elapsed: float
+
+    def best(self, threshold: int) -> ActionEstimate:
+        candidates = [estimate for estimate in self.estimates if not estimate.forbidden]
+        if len(candidates) == 0:
+            raise ForbiddenActionException("No action is available")
+
+        return max(candidates, key=lambda estimate: estimate.success_rate(threshold))
+
+
+def play_out(
+    state: CompactGameState,
+    council_pool: ConcreteCouncilPool,
+    randomness: Randomness,
+    policy: RolloutPolicy,
+) -> CompactGameState:
+    """
+    Plays `state` to the end in place; falls back to any legal action on forbidden
+    ones.
+    """
+    while state.progress.turn_left > 0:
+        next_state = apply_action_in_place(
+            policy(state, randomness), state, council_pool, randomness
+        )
+        if next_state is None:
+            next_state = _apply_any(state, council_pool, randomness)
+        if next_state is None:  # no way to proceed; the board stays as it is.
+            break
+
+        state = next_state
+
+    return state
+
+
+def run_rollouts(
+    state: CompactGameState,
+    action: AdvisedAction,
+    count: int,
+    seed: int,
+    council_pool: ConcreteCouncilPool,
+    policy: RolloutPolicy = random_policy,
+    thresholds: Sequence[int] = DEFAULT_THRESHOLDS,
+) -> Optional[dict[int, int]]:
+    """Successes per threshold of `count` rollouts, or None if `action` is forbidden."""
+    randomness = SeededRandomness(seed)
+    successes = {threshold: 0 for threshold in thresholds}
+    working, snapshot = state.copy(deep=True), state.snapshot()
+
+    for _ in range(count):
+        working.restore(snapshot)
+        next_state = apply_action_in_place(action, working, council_pool, randomness)
+        if next_state is None:
+            return None
+
+        final = play_out(next_state, council_pool, randomness, policy)
+        working = final
+        valuation = get_valuation(cast(GameState, final))
+        for threshold in thresholds:
+            successes[threshold] += int(valuation >= threshold)
+
+    return successes
+
+
+class RolloutAdvisor:
+    def __init__(
+        self,
+        council_pool: ConcreteCouncilPool,
+        policy: RolloutPolicy = random_policy,
+        thresholds: Sequence[int] = DEFAULT_THRESHOLDS,
+        rollouts_per_round: int = 16,
+        workers: int = 1,
+        seed: int = 0,
+    ) -> None:
+        """
+        `policy` is sent to every worker once, so it must be picklable when
+        `workers` > 1.
+        """
+        self._council_pool = council_pool
+        self._policy = policy
+        self._thresholds = tuple(thresholds)
+        self._rollouts_per_round = rollouts_per_round
+        self._workers = workers
+        self._seed = seed
+
+    def advise(
+        self,
+        state: GameState,
+        time_budget: float,
+        max_rounds: Optional[int] = None,
+    ) -> Iterator[AdvisorReport]:
+        """
+        Yields a report after every round of rollouts, until `time_budget`
+        seconds are spent or `max_rounds` rounds are played.
+        """
+        started = time.monotonic()
+        compact = CompactGameState.from_state(state)
+        estimates = [
+            ActionEstimate(
+                action=action,
+                successes={threshold: 0 for threshold in self._thresholds},
+            )
+            for action in get_candidate_actions(state, self._council_pool)
+        ]
+
+        with self._get_executor() as executor:
+            rounds = 0
+            while time.monotonic() - started < time_budget and (
+                max_rounds is None or rounds < max_rounds
+            ):
+                self._run_round(executor, compact, estimates, rounds)
+                rounds += 1
+
+                yield AdvisorReport(
+                    estimates=[estimate.copy(deep=True) for estimate in estimates],
+                    rounds=rounds,
+                    elapsed=time.monotonic() - started,
+                )
+
+    def advise_until(
+        self,
+        state: GameState,
+        time_budget: float,
+        max_rounds: Optional[int] = None,
+    ) -> AdvisorReport:
+        """Last report of `advise`."""
+        report = AdvisorReport(estimates=[], rounds=0, elapsed=0.0)
+        for report in self.advise(state, time_budget, max_rounds):
+            pass
+
+        return report
+
+    def _run_round(
+        self,
+        executor: Optional[Executor],
+        state: CompactGameState,
+        estimates: list[ActionEstimate],
+        round_index: int,
+    ) -> None:
+        tasks = [
+            (
+                state,
+                estimate.action,
+                self._rollouts_per_round,
+                _task_seed(self._seed, round_index, index),
+                self._thresholds,
+            )
+            for index, estimate in enumerate(estimates)
+            if not estimate.forbidden
+        ]
+        if executor is None:
+            results = [
+                run_rollouts(
+                    *task[:4],
+                    council_pool=self._council_pool,
+                    policy=self._policy,
+                    thresholds=task[4],
+                )
+                for task in tasks
+            ]
+        else:
+            results = list(executor.map(_run_task, tasks))
+
+        pending = [estimate for estimate in estimates if not estimate.forbidden]
+        for estimate, successes in zip(pending, results):
+            if successes is None:
+                estimate.forbidden = True
+                continue
+
+            estimate.rollouts += self._rollouts_per_round
+            for threshold, count in successes.items():
+                estimate.successes[threshold] += count
+
+    def _get_executor(self) -> ContextManager[Optional[Executor]]:
+        if self._workers <= 1:
+            return contextlib.nullcontext()
+
+        return ProcessPoolExecutor(
+            max_workers=self._workers,
+            initializer=_initialize_worker,
+            initargs=(self._council_pool, self._policy),
+        )
+
+
+def _task_seed(seed: int, round_index: int, candidate_index: int) -> int:
+    return (seed * 1_000_003 + round_index) * 1_000_003 + candidate_index
+
+
+def apply_action(
+    action: AdvisedAction,
+    state: CompactGameState,
+    council_pool: ConcreteCouncilPool,
+    randomness: Randomness,
+) -> Optional[CompactGameState]:
+    """`action` applied on a fork of `state`, or None if it is forbidden."""
+    return apply_action_in_place(
+        action, state.copy(deep=True), council_pool, randomness
+    )
+
+
+def apply_action_in_place(
+    action: AdvisedAction,
+    state: CompactGameState,
+    council_pool: ConcreteCouncilPool,
+    randomness: Randomness,
+) -> Optional[CompactGameState]:
+    """
+    `action` applied on `state` itself, or None if it is forbidden; `state` is
+    left as it was in that case.
+    """
+    if isinstance(action, RerollAction):
+        if state.progress.reroll_left <= 0:
+            return None
+        return reroll_compact(state, randomness, council_pool)
+
+    if action.sage_index not in state.committee.get_valid_slots():
+        return None
+
+    snapshot = state.snapshot()
+    try:
+        return pick_council_compact(action, state, randomness, council_pool)
+    except ForbiddenActionException:
+        state.restore(snapshot)
+        return None
+
+
+def _apply_any(
+    state: CompactGameState,
+    council_pool: ConcreteCouncilPool,
+    randomness: Randomness,
+) -> Optional[CompactGameState]:
+    actions: list[AdvisedAction] = [
+        PickCouncilAndEnchantAndRerollAction(
+            sage_index=sage_index, effect_index=effect_index
+        )
+        for sage_index in state.committee.get_valid_slots()
+        for effect_index in state.board.unlocked_indices()
+    ]
+    actions.append(RerollAction())
+
+    for index in randomness.shuffle(list(range(len(actions)))):
+        next_state = apply_action_in_place(
+            actions[index], state, council_pool, randomness
+        )
+        if next_state is not None:
+            return next_state
+
+    return None
+
+
+def _initialize_worker(
+    council_pool: ConcreteCouncilPool, policy: RolloutPolicy
+) -> None:
+    global _worker  # pylint:disable=global-statement
+    _worker = (council_pool, policy)
+
+
+def _run_task(
+    task: tuple[CompactGameState, AdvisedAction, int, int, tuple[int, ...]]
+) -> Optional[dict[int, int]]:
+    assert _worker is not None, "worker is not initialized"
+    council_pool, policy = _worker
+    state, action, count, seed, thresholds = task
+
+    return run_rollouts(
+        state, action, count, seed, council_pool, policy=policy, thresholds=thresholds
+    )
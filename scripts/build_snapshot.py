@@ -0,0 +1,4 @@
+from pylixir.data.snapshot import build_ingame_snapshot
+
+if __name__ == "__main__":
+    print(f"Snapshot written to {build_ingame_snapshot()}")
@@ -0,0 +1,89 @@
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Optional
+
+from pylixir.application.reducer import RerollAction
+from pylixir.data.pool import get_ingame_council_pool
+from pylixir.interface.cli import ClientBuilder
+from pylixir.search.expectimax import get_valuation, success_objective
+from pylixir.search.mcts import MCTSAgent, MCTSConfig
+
+
+def play(seed: int, simulations: int, threshold: int, model: Optional[str]) -> int:
+    council_pool = get_ingame_council_pool()
+    client = ClientBuilder().get_client(seed)
+
+    hooks = {}
+    if model is not None:
+        # deep depends on torch and stable-baselines3; import only when asked.
+        from stable_baselines3 import DQN  # pylint:disable=import-outside-toplevel
+
+        from deep.stable_baselines.mcts_hooks import (  # pylint:disable=import-outside-toplevel
+            QNetworkHooks,
+        )
+
+        q_hooks = QNetworkHooks(DQN.load(model, device="cpu"))
+        hooks = dict(prior=q_hooks.prior, rollout_policy=q_hooks.rollout_policy)
+
+    agent = MCTSAgent(
+        council_pool,
+        success_objective(threshold),
+        MCTSConfig(simulations=simulations),
+        seed=seed,
+        **hooks,
+    )
+    while not client.is_done():
+        action = agent.search(client.get_state())
+        if isinstance(action, RerollAction):
+            client.reroll()
+        else:
+            client.pick(action.sage_index, action.effect_index)
+        agent.advance(action, client.get_state())
+
+    return get_valuation(client.get_state())
+
+
+def benchmark(
+    seeds: int, simulations: int, threshold: int, workers: int, model: Optional[str]
+) -> None:
+    start = time.time()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        valuations = list(
+            executor.map(
+                play,
+                range(seeds),
+                [simulations] * seeds,
+                [threshold] * seeds,
+                [model] * seeds,
+                chunksize=max(seeds // (workers * 4), 1),
+            )
+        )
+    elapsed = time.time() - start
+
+    rates = [
+        100 * sum(valuation >= bound for valuation in valuations) / seeds
+        for bound in (14, 16, 18)
+    ]
+    name = f"mcts-sim{simulations}-sum{threshold}" + ("-qprior" if model else "")
+    registered = datetime.now().strftime("%B %-d, %Y %-I:%M %p")
+    note = f"{seeds} seeds, {elapsed / seeds:.2f}s per game"
+
+    print(
+        f"{name} | MCTS | {rates[0]:.2f} | {rates[1]:.2f} | {rates[2]:.2f} | {registered} | {note} |  "
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="MCTS agent, reported as a benchmark.md row"
+    )
+    parser.add_argument("--seeds", type=int, default=1000)
+    parser.add_argument("--simulations", type=int, default=400)
+    parser.add_argument("--threshold", type=int, default=16)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--model", type=str, default=None, help="DQN zip for priors")
+    args = parser.parse_args()
+
+    benchmark(args.seeds, args.simulations, args.threshold, args.workers, args.model)
@@ -1,23 +1,32 @@
-from deep.ml.base import Evaluator, RandomModel, Any53Metric
+import argparse
+import time
 
-from cProfile import Profile
-from pstats import Stats
+import numpy as np
 
-def test():
-    evaluator = Evaluator(
-        RandomModel(),
-        Any53Metric()
-    )
+from pylixir.batch.simulator import REROLL_ACTION, BatchSimulator
+from pylixir.data.pool import get_ingame_council_pool
 
-    evaluator.benchmark(4000, interval=1000)
 
-profiler = Profile()
-profiler.run('test()')
+def benchmark(size: int, seed: int) -> None:
+    simulator = BatchSimulator(get_ingame_council_pool(), size, seed=seed)
+    policy = np.random.default_rng(seed)
 
-stats = Stats(profiler)
-stats.strip_dirs()
-stats.sort_stats('cumtime')
-stats.print_stats()
+    start = time.time()
+    while not simulator.is_done().all():
+        simulator.step(policy.integers(0, REROLL_ACTION, size=size))
+    elapsed = time.time() - start
 
+    valuation = simulator.valuation()
+    print(f"games: {size}, elapsed: {elapsed:.2f}s ({size / elapsed:.0f} games/s)")
+    print(f"mean valuation: {valuation.mean():.3f}")
+    for threshold in (14, 16, 18):
+        print(f"sum{threshold}: {(valuation >= threshold).mean():.5f}")
 
-#if __name__ == "__main__":
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Batched random-policy baseline")
+    parser.add_argument("--size", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    benchmark(args.size, args.seed)
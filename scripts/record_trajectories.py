@@ -0,0 +1,40 @@
+import argparse
+import time
+
+import numpy as np
+
+from pylixir.envs.DictPylixirEnv import DictPylixirEnv
+
+
+def record(directory: str, episodes: int, seed: int) -> None:
+    """Plays uniformly random legal actions and records every step."""
+    env = DictPylixirEnv(record_to=directory)
+    policy = np.random.default_rng(seed)
+
+    start = time.time()
+    steps = 0
+    for episode in range(episodes):
+        env.reset(seed=seed + episode)
+        terminated = False
+        while not terminated:
+            legal = np.flatnonzero(env.action_masks())
+            if len(legal) == 0:
+                break
+            _, _, terminated, _, _ = env.step(int(policy.choice(legal)))
+            steps += 1
+    env.close()
+    elapsed = time.time() - start
+
+    print(f"episodes: {episodes}, steps: {steps}, elapsed: {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Record random-policy episodes as an offline dataset"
+    )
+    parser.add_argument("directory", type=str)
+    parser.add_argument("--episodes", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    record(args.directory, args.episodes, args.seed)
@@ -0,0 +1,31 @@
+import argparse
+from typing import Optional
+
+from pylixir.interface.replay import GameRecord, ReplayEngine
+
+
+def replay(path: str, turn: Optional[int], show: bool) -> None:
+    """Replays a `GameRecord` JSON, e.g. the `replay:` line of an env error."""
+    with open(path, encoding="utf-8") as f:
+        record = GameRecord.parse_raw(f.read())
+
+    engine = ReplayEngine(record)
+    hashes = engine.verify()
+    print(f"seed: {record.seed}, steps: {len(hashes)}, verified")
+
+    if turn is not None:
+        engine.seek_turn(turn)
+        print(f"turn {turn}, step {engine.step}")
+        print(engine.client.view())
+    elif show:
+        print(engine.client.view())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay and verify a recorded game")
+    parser.add_argument("path", type=str, help="GameRecord JSON")
+    parser.add_argument("--turn", type=int, default=None, help="show this turn")
+    parser.add_argument("--show", action="store_true", help="show the last state")
+    args = parser.parse_args()
+
+    replay(args.path, args.turn, args.show)
@@ -0,0 +1,85 @@
+from random import Random
+from typing import Optional
+
+import pytest
+
+from pylixir.application.council import ForbiddenActionException
+from pylixir.application.reducer import (
+    PickCouncilAndEnchantAndRerollAction,
+    pick_council,
+    pick_council_compact,
+    reroll,
+    reroll_compact,
+)
+from pylixir.core.compact import CompactGameState
+from pylixir.core.randomness import SeededRandomness
+from pylixir.core.state import GameState
+from pylixir.data.council_pool import ConcreteCouncilPool
+from pylixir.data.pool import get_ingame_council_pool
+from pylixir.interface.configuration import state_initializer
+
+
+@pytest.fixture(name="council_pool")
+def fixture_council_pool() -> ConcreteCouncilPool:
+    return get_ingame_council_pool(skip=True)
+
+
+def _choose_action(
+    state: GameState, policy: Random
+) -> Optional[PickCouncilAndEnchantAndRerollAction]:
+    if state.progress.reroll_left > 0 and policy.random() < 0.1:
+        return None
+
+    return PickCouncilAndEnchantAndRerollAction(
+        sage_index=policy.choice(state.committee.get_valid_slots()),
+        effect_index=policy.choice(state.board.unlocked_indices()),
+    )
+
+
+def _assert_same(state: GameState, compact: CompactGameState) -> None:
+    converted = compact.to_state()
+    assert converted == state
+    assert converted.enchanter.query_enchant_prob(
+        converted.board.locked_indices()
+    ) == state.enchanter.query_enchant_prob(state.board.locked_indices())
+    assert (
+        converted.enchanter.query_lucky_ratio() == state.enchanter.query_lucky_ratio()
+    )
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_compact_game_is_identical(
+    seed: int, council_pool: ConcreteCouncilPool
+) -> None:
+    randomness = SeededRandomness(seed)
+    compact_randomness = SeededRandomness(seed)
+    policy = Random(seed)
+
+    state = state_initializer()
+    state.suggestions = council_pool.get_suggestions(state, randomness)
+    compact = CompactGameState.from_state(state_initializer())
+    compact.suggestions = council_pool.get_suggestions(
+        compact.to_state(), compact_randomness
+    )
+    _assert_same(state, compact)
+
+    while state.progress.turn_left > 0:
+        action = _choose_action(state, policy)
+        if action is None:
+            state = reroll(state, randomness, council_pool)
+            compact = reroll_compact(compact, compact_randomness, council_pool)
+        else:
+            try:
+                state = pick_council(action, state, randomness, council_pool)
+            except ForbiddenActionException:
+                with pytest.raises(ForbiddenActionException):
+                    pick_council_compact(
+                        action, compact, compact_randomness, council_pool
+                    )
+                return
+
+            compact = pick_council_compact(
+                action, compact, compact_randomness, council_pool
+            )
+
+        _assert_same(state, compact)
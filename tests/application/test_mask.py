@@ -0,0 +1,106 @@
+import numpy as np
+import pytest
+
+from pylixir.application.council import ForbiddenActionException
+from pylixir.application.mask import (
+    ACTION_SIZE,
+    REROLL_ACTION,
+    get_action,
+    get_action_mask,
+)
+from pylixir.application.reducer import RerollAction, pick_council
+from pylixir.core.randomness import SeededRandomness
+from pylixir.core.state import GameState
+from pylixir.data.council.target import OneThreeFiveSelector
+from pylixir.data.council_pool import ConcreteCouncilPool
+from pylixir.data.pool import get_ingame_council_pool
+from pylixir.interface.configuration import state_initializer
+
+
+@pytest.fixture(name="council_pool")
+def fixture_council_pool() -> ConcreteCouncilPool:
+    return get_ingame_council_pool(skip=True)
+
+
+def _find_council(council_pool: ConcreteCouncilPool, uses_effect_index: bool) -> int:
+    return next(
+        index
+        for index, council in enumerate(council_pool.get_councils())
+        if council.uses_effect_index() == uses_effect_index
+    )
+
+
+def test_action_indices() -> None:
+    assert isinstance(get_action(REROLL_ACTION), RerollAction)
+
+    action = get_action(7)
+    assert not isinstance(action, RerollAction)
+    assert (action.effect_index, action.sage_index) == (2, 1)
+
+
+def test_action_mask(step_state: GameState, council_pool: ConcreteCouncilPool) -> None:
+    selecting = _find_council(council_pool, True)
+    other = _find_council(council_pool, False)
+    step_state.suggestions = (selecting, other, selecting)
+    step_state.board.lock(1)
+    step_state.committee.set_exhaust(2)
+
+    mask = get_action_mask(step_state, council_pool)
+
+    assert mask.shape == (ACTION_SIZE,)
+    assert np.flatnonzero(mask).tolist() == [0, 1, 6, 9, 12, REROLL_ACTION]
+
+
+def test_action_mask_without_rerolls_or_turns(
+    step_state: GameState, council_pool: ConcreteCouncilPool
+) -> None:
+    step_state.progress.reroll_left = 0
+    assert not get_action_mask(step_state, council_pool)[REROLL_ACTION]
+
+    step_state.progress.turn_left = 0
+    assert not get_action_mask(step_state, council_pool).any()
+
+
+def test_action_mask_dry_runs_fixed_targets(
+    step_state: GameState, council_pool: ConcreteCouncilPool
+) -> None:
+    one_three_five = next(
+        index
+        for index, council in enumerate(council_pool.get_councils())
+        if any(
+            isinstance(logic.target_selector, OneThreeFiveSelector)
+            for logic in council.logics
+        )
+    )
+    step_state.suggestions = (one_three_five, one_three_five, one_three_five)
+    assert get_action_mask(step_state, council_pool)[:3].all()
+
+    step_state.board.lock(2)
+    assert not get_action_mask(step_state, council_pool)[:3].any()
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_legal_picks_are_accepted(council_pool: ConcreteCouncilPool, seed: int) -> None:
+    randomness = SeededRandomness(seed)
+    state = state_initializer()
+    state.suggestions = council_pool.get_suggestions(state, randomness)
+
+    while state.progress.turn_left > 0:
+        legal = np.flatnonzero(get_action_mask(state, council_pool)[:REROLL_ACTION])
+        for action_index in legal:
+            try:
+                pick_council(
+                    get_action(int(action_index)),  # type: ignore[arg-type]
+                    state.copy(deep=True),
+                    SeededRandomness(int(action_index)),
+                    council_pool,
+                )
+            except ForbiddenActionException:
+                pytest.fail(f"legal action {action_index} was forbidden")
+
+        state = pick_council(
+            get_action(int(legal[seed % len(legal)])),  # type: ignore[arg-type]
+            state,
+            randomness,
+            council_pool,
+        )
@@ -0,0 +1,86 @@
+import numpy as np
+
+from pylixir.application.mask import REROLL_ACTION
+from pylixir.application.recorder import (
+    TrajectoryRecorder,
+    encode_state,
+    get_shard_paths,
+    load_shards,
+)
+from pylixir.interface.cli import get_client
+
+
+def _play(recorder: TrajectoryRecorder, seed: int) -> None:
+    client = get_client(seed)
+    client.record_to(recorder, seed)
+    for _ in range(client.get_state().progress.reroll_left + 1):
+        client.reroll()  # the last one is rejected
+    while not client.is_done():
+        sage_index = client.get_state().committee.get_valid_slots()[0]
+        for effect_index in range(5):
+            if client.pick(sage_index, effect_index):
+                break
+
+
+def test_recorded_episodes(tmp_path: str) -> None:
+    with TrajectoryRecorder(str(tmp_path)) as recorder:
+        _play(recorder, 3)
+        _play(recorder, 5)
+
+    (shard,) = load_shards(str(tmp_path))
+    assert isinstance(shard["observation"], np.memmap)
+
+    episodes = shard["episode"]
+    assert set(episodes.tolist()) == {0, 1}
+    assert shard["seed"][episodes == 1].tolist() == [5] * int((episodes == 1).sum())
+    assert shard["done"].sum() == 2
+    assert (shard["observation"][1:] == shard["next_observation"][:-1])[
+        episodes[1:] == episodes[:-1]
+    ].all()
+
+    first = shard["action"][:3].tolist(), shard["accepted"][:3].tolist()
+    assert first == ([REROLL_ACTION] * 3, [True, True, False])
+    assert shard["reward"][2] == 0.0
+    assert len(shard.get_draws(0)) > 0 and len(shard.get_draws(2)) == 0
+    assert shard["draw_offsets"][-1] == len(shard["draws"])
+
+    turns = shard["turn"][shard["accepted"] & (episodes == 0)]
+    assert (np.diff(turns) >= 0).all()
+
+
+def test_recorded_observation_is_state_encoding(tmp_path: str) -> None:
+    client = get_client(0)
+    with TrajectoryRecorder(str(tmp_path)) as recorder:
+        client.record_to(recorder, 0)
+        client.pick(0, 0)
+
+    (shard,) = load_shards(str(tmp_path))
+    assert shard["next_observation"][0].tolist() == encode_state(client)
+
+
+def test_shards_are_split_and_appended(tmp_path: str) -> None:
+    with TrajectoryRecorder(str(tmp_path), shard_size=8) as recorder:
+        _play(recorder, 1)
+    count = sum(len(shard) for shard in load_shards(str(tmp_path)))
+    assert len(get_shard_paths(str(tmp_path))) == -(-count // 8)
+
+    with TrajectoryRecorder(str(tmp_path), shard_size=8) as recorder:
+        _play(recorder, 1)
+    shards = load_shards(str(tmp_path))
+    assert sum(len(shard) for shard in shards) == 2 * count
+    for shard in shards:
+        assert shard["draw_offsets"][-1] == len(shard["draws"])
+
+
+def test_recorders_share_directory(tmp_path: str) -> None:
+    with TrajectoryRecorder(str(tmp_path), shard_size=8) as first:
+        with TrajectoryRecorder(str(tmp_path), shard_size=8) as second:
+            assert first.recorder_id != second.recorder_id
+            _play(first, 1)
+            _play(second, 1)
+            _play(first, 2)
+
+    shards = load_shards(str(tmp_path))
+    episodes = np.concatenate([shard["episode"] for shard in shards])
+    assert len(set(episodes.tolist())) == 3
+    assert sum(shard["done"].sum() for shard in shards) == 3
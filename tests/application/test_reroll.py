@@ -15,12 +15,12 @@ def fixture_council_pool() -> ConcreteCouncilPool:
 def test_reroll(step_state: GameState, council_pool: ConcreteCouncilPool) -> None:
     updated_state = reroll(step_state, DeterministicRandomness(0.1), council_pool)
 
-    first_suggestion = [query.id for query in updated_state.suggestions]
+    first_suggestion = list(updated_state.suggestions)
 
     updated_state.progress.modify_reroll(1)
     updated_state = reroll(updated_state, DeterministicRandomness(0.1), council_pool)
 
-    second_suggestion = [query.id for query in updated_state.suggestions]
+    second_suggestion = list(updated_state.suggestions)
 
     for first, second in zip(first_suggestion, second_suggestion):
         assert first != second
@@ -38,7 +38,7 @@ def test_reroll_when_option_restricted(
         council_pool,
     )
 
-    prev_suggestion = [query.id for query in updated_state.suggestions]
+    prev_suggestion = list(updated_state.suggestions)
 
     for _ in range(10):
         updated_state.progress.modify_reroll(1)
@@ -46,7 +46,7 @@ def test_reroll_when_option_restricted(
             updated_state, DeterministicRandomness(0.1), council_pool
         )
 
-        current_suggestion = [query.id for query in updated_state.suggestions]
+        current_suggestion = list(updated_state.suggestions)
 
         for prev, curr in zip(prev_suggestion, current_suggestion):
             assert prev != curr
@@ -0,0 +1,43 @@
+from random import Random
+
+import pytest
+
+from pylixir.application.council import ForbiddenActionException
+from pylixir.application.reducer import (
+    PickCouncilAndEnchantAndRerollAction,
+    pick_council,
+)
+from pylixir.core.randomness import SeededRandomness
+from pylixir.core.state import GameState
+from pylixir.data.council_pool import ConcreteCouncilPool
+from pylixir.data.pool import get_ingame_council_pool
+from pylixir.interface.configuration import state_initializer
+
+
+@pytest.fixture(name="council_pool", scope="session")
+def fixture_council_pool() -> ConcreteCouncilPool:
+    return get_ingame_council_pool(skip=True)
+
+
+@pytest.fixture(name="played_states", scope="session")
+def fixture_played_states(council_pool: ConcreteCouncilPool) -> list[GameState]:
+    """Every intermediate state of a few randomly played scalar games."""
+    states = []
+    for seed in range(8):
+        randomness = SeededRandomness(seed)
+        policy = Random(seed)
+        state = state_initializer()
+        state.suggestions = council_pool.get_suggestions(state, randomness)
+
+        while state.progress.turn_left > 0:
+            states.append(state.copy(deep=True))
+            action = PickCouncilAndEnchantAndRerollAction(
+                sage_index=policy.choice(state.committee.get_valid_slots()),
+                effect_index=policy.choice(state.board.unlocked_indices()),
+            )
+            try:
+                state = pick_council(action, state, randomness, council_pool)
+            except ForbiddenActionException:
+                break
+
+    return states
@@ -0,0 +1,95 @@
+from typing import Any
+
+import numpy as np
+import pytest
+
+from pylixir.batch.council import COUNCIL_TYPE_CODES, BatchCouncilTable
+from pylixir.batch.state import BatchState
+from pylixir.core.state import GameState
+from pylixir.data.council_pool import ConcreteCouncilPool
+
+
+@pytest.fixture(name="table")
+def fixture_table(council_pool: ConcreteCouncilPool) -> BatchCouncilTable:
+    return BatchCouncilTable(council_pool)
+
+
+@pytest.fixture(name="batch")
+def fixture_batch(played_states: list[GameState]) -> BatchState:
+    return BatchState.from_game_states(played_states)
+
+
+def test_validity_matches_scalar(
+    played_states: list[GameState],
+    council_pool: ConcreteCouncilPool,
+    table: BatchCouncilTable,
+    batch: BatchState,
+) -> None:
+    validity = table.validity(batch, np.arange(len(played_states)))
+
+    for row, state in enumerate(played_states):
+        expected = [council.is_valid(state) for council in council_pool.get_councils()]
+        assert list(validity[row]) == expected
+
+
+def test_council_types_match_scalar(
+    played_states: list[GameState],
+    council_pool: ConcreteCouncilPool,
+    table: BatchCouncilTable,
+    batch: BatchState,
+) -> None:
+    council_types = table.council_types(batch, np.arange(len(played_states)))
+
+    for row, state in enumerate(played_states):
+        expected = [
+            COUNCIL_TYPE_CODES[
+                council_pool._get_council_type(state, sage)  # pylint:disable=W0212
+            ]
+            for sage in state.committee.sages
+        ]
+        assert list(council_types[row]) == expected
+
+
+def test_sample_respects_constraints(
+    played_states: list[GameState],
+    table: BatchCouncilTable,
+    batch: BatchState,
+) -> None:
+    rows = np.arange(len(played_states))
+    previous = batch.suggestions.copy()
+    table.sample(batch, rows, np.random.default_rng(0), is_reroll=True)
+
+    validity = table.validity(batch, rows)
+    council_types = table.council_types(batch, rows)
+    for row in rows:
+        suggestions = batch.suggestions[row]
+        assert len(set(suggestions)) == 3
+        for sage_index, council in enumerate(suggestions):
+            assert validity[row, council]
+            assert table.type_code[council] == council_types[row, sage_index]
+            assert table.slot_type[council] in (3, sage_index)
+            assert council != previous[row, sage_index]
+
+
+class _LastUniformGenerator(np.random.Generator):
+    """Draws uniforms of 1, so that every pivot reaches its total."""
+
+    def random(self, size: Any = None, *args: Any, **kwargs: Any) -> Any:
+        return np.ones(size)
+
+
+def test_sample_at_total_picks_last_weighted_council(
+    played_states: list[GameState],
+    table: BatchCouncilTable,
+    batch: BatchState,
+) -> None:
+    rows = np.arange(len(played_states))
+    table.sample(batch, rows, _LastUniformGenerator(np.random.PCG64(0)))
+
+    validity = table.validity(batch, rows)
+    council_types = table.council_types(batch, rows)
+    for row in rows:
+        for sage_index, council in enumerate(batch.suggestions[row]):
+            assert validity[row, council]
+            assert table.type_code[council] == council_types[row, sage_index]
+            assert table.pickup_ratio[council] > 0
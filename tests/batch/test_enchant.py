@@ -0,0 +1,54 @@
+from random import Random
+
+import numpy as np
+
+from pylixir.application.enchant import EnchantCommand
+from pylixir.batch.enchant import enchant_from_uniforms
+from pylixir.core.randomness import SeededRandomness
+
+
+def test_rows_match_scalar_enchant() -> None:
+    rng = np.random.default_rng(0)
+    size = 64
+    prob = rng.random((size, 5))
+    prob[rng.random((size, 5)) < 0.3] = 0
+    lucky_ratio = rng.choice([0.0, 0.1, 0.5, 1.0], size=(size, 5))
+    count = rng.integers(0, 4, size)
+    amount = rng.integers(1, 3, size)
+
+    # the scalar enchant draws the pick, then the lucky roll, of every step.
+    uniforms = np.zeros((int(count.max()), 2, size))
+    for row in range(size):
+        draws = Random(row)
+        for step in range(uniforms.shape[0]):
+            uniforms[step, :, row] = [draws.random(), draws.random()]
+
+    result = enchant_from_uniforms(prob, lucky_ratio, count, amount, uniforms)
+
+    for row in range(size):
+        assert result[row].tolist() == EnchantCommand().get_enchant_result(
+            prob[row].tolist(),
+            lucky_ratio[row].tolist(),
+            int(count[row]),
+            int(amount[row]),
+            SeededRandomness(row),
+        ), row
+
+
+def test_pivot_at_total_picks_last_weighted_effect() -> None:
+    prob = np.array(
+        [
+            [0.1, 0.2, 0.3, 0.4, 0.0],
+            [0.5, 0.5, 0.0, 0.0, 0.0],
+            [0.2, 0.2, 0.2, 0.2, 0.2],
+        ]
+    )
+    count = np.array([1, 1, 2])
+    uniforms = np.zeros((2, 2, 3))
+    uniforms[:, 0] = 1.0
+
+    result = enchant_from_uniforms(
+        prob, np.zeros_like(prob), count, np.ones(3, dtype=np.int64), uniforms
+    )
+
+    assert result.tolist() == [[0, 0, 0, 1, 0], [0, 1, 0, 0, 0], [0, 0, 0, 1, 1]]
@@ -0,0 +1,226 @@
+import math
+from collections import Counter
+from typing import Hashable
+
+import numpy as np
+import pytest
+
+from pylixir.application.council import ForbiddenActionException, Logic
+from pylixir.batch.council import BatchCouncilTable
+from pylixir.batch.operation import BatchFeatures
+from pylixir.batch.simulator import BatchSimulator
+from pylixir.batch.state import BatchState, BoolArray
+from pylixir.core.base import Randomness
+from pylixir.core.outcome import enumerate_outcomes, merge_outcomes
+from pylixir.core.randomness import SeededRandomness
+from pylixir.core.state import GameState
+from pylixir.data.council import operation as op
+from pylixir.data.council import target as selector
+from pylixir.data.council_pool import ConcreteCouncilPool
+
+DETERMINISTIC_OPERATIONS = (
+    op.MutateProb,
+    op.MutateLuckyRatio,
+    op.DecreaseTurnLeft,
+    op.SetEnchantTargetAndAmount,
+    op.ChangeEffect,
+    op.LockTarget,
+    op.IncreaseReroll,
+    op.DecreasePrice,
+    op.SetEnchantIncreaseAmount,
+    op.SetEnchantEffectCount,
+    op.ShiftAll,
+    op.SwapValues,
+    op.Exhaust,
+    op.DecreaseFirstTargetAndSwap,
+)
+DETERMINISTIC_SELECTORS = (
+    selector.NoneSelector,
+    selector.ProposedSelector,
+    selector.UserSelector,
+    selector.LteValueSelector,
+    selector.OneThreeFiveSelector,
+    selector.TwoFourSelector,
+)
+
+
+def _deterministic_logics(table: BatchCouncilTable) -> list[int]:
+    return [
+        logic_index
+        for logic_index, logic in enumerate(table.logics)
+        if isinstance(logic.operation, DETERMINISTIC_OPERATIONS)
+        and isinstance(logic.target_selector, DETERMINISTIC_SELECTORS)
+    ]
+
+
+def _summary(state: GameState) -> tuple[object, ...]:
+    return (
+        state.board,
+        state.progress,
+        state.committee,
+        list(state.enchanter.query_enchant_prob(state.board.locked_indices())),
+        list(state.enchanter.query_lucky_ratio()),
+        state.enchanter.get_enchant_amount(),
+        state.enchanter.get_enchant_effect_count(),
+    )
+
+
+def test_deterministic_logics_match_scalar(
+    played_states: list[GameState], council_pool: ConcreteCouncilPool
+) -> None:
+    played_states = played_states[::2]
+    simulator = BatchSimulator(council_pool, 1, seed=0)
+    simulator.state = BatchState.from_game_states(played_states)
+    table = simulator.table
+    rows = np.arange(len(played_states))
+    effect_index = rows % 5
+    saved = simulator.state.save(rows)
+
+    for logic_index in _deterministic_logics(table):
+        logic = table.logics[logic_index]
+        simulator.state.restore(rows, saved)
+        valid = table.logic_validity(BatchFeatures(simulator.state, rows))[
+            :, logic_index
+        ]
+        rejected = simulator._apply_logic(  # pylint:disable=W0212
+            logic_index, rows, effect_index
+        )
+
+        for row, state in enumerate(played_states):
+            if not valid[row]:
+                continue
+
+            try:
+                expected = logic.apply(
+                    state.copy(deep=True),
+                    int(effect_index[row]),
+                    SeededRandomness(0),
+                )
+            except (ForbiddenActionException, op.TargetSizeMismatchException):
+                assert rejected[row]
+                continue
+
+            assert not rejected[row]
+            assert _summary(simulator.state.to_game_state(row)) == pytest.approx(
+                _summary(expected)
+            )
+
+
+def _outcome_key(state: GameState) -> Hashable:
+    return (
+        state.board.snapshot(),
+        state.progress.snapshot(),
+        state.committee.snapshot(),
+        tuple(
+            round(prob, 6)
+            for prob in state.enchanter.query_enchant_prob(state.board.locked_indices())
+        ),
+        tuple(round(ratio, 6) for ratio in state.enchanter.query_lucky_ratio()),
+        state.enchanter.get_enchant_amount(),
+        state.enchanter.get_enchant_effect_count(),
+    )
+
+
+def _random_kinds(table: BatchCouncilTable) -> dict[tuple[str, str], int]:
+    """First logic of every pair of operation and selector drawing randomness."""
+    kinds: dict[tuple[str, str], int] = {}
+    for logic_index, logic in enumerate(table.logics):
+        if isinstance(logic.operation, DETERMINISTIC_OPERATIONS) and isinstance(
+            logic.target_selector, DETERMINISTIC_SELECTORS
+        ):
+            continue
+        kind = (type(logic.operation).__name__, type(logic.target_selector).__name__)
+        kinds.setdefault(kind, logic_index)
+
+    return kinds
+
+
+def _scalar_distribution(
+    logic: Logic, state: GameState, effect_index: int
+) -> dict[Hashable, float]:
+    def _apply(randomness: Randomness) -> Hashable:
+        try:
+            return _outcome_key(
+                logic.apply(state.copy(deep=True), effect_index, randomness)
+            )
+        except (ForbiddenActionException, op.TargetSizeMismatchException):
+            return "rejected"
+
+    outcomes = enumerate_outcomes(_apply)
+    return {key: prob for prob, key in merge_outcomes(outcomes, lambda key: key)}
+
+
+def _ties(state: GameState) -> tuple[int, int]:
+    values = state.board.get_effect_values()
+    return (len(values) - len(set(values)), sum(values))
+
+
+def _replicate(state: GameState, size: int) -> BatchState:
+    batch = BatchState(
+        size,
+        max_value=state.board.get_max_value(),
+        total_turn=state.progress.total_turn,
+    )
+    batch.restore(
+        np.arange(size),
+        BatchState.from_game_states([state]).save(np.zeros(1, dtype=np.int64)),
+    )
+    return batch
+
+
+def _batch_distribution(state: BatchState, rejected: BoolArray) -> Counter[Hashable]:
+    # rows are grouped by their arrays first; few of them differ.
+    size = len(rejected)
+    columns = [
+        array.reshape(size, -1).astype(np.float64)
+        for array in state.save(np.arange(size)).values()
+    ]
+    _, first_rows, counts = np.unique(
+        np.hstack(columns + [rejected[:, None]]),
+        axis=0,
+        return_index=True,
+        return_counts=True,
+    )
+
+    observed: Counter[Hashable] = Counter()
+    for row, count in zip(first_rows, counts):
+        key = "rejected" if rejected[row] else _outcome_key(state.to_game_state(row))
+        observed[key] += int(count)
+
+    return observed
+
+
+def test_random_logics_match_scalar_distribution(
+    played_states: list[GameState], council_pool: ConcreteCouncilPool
+) -> None:
+    size = 4000
+    simulator = BatchSimulator(council_pool, 1, seed=0)
+    table = simulator.table
+    rows = np.arange(size)
+
+    for kind, logic_index in _random_kinds(table).items():
+        logic = table.logics[logic_index]
+        features = BatchFeatures(
+            BatchState.from_game_states(played_states), np.arange(len(played_states))
+        )
+        valid = np.flatnonzero(table.logic_validity(features)[:, logic_index])
+        assert len(valid) > 0, kind
+
+        # boards with the fewest ties and lowest values enumerate quickly.
+        for state_index in sorted(valid, key=lambda index: _ties(played_states[index]))[
+            :2
+        ]:
+            state = played_states[state_index]
+            effect_index = state.board.unlocked_indices()[0]
+            expected = _scalar_distribution(logic, state, effect_index)
+
+            simulator.state = _replicate(state, size)
+            rejected = simulator._apply_logic(  # pylint:disable=W0212
+                logic_index, rows, np.full(size, effect_index)
+            )
+            observed = _batch_distribution(simulator.state, rejected)
+
+            assert set(observed) <= set(expected), kind
+            for key, prob in expected.items():
+                margin = 5 * math.sqrt(prob * (1 - prob) / size) + 1e-3
+                assert observed[key] / size == pytest.approx(prob, abs=margin), kind
@@ -0,0 +1,129 @@
+import numpy as np
+import pytest
+
+from pylixir.application.mask import REROLL_ACTION, get_action_mask
+from pylixir.batch.simulator import BatchSimulator
+from pylixir.batch.state import IntArray
+from pylixir.core.base import MAX_EFFECT_COUNT
+from pylixir.data.council_pool import ConcreteCouncilPool
+
+
+@pytest.fixture(name="simulator")
+def fixture_simulator(council_pool: ConcreteCouncilPool) -> BatchSimulator:
+    return BatchSimulator(council_pool, 256, seed=0)
+
+
+def _play_randomly(simulator: BatchSimulator, seed: int) -> None:
+    policy = np.random.default_rng(seed)
+    for _ in range(100):
+        if simulator.is_done().all():
+            return
+
+        rows = np.flatnonzero(~simulator.is_done())
+        before = simulator.state.save(rows)
+        rejected = simulator.step(
+            policy.integers(0, REROLL_ACTION + 1, size=simulator.size)
+        )[rows]
+
+        assert (
+            simulator.state.values[rows[rejected]] == before["values"][rejected]
+        ).all()
+        _assert_invariants(simulator, rows)
+
+    raise AssertionError("games did not finish")
+
+
+def _assert_invariants(simulator: BatchSimulator, rows: IntArray) -> None:
+    state = simulator.state
+    assert (state.values[rows] <= MAX_EFFECT_COUNT).all()
+    assert (state.reroll_left[rows] >= 0).all()
+    assert (np.abs(state.sage_power[rows]) <= 6).all()
+
+    alive = rows[~state.is_done()[rows]]
+    validity = simulator.table.validity(state, alive)
+    suggestions = state.suggestions[alive]
+    assert validity[np.arange(len(alive))[:, None], suggestions].all()
+    assert (suggestions[:, 0] != suggestions[:, 1]).all()
+    assert (suggestions[:, 1] != suggestions[:, 2]).all()
+    assert (suggestions[:, 0] != suggestions[:, 2]).all()
+
+
+def test_random_games_finish_with_locks(simulator: BatchSimulator) -> None:
+    _play_randomly(simulator, seed=0)
+
+    assert (simulator.state.turn_left == 0).all()
+    assert (simulator.state.locked.sum(axis=1) == 3).all()
+    assert simulator.valuation().max() <= 2 * MAX_EFFECT_COUNT
+
+
+def test_same_seed_is_reproducible(council_pool: ConcreteCouncilPool) -> None:
+    simulators = [BatchSimulator(council_pool, 32, seed=7) for _ in range(2)]
+    for simulator in simulators:
+        _play_randomly(simulator, seed=3)
+
+    assert (simulators[0].state.values == simulators[1].state.values).all()
+    assert (simulators[0].state.locked == simulators[1].state.locked).all()
+
+
+def test_reroll(simulator: BatchSimulator) -> None:
+    rows = np.arange(simulator.size)
+    previous = simulator.state.suggestions.copy()
+
+    assert not simulator.reroll(rows).any()
+    assert (simulator.state.reroll_left == 1).all()
+    assert (simulator.state.suggestions != previous).all()
+
+    simulator.reroll(rows)
+    assert simulator.reroll(rows).all()
+    assert (simulator.state.reroll_left == 0).all()
+
+
+def test_pick_exhausted_sage_is_rejected(simulator: BatchSimulator) -> None:
+    simulator.state.sage_removed[:, 0] = True
+    rows = np.arange(simulator.size)
+    before = simulator.state.save(rows)
+
+    rejected = simulator.pick(np.zeros(simulator.size, dtype=np.int64), rows % 5)
+
+    assert rejected.all()
+    assert (simulator.state.turn_left == before["turn_left"]).all()
+    assert (simulator.state.suggestions == before["suggestions"]).all()
+
+
+def test_reset(simulator: BatchSimulator) -> None:
+    _play_randomly(simulator, seed=1)
+    simulator.reset(np.arange(10))
+
+    assert (simulator.state.turn_left[:10] == simulator.state.total_turn).all()
+    assert (simulator.state.values[:10] == 0).all()
+    assert (simulator.state.turn_left[10:] == 0).all()
+
+
+def test_action_masks_match_scalar(
+    simulator: BatchSimulator, council_pool: ConcreteCouncilPool
+) -> None:
+    policy = np.random.default_rng(0)
+    for _ in range(6):
+        simulator.step(policy.integers(0, REROLL_ACTION + 1, size=simulator.size))
+
+    masks = simulator.action_masks()
+    assert not masks.flags.writeable
+    for row in range(simulator.size):
+        expected = get_action_mask(simulator.state.to_game_state(row), council_pool)
+        assert (masks[row] == expected).all()
+
+    simulator.reroll()
+    assert simulator.action_masks() is not masks
+
+
+def test_masked_actions_are_never_rejected(simulator: BatchSimulator) -> None:
+    policy = np.random.default_rng(0)
+    while not simulator.is_done().all():
+        masks = simulator.action_masks()
+        alive = ~simulator.is_done()
+        # a random legal action per row; finished rows are ignored by `step`.
+        keys = np.where(masks, policy.random(masks.shape), -1.0)
+        actions = np.argmax(keys, axis=1)
+
+        assert masks[alive].any(axis=1).all()
+        assert not simulator.step(actions)[alive].any()
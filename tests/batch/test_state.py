@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+
+from pylixir.batch.state import BatchState
+from pylixir.core.base import Enchanter, MutationTarget
+from pylixir.core.state import GameState
+
+
+@pytest.fixture(name="batch")
+def fixture_batch(played_states: list[GameState]) -> BatchState:
+    return BatchState.from_game_states(played_states)
+
+
+def _mutations(enchanter: Enchanter) -> list[tuple[MutationTarget, int, float, int]]:
+    return [
+        (mutation.target, mutation.index, mutation.value, mutation.remain_turn)
+        for mutation in enchanter._mutations  # pylint:disable=W0212
+    ]
+
+
+def test_round_trip(played_states: list[GameState], batch: BatchState) -> None:
+    for row, state in enumerate(played_states):
+        converted = batch.to_game_state(row)
+        assert converted == state
+        assert _mutations(converted.enchanter) == _mutations(state.enchanter)
+
+
+def test_enchant_prob_and_lucky_ratio(
+    played_states: list[GameState], batch: BatchState
+) -> None:
+    rows = np.arange(len(played_states))
+    probs = batch.query_enchant_prob(rows)
+    lucky_ratios = batch.query_lucky_ratio(rows)
+    amounts = batch.get_enchant_amount(rows)
+    counts = batch.get_enchant_effect_count(rows)
+
+    for row, state in enumerate(played_states):
+        enchanter = state.enchanter
+        assert list(probs[row]) == pytest.approx(
+            enchanter.query_enchant_prob(state.board.locked_indices())
+        )
+        assert list(lucky_ratios[row]) == pytest.approx(enchanter.query_lucky_ratio())
+        assert amounts[row] == enchanter.get_enchant_amount()
+        assert counts[row] == enchanter.get_enchant_effect_count()
+
+
+def test_elapse_turn(played_states: list[GameState], batch: BatchState) -> None:
+    batch.elapse_turn(np.arange(len(played_states)))
+
+    for row, state in enumerate(played_states):
+        enchanter = state.enchanter.copy(deep=True)
+        enchanter.elapse_turn()
+        assert _mutations(batch.to_game_state(row).enchanter) == _mutations(enchanter)
+
+
+def test_pick_sage(played_states: list[GameState], batch: BatchState) -> None:
+    rows = np.arange(len(played_states))
+    sage_index = rows % 3
+    batch.pick_sage(rows, sage_index)
+
+    for row, state in enumerate(played_states):
+        committee = state.committee.copy(deep=True)
+        committee.pick(int(sage_index[row]))
+        assert list(batch.sage_power[row]) == [sage.power for sage in committee.sages]
+
+
+def test_save_and_restore(played_states: list[GameState], batch: BatchState) -> None:
+    rows = np.arange(len(played_states))
+    saved = batch.save(rows)
+
+    batch.values[rows] = 0
+    for _ in range(batch.mutation_target.shape[1] + 1):  # forces capacity growth
+        batch.add_mutation(rows, MutationTarget.prob, 0, 1.0, 1)
+    batch.restore(rows, saved)
+
+    for row, state in enumerate(played_states):
+        converted = batch.to_game_state(row)
+        assert converted.board == state.board
+        assert _mutations(converted.enchanter) == _mutations(state.enchanter)
@@ -3,7 +3,7 @@ import pytest
 from pylixir.core.base import Board, Effect
 from pylixir.core.committee import Sage, SageCommittee
 from pylixir.core.progress import GamePhase, Progress
-from pylixir.core.state import CouncilQuery, GameState
+from pylixir.core.state import GameState
 
 
 @pytest.fixture
@@ -29,7 +29,7 @@ def clean_state() -> GameState:
                 Sage(power=0, is_removed=False, slot=2),
             )
         ),
-        suggestions=(CouncilQuery(id=""), CouncilQuery(id=""), CouncilQuery(id="")),
+        suggestions=(0, 0, 0),
     )
 
 
@@ -56,7 +56,7 @@ def abundant_state() -> GameState:
                 Sage(power=0, is_removed=False, slot=2),
             )
         ),
-        suggestions=(CouncilQuery(id=""), CouncilQuery(id=""), CouncilQuery(id="")),
+        suggestions=(0, 0, 0),
     )
 
 
@@ -83,5 +83,5 @@ def step_state() -> GameState:
                 Sage(power=0, is_removed=False, slot=2),
             ),
         ),
-        suggestions=(CouncilQuery(id=""), CouncilQuery(id=""), CouncilQuery(id="")),
+        suggestions=(0, 0, 0),
     )
@@ -0,0 +1,60 @@
+from pylixir.core.compact import CompactGameState
+from pylixir.core.state import GameState
+
+
+def test_round_trip(abundant_state: GameState) -> None:
+    abundant_state.board.lock(2)
+    abundant_state.committee.set_exhaust(1)
+    abundant_state.enchanter.mutate_prob(3, 0.35, 2)
+    abundant_state.enchanter.increase_enchant_amount(2)
+
+    compact = CompactGameState.from_state(abundant_state)
+    restored = compact.to_state()
+
+    assert restored == abundant_state
+    assert restored.enchanter.query_enchant_prob(
+        restored.board.locked_indices()
+    ) == abundant_state.enchanter.query_enchant_prob(
+        abundant_state.board.locked_indices()
+    )
+    assert restored.enchanter.get_enchant_amount() == 2
+
+
+def test_conversion_does_not_share(abundant_state: GameState) -> None:
+    compact = CompactGameState.from_state(abundant_state)
+    compact.board.modify_effect_count(0, 2)
+    compact.committee.pick(0)
+    compact.enchanter.mutate_lucky_ratio(1, 0.2, 1)
+
+    assert abundant_state.board.get(0).value == 7
+    assert abundant_state.committee.sages[0].power == 0
+    assert abundant_state.enchanter.query_lucky_ratio()[1] == 0.1
+
+
+def test_copy_aliasing_mirrors_pydantic(abundant_state: GameState) -> None:
+    compact = CompactGameState.from_state(abundant_state)
+
+    shallow = compact.board.copy()
+    shallow.modify_effect_count(0, 1)
+    abundant_state.board.copy().modify_effect_count(0, 1)
+    assert compact.board.get_effect_values() == abundant_state.board.get_effect_values()
+
+    deep = compact.deepcopy(board=True)
+    deep.board.modify_effect_count(0, 1)
+    assert compact.board.get(0).value == 8
+
+
+def test_snapshot_matches_state(abundant_state: GameState) -> None:
+    abundant_state.board.lock(2)
+    abundant_state.enchanter.mutate_lucky_ratio(3, 0.2, 2)
+    compact = CompactGameState.from_state(abundant_state)
+    snapshot = compact.snapshot()
+    assert snapshot == abundant_state.snapshot()
+
+    compact.board.unlock(2)
+    compact.enchanter.mutate_prob(0, 0.5, 1)
+    compact.committee.pick(0)
+    compact.progress.spent_reroll()
+
+    compact.restore(snapshot)
+    assert compact.to_state() == abundant_state
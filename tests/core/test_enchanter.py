@@ -1,4 +1,10 @@
-from pylixir.core.base import Enchanter
+import random
+from typing import Type, Union
+
+import pytest
+
+from pylixir.core.base import Enchanter, query_enchant_prob, query_lucky_ratio
+from pylixir.core.compact import CompactEnchanter
 
 
 def test_enchant_amount(clean_enchanter: Enchanter) -> None:
@@ -39,3 +45,49 @@ def test_enchant_effect_count_with_relevant_mutation(
     clean_enchanter.increase_enchant_amount(2)
 
     assert clean_enchanter.get_enchant_effect_count() == 2
+
+
+@pytest.mark.parametrize("enchanter_type", [Enchanter, CompactEnchanter])
+def test_cached_queries_match_replayed_mutations(
+    enchanter_type: Union[Type[Enchanter], Type[CompactEnchanter]]
+) -> None:
+    rng = random.Random(0)
+    enchanter = enchanter_type()
+    lockings: list[list[int]] = [[], [2], [0, 3], [1, 2, 4]]
+
+    for _ in range(200):
+        for locked in lockings:  # fill the cache before mutating.
+            enchanter.query_enchant_prob(locked)
+        enchanter.query_lucky_ratio()
+
+        if rng.random() < 0.3:
+            enchanter.elapse_turn()
+        elif rng.random() < 0.5:
+            enchanter.mutate_prob(
+                rng.randrange(5), rng.uniform(-1, 1), rng.randint(1, 3)
+            )
+        else:
+            enchanter.mutate_lucky_ratio(
+                rng.randrange(5), rng.uniform(-0.3, 0.3), rng.randint(1, 3)
+            )
+
+        mutations = enchanter.get_mutations()
+        for locked in lockings:
+            assert enchanter.query_enchant_prob(locked) == tuple(
+                query_enchant_prob(mutations, locked)
+            )
+        assert enchanter.query_lucky_ratio() == tuple(query_lucky_ratio(mutations))
+
+
+def test_shallow_copies_share_cached_mutations(clean_enchanter: Enchanter) -> None:
+    assert clean_enchanter.query_enchant_prob([]) == (0.2, 0.2, 0.2, 0.2, 0.2)
+    copied = clean_enchanter.copy()
+    copied.mutate_prob(0, 0.8, 2)
+
+    assert clean_enchanter.query_enchant_prob([]) == copied.query_enchant_prob([])
+
+    copied.elapse_turn()
+    copied.mutate_prob(1, 0.1, 2)
+
+    assert clean_enchanter.query_enchant_prob([]) == (1.0, 0, 0, 0, 0)
+    assert copied.query_enchant_prob([]) == pytest.approx((0.9, 0.1, 0, 0, 0))
@@ -1,6 +1,7 @@
 import pytest
 
 from pylixir.application.enchant import EnchantCommand
+from pylixir.core.outcome import enumerate_outcomes, merge_outcomes
 from tests.randomness import DeterministicRandomness
 
 
@@ -156,3 +157,66 @@ def test_zero(
         DeterministicRandomness(enchant_random_numbers),
     )
     assert result == expected
+
+
+@pytest.mark.parametrize(
+    "prob, lucky_ratio, count, amount",
+    [
+        ([0.2, 0.2, 0.2, 0.2, 0.2], [0.1, 0.1, 0.1, 0.1, 0.1], 1, 1),
+        ([0.4, 0.3, 0.3, 0.0, 0.0], [0.1, 0.5, 0.0, 0.1, 0.1], 2, 1),
+        ([0.0, 0.0, 1.0, 0.0, 0.0], [0.1, 0.1, 0.2, 0.1, 0.1], 2, 2),
+    ],
+)
+def test_enchant_result_outcomes(
+    enchant_command: EnchantCommand,
+    prob: list[float],
+    lucky_ratio: list[float],
+    count: int,
+    amount: int,
+) -> None:
+    closed_form = {
+        tuple(result): result_prob
+        for result_prob, result in enchant_command.get_enchant_result_outcomes(
+            prob, lucky_ratio, count, amount
+        )
+    }
+    enumerated = {
+        tuple(result): result_prob
+        for result_prob, result in merge_outcomes(
+            enumerate_outcomes(
+                lambda randomness: enchant_command.get_enchant_result(
+                    prob, lucky_ratio, count, amount, randomness
+                )
+            ),
+            key=tuple,
+        )
+    }
+
+    assert closed_form.keys() == enumerated.keys()
+    for result, result_prob in closed_form.items():
+        assert result_prob == pytest.approx(enumerated[result])
+
+
+def test_enchant_distribution_is_cached(enchant_command: EnchantCommand) -> None:
+    distribution = enchant_command.get_enchant_distribution(
+        [0.4, 0.3, 0.3, 0.0, 0.0], [0.1, 0.5, 0.0, 0.1, 0.1], 2, 1
+    )
+
+    assert (
+        enchant_command.get_enchant_distribution(
+            (0.4, 0.3, 0.3, 0.0, 0.0), (0.1, 0.5, 0.0, 0.1, 0.1), 2, 1
+        )
+        is distribution
+    )
+    assert sum(result_prob for result_prob, _ in distribution) == pytest.approx(1)
+
+
+def test_enchant_odds(enchant_command: EnchantCommand) -> None:
+    odds = enchant_command.get_enchant_odds(
+        [0.4, 0.3, 0.3, 0.0, 0.0], [0.1, 0.5, 0.0, 0.1, 0.1], 2, 2
+    )
+
+    assert sum(odd.hit for odd in odds) == pytest.approx(2)
+    assert odds[3].hit == odds[4].hit == 0
+    assert odds[1].gain == pytest.approx(odds[1].hit * 2.5)
+    assert odds[2].gain == pytest.approx(odds[2].hit * 2)
@@ -0,0 +1,99 @@
+import pytest
+
+from pylixir.application.enchant import EnchantCommand
+from pylixir.core.base import Randomness
+from pylixir.core.outcome import enumerate_outcomes, merge_outcomes
+
+
+def _as_dict(outcomes: list[tuple[float, list[int]]]) -> dict[tuple[int, ...], float]:
+    return {
+        tuple(result): prob
+        for prob, result in merge_outcomes(outcomes, key=lambda result: tuple(result))
+    }
+
+
+def test_binomial_and_uniform_int() -> None:
+    def _computation(randomness: Randomness) -> list[int]:
+        return [int(randomness.binomial(0.25)), randomness.uniform_int(1, 2)]
+
+    assert _as_dict(enumerate_outcomes(_computation)) == pytest.approx(
+        {(1, 1): 0.125, (1, 2): 0.125, (0, 1): 0.375, (0, 2): 0.375}
+    )
+
+
+def test_shuffle_is_uniform() -> None:
+    outcomes = enumerate_outcomes(lambda randomness: randomness.shuffle([0, 1, 2]))
+
+    assert len(outcomes) == 6
+    assert all(prob == pytest.approx(1 / 6) for prob, _ in outcomes)
+
+
+def test_generator_state_replays_branch() -> None:
+    def computation(randomness: Randomness) -> tuple[int, int]:
+        randomness.uniform_int(0, 1)
+        state = randomness.get_generator_state()
+        first = randomness.pick([2, 3])
+        randomness.set_generator_state(state)
+        return first, randomness.pick([2, 3])
+
+    outcomes = enumerate_outcomes(computation)
+
+    assert len(outcomes) == 4
+    assert all(first == second for _, (first, second) in outcomes)
+    assert sum(prob for prob, _ in outcomes) == pytest.approx(1)
+
+
+def test_redistribute() -> None:
+    outcomes = enumerate_outcomes(
+        lambda randomness: randomness.redistribute([0, 1, 0], 2, 1)
+    )
+
+    assert _as_dict(outcomes) == pytest.approx({(1, 1, 1): 1.0})
+
+    outcomes = enumerate_outcomes(
+        lambda randomness: randomness.redistribute([0, 0], 2, 10)
+    )
+
+    assert _as_dict(outcomes) == pytest.approx(
+        {(2, 0): 0.25, (1, 1): 0.5, (0, 2): 0.25}
+    )
+
+
+def test_zero_probability_branches_are_skipped() -> None:
+    outcomes = enumerate_outcomes(
+        lambda randomness: [randomness.weighted_sampling([0.0, 1.0, 0.0])]
+    )
+
+    assert outcomes == [(1.0, [1])]
+
+
+@pytest.mark.parametrize(
+    "prob, count, expected",
+    [
+        (
+            [1.0, 0, 0, 0, 0],
+            1,
+            {(1, 0, 0, 0, 0): 0.9, (2, 0, 0, 0, 0): 0.1},
+        ),
+        (
+            [0.5, 0.5, 0, 0, 0],
+            2,
+            {
+                (1, 1, 0, 0, 0): 0.81,
+                (2, 1, 0, 0, 0): 0.09,
+                (1, 2, 0, 0, 0): 0.09,
+                (2, 2, 0, 0, 0): 0.01,
+            },
+        ),
+    ],
+)
+def test_enchant_result(
+    prob: list[float], count: int, expected: dict[tuple[int, ...], float]
+) -> None:
+    outcomes = enumerate_outcomes(
+        lambda randomness: EnchantCommand().get_enchant_result(
+            prob, [0.1] * 5, count, 1, randomness
+        )
+    )
+
+    assert _as_dict(outcomes) == pytest.approx(expected)
@@ -0,0 +1,125 @@
+from collections import Counter
+from typing import Callable
+
+import pytest
+
+from pylixir.application.game import Client
+from pylixir.core.base import SLOT_COUNT, DrawSlot, Randomness
+from pylixir.core.randomness import (
+    CounterRandomness,
+    RecordingRandomness,
+    SeededRandomness,
+)
+from pylixir.data.pool import get_ingame_council_pool
+from pylixir.interface.configuration import state_initializer
+
+
+def _draws(randomness: Randomness, count: int = 40) -> list[int]:
+    return [randomness.uniform_int(0, 1 << 20) for _ in range(count)]
+
+
+def test_draws_are_keyed() -> None:
+    randomness = CounterRandomness(3, episode=1)
+    randomness.seek(5, 2)
+    draws = _draws(randomness)
+
+    other = CounterRandomness(3, episode=1)
+    _draws(other, 7)
+    other.seek(5, 2)
+    assert _draws(other) == draws
+
+    for seed, episode, turn, stream in [(4, 1, 5, 2), (3, 2, 5, 2), (3, 1, 6, 2)]:
+        other = CounterRandomness(seed, episode=episode)
+        other.seek(turn, stream)
+        assert _draws(other) != draws
+
+
+def test_slots_are_separate_streams() -> None:
+    randomness = [CounterRandomness(5), CounterRandomness(5)]
+    for turn in range(3):
+        for other in randomness:
+            other.seek(turn)
+
+        randomness[1].use_slot(DrawSlot.council)
+        _draws(randomness[1], 30)  # longer than a row of pre-drawn uniforms
+
+        enchants = []
+        for other in randomness:
+            other.use_slot(DrawSlot.enchant)
+            enchants.append(_draws(other, 20))
+        assert enchants[0] == enchants[1]
+
+    with pytest.raises(ValueError):
+        randomness[0].use_slot(SLOT_COUNT)
+
+
+def test_sampling_is_allocation_free_and_fair() -> None:
+    randomness = CounterRandomness(0)
+    values = [3, 5, 7]
+
+    picks = Counter(randomness.pick(values) for _ in range(3000))
+    assert set(picks) == set(values)
+    assert all(count == pytest.approx(1000, rel=0.15) for count in picks.values())
+
+    samples = Counter(
+        randomness.weighted_sampling([0.2, 0.0, 0.8]) for _ in range(3000)
+    )
+    assert samples[1] == 0
+    assert samples[2] / 3000 == pytest.approx(0.8, abs=0.05)
+
+    targets = Counter(
+        randomness.cumulative_weighted_sampling_target([0.5, 0.5, 1.0], ["a", "b", "c"])
+        for _ in range(3000)
+    )
+    assert targets["b"] == 0
+    assert targets["a"] / 3000 == pytest.approx(0.5, abs=0.05)
+
+    assert sorted(randomness.shuffle(list(range(10)))) == list(range(10))
+    with pytest.raises(ValueError):
+        randomness.weighted_sampling([0.0, 0.0])
+
+
+def test_turn_does_not_depend_on_earlier_draws() -> None:
+    council_pool = get_ingame_council_pool(skip=True)
+    randomness = [CounterRandomness(11), CounterRandomness(11)]
+    clients = [
+        Client(state_initializer, state_initializer(), council_pool, randomness[idx])
+        for idx in range(2)
+    ]
+
+    for _ in range(3):
+        _draws(randomness[1], 5)  # e.g. a policy sharing the randomness
+        for client in clients:
+            client.pick(0, 0)
+
+    assert clients[0].get_state() == clients[1].get_state()
+
+
+def test_recording_draws_what_it_wraps() -> None:
+    council_pool = get_ingame_council_pool(skip=True)
+    recording = RecordingRandomness(SeededRandomness(7))
+    clients = [
+        Client(state_initializer, state_initializer(), council_pool, randomness)
+        for randomness in [SeededRandomness(7), recording]
+    ]
+
+    for sage_index, effect_index in [(0, 0), (1, 2), (2, 4)]:
+        for client in clients:
+            client.pick(sage_index, effect_index)
+        assert len(recording.take_draws()) > 0
+
+    assert clients[0].get_state() == clients[1].get_state()
+    assert recording.take_draws() == []
+
+
+@pytest.mark.parametrize("factory", [SeededRandomness, CounterRandomness])
+def test_generator_state_resumes_draws(factory: Callable[[int], Randomness]) -> None:
+    randomness = RecordingRandomness(factory(9))
+    randomness.seek(2)
+    _draws(randomness, 3)
+    state = randomness.get_generator_state()
+    draws = _draws(randomness)
+
+    _draws(randomness, 50)
+    randomness.set_generator_state(state)
+    assert _draws(randomness) == draws
@@ -0,0 +1,41 @@
+from pylixir.core.state import GameState, get_state_key
+
+
+def test_state_key_ignores_suggestions(abundant_state: GameState) -> None:
+    other = abundant_state.copy(deep=True)
+    other.suggestions = (1, 2, 3)
+
+    assert get_state_key(other) == get_state_key(abundant_state)
+
+
+def test_state_key_tracks_mutations(abundant_state: GameState) -> None:
+    other = abundant_state.copy(deep=True)
+    other.enchanter.mutate_prob(0, 0.1, 1)
+
+    assert get_state_key(other) != get_state_key(abundant_state)
+
+
+def test_snapshot_round_trip(abundant_state: GameState) -> None:
+    snapshot = abundant_state.snapshot()
+    original = abundant_state.copy(deep=True)
+
+    abundant_state.board.modify_effect_count(0, 2)
+    abundant_state.board.lock(3)
+    abundant_state.enchanter.mutate_prob(1, 0.3, 2)
+    abundant_state.progress.spent_turn(1)
+    abundant_state.committee.pick(2)
+    abundant_state.suggestions = (1, 2, 3)
+    assert abundant_state.snapshot() != snapshot
+
+    abundant_state.restore(snapshot)
+    assert abundant_state == original
+    assert abundant_state.snapshot() == snapshot
+    assert abundant_state.enchanter.query_enchant_prob(
+        []
+    ) == original.enchanter.query_enchant_prob([])
+
+
+def test_snapshot_is_hashable(abundant_state: GameState) -> None:
+    assert hash(abundant_state.snapshot()) == hash(
+        abundant_state.copy(deep=True).snapshot()
+    )
@@ -24,11 +24,11 @@ def test_turn_in_range(
 ) -> None:
     council = Council(
         id="any",
-        logics=[],
+        logics=(),
         pickup_ratio=10,
         turn_range=turn_range,
         slot_type=0,
-        descriptions=[],
+        descriptions=(),
         type=CouncilType.common,
     )
 
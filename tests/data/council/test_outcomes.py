@@ -0,0 +1,68 @@
+import pytest
+
+from pylixir.application.council import Logic, TargetSelector
+from pylixir.core.state import GameState, get_state_key
+from pylixir.data.council.operation import IncreaseTargetRanged, IncreaseTargetWithRatio
+from pylixir.data.council.target import (
+    MaxValueSelector,
+    MinValueSelector,
+    RandomSelector,
+)
+
+
+def _as_dict(outcomes: list[tuple[float, list[int]]]) -> dict[tuple[int, ...], float]:
+    return {tuple(targets): prob for prob, targets in outcomes}
+
+
+@pytest.mark.parametrize(
+    "selector",
+    [
+        RandomSelector(target_condition=0, count=1),
+        RandomSelector(target_condition=0, count=2),
+        MinValueSelector(target_condition=0, count=1),
+        MinValueSelector(target_condition=0, count=2),
+        MaxValueSelector(target_condition=0, count=2),
+    ],
+)
+def test_selector_outcomes_match_enumeration(
+    selector: TargetSelector, abundant_state: GameState
+) -> None:
+    closed_form = _as_dict(selector.outcomes(abundant_state, None))
+    enumerated = _as_dict(TargetSelector.outcomes(selector, abundant_state, None))
+
+    assert closed_form.keys() == enumerated.keys()
+    for targets, prob in closed_form.items():
+        assert prob == pytest.approx(enumerated[targets])
+
+
+def test_min_value_selector_outcomes(abundant_state: GameState) -> None:
+    selector = MinValueSelector(target_condition=0, count=1)
+
+    assert _as_dict(selector.outcomes(abundant_state, None)) == {
+        (3,): 0.5,
+        (4,): 0.5,
+    }
+
+
+def test_operation_outcomes(abundant_state: GameState) -> None:
+    operation = IncreaseTargetWithRatio(ratio=2500, value=(1, 0), remain_turn=1)
+
+    outcomes = operation.outcomes(abundant_state, [2])
+
+    assert sorted(
+        (state.board.get(2).value, prob) for prob, state in outcomes
+    ) == pytest.approx([(5, 0.75), (6, 0.25)])
+    assert abundant_state.board.get(2).value == 5
+
+
+def test_logic_outcomes(abundant_state: GameState) -> None:
+    logic = Logic(
+        operation=IncreaseTargetRanged(ratio=0, value=(1, 2), remain_turn=1),
+        target_selector=RandomSelector(target_condition=0, count=1),
+    )
+
+    outcomes = logic.outcomes(abundant_state, 0)
+
+    assert len(outcomes) == 10
+    assert sum(prob for prob, _ in outcomes) == pytest.approx(1)
+    assert len({get_state_key(state) for _, state in outcomes}) == 10
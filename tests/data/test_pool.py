@@ -1,11 +1,18 @@
+from random import Random
+
 import pytest
 
-from pylixir.application.council import CouncilType
+from pylixir.application.council import CouncilType, ForbiddenActionException
+from pylixir.application.reducer import (
+    PickCouncilAndEnchantAndRerollAction,
+    pick_council,
+)
 from pylixir.core.committee import Sage
 from pylixir.core.randomness import SeededRandomness
 from pylixir.core.state import GameState
 from pylixir.data.council_pool import ConcreteCouncilPool
 from pylixir.data.pool import get_ingame_council_pool
+from pylixir.interface.configuration import state_initializer
 
 
 @pytest.fixture(name="council_pool")
@@ -17,6 +24,16 @@ def test_pool_size_exact(council_pool: ConcreteCouncilPool) -> None:
     assert len(council_pool) == 294
 
 
+def test_councils_are_shared_and_frozen(council_pool: ConcreteCouncilPool) -> None:
+    council = council_pool.get_councils()[0]
+
+    assert council_pool.get_council(0) is council
+    with pytest.raises(TypeError):
+        council.pickup_ratio = 0
+    with pytest.raises(TypeError):
+        council.logics[0].operation.ratio = 0
+
+
 @pytest.mark.parametrize(
     "council_type, count",
     [
@@ -45,3 +62,82 @@ def test_sample_council(
         council_pool.sample_council(
             abundant_state, Sage(power=2, is_removed=False, slot=1), randomness, []
         )
+
+
+def test_council_distribution(
+    council_pool: ConcreteCouncilPool, abundant_state: GameState
+) -> None:
+    sage = Sage(power=2, is_removed=False, slot=1)
+    forbidden = [council_pool.get_councils()[0].id]
+    distribution = council_pool.get_council_distribution(
+        abundant_state, sage, forbidden
+    )
+
+    assert sum(prob for prob, _ in distribution) == pytest.approx(1)
+    for _, council in distribution:
+        assert council.is_valid(abundant_state)
+        assert council.id not in forbidden
+
+    candidates = {council.id for _, council in distribution}
+    for seed in range(50):
+        sampled = council_pool.sample_council(
+            abundant_state, sage, SeededRandomness(seed), forbidden
+        )
+        assert sampled.id in candidates
+
+
+def _play_randomly(council_pool: ConcreteCouncilPool, seed: int) -> list[GameState]:
+    randomness = SeededRandomness(seed)
+    policy = Random(seed)
+    state = state_initializer()
+    state.suggestions = council_pool.get_suggestions(state, randomness)
+
+    states = []
+    while state.progress.turn_left > 0:
+        states.append(state.copy(deep=True))
+        action = PickCouncilAndEnchantAndRerollAction(
+            sage_index=policy.choice(state.committee.get_valid_slots()),
+            effect_index=policy.choice(state.board.unlocked_indices()),
+        )
+        try:
+            state = pick_council(action, state, randomness, council_pool)
+        except ForbiddenActionException:
+            break
+
+    return states
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_indexed_distribution_matches_exhaustive_filter(
+    council_pool: ConcreteCouncilPool, seed: int
+) -> None:
+    for state in _play_randomly(council_pool, seed):
+        for sage in state.committee.sages:
+            forbidden = list(council_pool.get_suggestion_ids(state.suggestions)[:2])
+            candidates, _ = council_pool.get_available_councils(
+                sage.slot, council_pool._get_council_type(state, sage)
+            )
+            expected = {
+                council.id: council.pickup_ratio
+                for council in candidates
+                if council.is_valid(state) and council.id not in forbidden
+            }
+            total = sum(expected.values())
+
+            distribution = council_pool.get_council_distribution(state, sage, forbidden)
+
+            probs = {council.id: prob for prob, council in distribution}
+            assert probs.keys() == expected.keys()
+            for council_id, weight in expected.items():
+                assert probs[council_id] == pytest.approx(weight / total)
+
+
+def test_cumulative_weighted_sampling_keeps_stream() -> None:
+    weights = [3.0, 1.0, 4.0, 1.0, 5.0]
+    cum_weights = [3.0, 4.0, 8.0, 9.0, 14.0]
+    target = list(range(5))
+
+    for seed in range(20):
+        assert SeededRandomness(seed).cumulative_weighted_sampling_target(
+            cum_weights, target
+        ) == SeededRandomness(seed).weighted_sampling_target(weights, target)
@@ -0,0 +1,110 @@
+import pickle
+import shutil
+from pathlib import Path
+from typing import Any
+
+from pylixir.data.pool import get_ingame_council_loader, get_ingame_resource_path
+from pylixir.data.snapshot import (
+    compile_snapshot,
+    get_ingame_snapshot,
+    load_snapshot,
+    write_snapshot,
+)
+from pylixir.envs.feature import (
+    CouncilFeatureBuilder,
+    build_feature_index_maps,
+    get_feature_builder,
+)
+
+
+def _copy_resource(tmp_path: Path) -> str:
+    resource_path = str(tmp_path / "council.json")
+    shutil.copy(get_ingame_resource_path(), resource_path)
+    return resource_path
+
+
+def test_snapshot_round_trip(tmp_path: Path) -> None:
+    resource_path = _copy_resource(tmp_path)
+    snapshot_path = str(tmp_path / "council.snapshot.pkl")
+    snapshot = compile_snapshot(resource_path, get_ingame_council_loader())
+
+    write_snapshot(snapshot, snapshot_path)
+    loaded = load_snapshot(snapshot_path, resource_path)
+
+    assert loaded is not None
+    assert loaded.header == snapshot.header
+    assert loaded.councils == snapshot.councils
+    assert loaded.metadatas == snapshot.metadatas
+    assert loaded.feature_index_maps == snapshot.feature_index_maps
+
+
+def test_stale_snapshot_is_ignored(tmp_path: Path) -> None:
+    resource_path = _copy_resource(tmp_path)
+    snapshot_path = str(tmp_path / "council.snapshot.pkl")
+    write_snapshot(
+        compile_snapshot(resource_path, get_ingame_council_loader()), snapshot_path
+    )
+
+    with open(resource_path, "a", encoding="utf-8") as f:
+        f.write("\n")
+
+    assert load_snapshot(snapshot_path, resource_path) is None
+
+
+def _rewrite(snapshot_path: str, header: dict[str, Any], body: bytes) -> None:
+    with open(snapshot_path, "wb") as f:
+        pickle.dump(header, f)
+        f.write(body)
+
+
+def _read(snapshot_path: str) -> tuple[dict[str, Any], bytes]:
+    with open(snapshot_path, "rb") as f:
+        header = pickle.load(f)
+        return header, f.read()
+
+
+def test_snapshot_of_changed_source_is_ignored(tmp_path: Path) -> None:
+    resource_path = _copy_resource(tmp_path)
+    snapshot_path = str(tmp_path / "council.snapshot.pkl")
+    write_snapshot(
+        compile_snapshot(resource_path, get_ingame_council_loader()), snapshot_path
+    )
+    header, body = _read(snapshot_path)
+    assert "pylixir.application.council" in header["source_hashes"]
+
+    header["source_hashes"]["pylixir.application.council"] = "changed"
+    _rewrite(snapshot_path, header, body)
+
+    assert load_snapshot(snapshot_path, resource_path) is None
+
+
+def test_broken_snapshot_is_ignored(tmp_path: Path) -> None:
+    resource_path = _copy_resource(tmp_path)
+    snapshot_path = str(tmp_path / "council.snapshot.pkl")
+    write_snapshot(
+        compile_snapshot(resource_path, get_ingame_council_loader()), snapshot_path
+    )
+    header, body = _read(snapshot_path)
+
+    _rewrite(snapshot_path, header, body[: len(body) // 2])
+
+    assert load_snapshot(snapshot_path, resource_path) is None
+
+
+def test_missing_snapshot_is_ignored(tmp_path: Path) -> None:
+    assert (
+        load_snapshot(str(tmp_path / "missing.pkl"), get_ingame_resource_path()) is None
+    )
+
+
+def test_ingame_snapshot_is_loaded_once() -> None:
+    assert get_ingame_snapshot() is get_ingame_snapshot()
+
+
+def test_feature_builder_from_snapshot() -> None:
+    metadatas = get_ingame_snapshot().metadatas
+    expected = CouncilFeatureBuilder(
+        metadata_map=metadatas, **build_feature_index_maps(metadatas)
+    )
+
+    assert get_feature_builder() == expected
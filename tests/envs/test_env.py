@@ -1,6 +1,15 @@
 import gymnasium as gym
+import numpy as np
+import pytest
+from gymnasium import spaces
 
+from pylixir.application.recorder import load_shards
 from pylixir.envs import register_env
+from pylixir.envs.PylixirEnv import (
+    ObsOutofBoundsException,
+    PylixirEnv,
+    get_observation_schema,
+)
 
 
 def test_pylixir_env() -> None:
@@ -10,3 +19,86 @@ def test_pylixir_env() -> None:
     observation, reward, terminated, truncated, info = env.step(4)
     assert observation.shape == (80,)
     # env.close()
+
+
+def test_observation_buffer_matches_observation_list() -> None:
+    env = PylixirEnv(debug=True)
+    observation, _ = env.reset(seed=3)
+
+    for action in [4, 15, 0, 1, 2, 9, 15, 5]:
+        assert observation.tolist() == env._embedding_provider.create_observation(
+            env._client
+        )
+        observation, *_ = env.step(action)
+
+
+def test_observation_buffer_is_reused() -> None:
+    env = PylixirEnv()
+    first, _ = env.reset(seed=0)
+    second, *_ = env.step(4)
+
+    assert first is second
+
+
+def test_terminal_observation_survives_reset() -> None:
+    env = PylixirEnv()
+    env.reset(seed=0)
+    terminated = False
+    while not terminated:
+        observation, _, terminated, _, _ = env.step(int(env.legal_actions()[0]))
+    terminal = observation.copy()
+
+    first, _ = env.reset(seed=1)
+    assert first is not observation
+    assert (observation == terminal).all()
+    assert not (first == terminal).all()
+
+
+def test_debug_observation_out_of_bounds() -> None:
+    env = PylixirEnv(debug=True)
+    env.observation_space = spaces.MultiDiscrete([1] * 80)
+
+    with pytest.raises(ObsOutofBoundsException):
+        env.reset(seed=0)
+
+    env.observation_space = get_observation_schema().get_space()
+    env.reset(seed=0)
+    env.step(4)
+    env.observation_space = spaces.MultiDiscrete([1] * 80)
+    with pytest.raises(ObsOutofBoundsException, match=r"replay: .*\[4, 15\]"):
+        env.step(15)
+
+
+def test_action_mask_info_finishes_episode_with_picks() -> None:
+    env = PylixirEnv()
+    _, info = env.reset(seed=0)
+    assert info["action_mask"] is env.action_masks()
+
+    terminated, steps = False, 0
+    while not terminated:
+        legal = np.flatnonzero(info["action_mask"][:15])
+        turn_left = env._client.get_state().progress.turn_left
+        _, _, terminated, _, info = env.step(int(legal[steps % len(legal)]))
+        steps += 1
+
+        # legal picks are accepted, so each of them spends a turn.
+        assert env._client.get_state().progress.turn_left < turn_left
+
+    assert not info["action_mask"].any()
+
+
+def test_env_records_steps(tmp_path: str) -> None:
+    env = PylixirEnv(record_to=str(tmp_path))
+    observation, _ = env.reset(seed=2)
+    observations, rewards = [observation.copy()], []
+    for action in [15, 15, 4, 0, 9]:
+        observation, reward, *_ = env.step(action)
+        observations.append(observation.copy())
+        rewards.append(reward)
+    env.close()
+
+    (shard,) = load_shards(str(tmp_path))
+    assert shard["action"].tolist() == [15, 15, 4, 0, 9]
+    assert (shard["observation"] == observations[:-1]).all()
+    assert (shard["next_observation"] == observations[1:]).all()
+    assert shard["reward"].tolist() == rewards
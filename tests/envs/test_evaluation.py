@@ -0,0 +1,105 @@
+from typing import Any
+
+import pytest
+
+from pylixir.envs.DictPylixirEnv import DictPylixirEnv
+from pylixir.envs.evaluation import (
+    EnvFactory,
+    EvaluationReport,
+    PairedComparison,
+    Policy,
+    compare_seeds,
+    evaluate_seeds,
+    shard_seeds,
+)
+
+
+def _first_sage_policy() -> Policy:
+    def _policy(observation: Any) -> int:
+        return 0
+
+    return _policy
+
+
+def test_shard_seeds_covers_every_seed_in_order() -> None:
+    seeds = list(range(10))
+    shards = shard_seeds(seeds, 4)
+
+    assert [len(shard) for shard in shards] == [3, 3, 2, 2]
+    assert sum(shards, []) == seeds
+    assert shard_seeds(seeds[:2], 4) == [[0], [1]]
+
+
+def test_report_does_not_depend_on_worker_count() -> None:
+    seeds = list(range(12))
+
+    serial = evaluate_seeds(_first_sage_policy, DictPylixirEnv, seeds)
+    parallel = evaluate_seeds(_first_sage_policy, DictPylixirEnv, seeds, workers=2)
+
+    assert parallel == serial
+    assert EvaluationReport.from_results(parallel) == EvaluationReport.from_results(
+        list(reversed(serial))
+    )
+
+
+def test_report_counts_only_finished_episodes() -> None:
+    results = evaluate_seeds(_first_sage_policy, DictPylixirEnv, range(4), max_ticks=5)
+    report = EvaluationReport.from_results(results)
+
+    assert report.unfinished == 4
+    assert report.success_rate_14 == 0
+    assert report.mean_length == pytest.approx(6)
+
+
+class _CyclePolicy:
+    """Tries every action in turn, `stride` apart."""
+
+    def __init__(self, stride: int) -> None:
+        self._stride = stride
+        self._count = 0
+
+    def __call__(self, observation: Any) -> int:
+        self._count += 1
+        return (self._count * self._stride) % 15
+
+
+def _crn_env() -> DictPylixirEnv:
+    return DictPylixirEnv(common_random_numbers=True)
+
+
+def test_policy_compared_to_itself_has_no_difference() -> None:
+    comparisons = compare_seeds(
+        _first_sage_policy, _first_sage_policy, _crn_env, range(8), thresholds=[0]
+    )
+
+    assert [comparison.threshold for comparison in comparisons] == [0]
+    assert comparisons[0].difference == 0
+    assert comparisons[0].standard_error == 0
+    assert comparisons[0].only_a == comparisons[0].only_b == 0
+
+
+def test_common_random_numbers_reduce_standard_error() -> None:
+    def _compare(env_factory: EnvFactory) -> PairedComparison:
+        (comparison,) = compare_seeds(
+            lambda: _CyclePolicy(1),
+            lambda: _CyclePolicy(7),
+            env_factory,
+            range(100),
+            max_ticks=200,
+            thresholds=[6],
+        )
+        return comparison
+
+    crn = _compare(_crn_env)
+    sequential = _compare(DictPylixirEnv)
+
+    assert crn.success_rate_a > 0
+    assert crn.standard_error < sequential.standard_error
+    assert crn.standard_error < crn.independent_standard_error / 2
+
+
+def test_paired_results_must_share_seeds() -> None:
+    results = evaluate_seeds(_first_sage_policy, _crn_env, range(2))
+
+    with pytest.raises(ValueError):
+        PairedComparison.from_results(results, results[:1])
@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+
+from pylixir.envs.feature import get_feature_builder, get_feature_matrix
+
+
+def test_feature_matrix_rows_match_features() -> None:
+    feature_builder = get_feature_builder()
+    feature_matrix = get_feature_matrix()
+
+    assert feature_matrix.keys == sorted(
+        feature_builder.get_feature_by_id("31000").keys()
+    )
+    for council_id in feature_builder.metadata_map:
+        feature = feature_builder.get_feature_by_id(council_id)
+        assert feature_matrix.gather([council_id])[0].tolist() == [
+            feature[k] for k in feature_matrix.keys
+        ]
+
+
+def test_feature_matrix_writes_into_buffer_view() -> None:
+    feature_matrix = get_feature_matrix()
+    council_ids = list(get_feature_builder().metadata_map.keys())[:3]
+    feature_size = len(feature_matrix.keys)
+
+    buffer = np.zeros(5 + 3 * feature_size, dtype=np.int64)
+    feature_matrix.write(council_ids, buffer[5:].reshape(3, feature_size))
+
+    assert (buffer[:5] == 0).all()
+    assert (buffer[5:] == feature_matrix.gather(council_ids).ravel()).all()
+
+
+def test_feature_matrix_is_read_only() -> None:
+    with pytest.raises(ValueError):
+        get_feature_matrix().matrix[0, 0] = 1
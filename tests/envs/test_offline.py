@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+
+from pylixir.application.recorder import TrajectoryRecorder, load_shards
+from pylixir.envs.DictPylixirEnv import DictPylixirEnv
+from pylixir.envs.offline import OfflineDataset
+from pylixir.interface.cli import get_client
+
+
+def _record(directory: str, seeds: list[int], shard_size: int = 8) -> None:
+    with TrajectoryRecorder(directory, shard_size=shard_size) as recorder:
+        for seed in seeds:
+            client = get_client(seed)
+            client.record_to(recorder, seed)
+            for _ in range(client.get_state().progress.reroll_left + 1):
+                client.reroll()  # the last one is rejected
+            for action in range(16):
+                if client.is_done():
+                    break
+                if action == 15:
+                    client.reroll()
+                else:
+                    client.pick(action % 3, action // 3)
+
+
+def test_dataset_gathers_across_shards(tmp_path: str) -> None:
+    _record(str(tmp_path), [0, 1])
+    shards = load_shards(str(tmp_path))
+    assert len(shards) > 2
+
+    dataset = OfflineDataset(str(tmp_path))
+    assert len(dataset) == sum(len(shard) for shard in shards)
+
+    indices = np.array([len(dataset) - 1, 0, 9, 3, 9])
+    batch = dataset.get(indices)
+    observations = np.concatenate([shard["observation"] for shard in shards])
+    rewards = np.concatenate([shard["reward"] for shard in shards])
+    assert (batch.observations == observations[indices]).all()
+    assert (batch.rewards == rewards[indices]).all()
+
+    sampled = [dataset.sample(6, np.random.default_rng(3)) for _ in range(2)]
+    assert (sampled[0].actions == sampled[1].actions).all()
+    assert sum(len(batch.actions) for batch in dataset.iterate(7)) == len(dataset)
+
+    with pytest.raises(IndexError):
+        dataset.get([len(dataset)])
+
+
+def test_dataset_skips_rejected_steps(tmp_path: str) -> None:
+    _record(str(tmp_path), [2])
+    accepted = OfflineDataset(str(tmp_path), include_rejected=False)
+    every = OfflineDataset(str(tmp_path))
+
+    assert 0 < len(accepted) < len(every)
+    batch = accepted.get(np.arange(len(accepted)))
+    accepted_rows = np.concatenate(
+        [shard["action"][shard["accepted"]] for shard in load_shards(str(tmp_path))]
+    )
+    assert (batch.actions == accepted_rows).all()
+
+
+def test_empty_dataset(tmp_path: str) -> None:
+    with pytest.raises(ValueError):
+        OfflineDataset(str(tmp_path))
+
+
+def test_dict_env_records_its_observations(tmp_path: str) -> None:
+    env = DictPylixirEnv(record_to=str(tmp_path))
+    observation, _ = env.reset(seed=4)
+    observations, rewards = [observation], []
+    for action in [15, 4, 4, 0, 9, 15, 15, 15]:
+        observation, reward, *_ = env.step(action)
+        observations.append(observation)
+        rewards.append(reward)
+    env.close()
+
+    dataset = OfflineDataset(
+        str(tmp_path),
+        transform=env._embedding_provider.observations_from_encodings,
+    )
+    batch = dataset.get(np.arange(len(dataset)))
+    assert batch.rewards.tolist() == rewards
+
+    for row, expected in enumerate(observations[1:]):
+        for key, value in expected.items():
+            assert batch.next_observations[key][row] == pytest.approx(
+                value, abs=1e-3
+            ), key
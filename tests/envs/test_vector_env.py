@@ -0,0 +1,159 @@
+from typing import Any, Callable
+
+import numpy as np
+import numpy.typing as npt
+import pytest
+
+from pylixir.application.game import Client
+from pylixir.core.randomness import SeededRandomness
+from pylixir.data.pool import get_ingame_council_pool
+from pylixir.envs.observation import DictObservation, EmbeddingProvider
+from pylixir.envs.VectorPylixirEnv import (
+    BaseVectorPylixirEnv,
+    DictVectorPylixirEnv,
+    VectorPylixirEnv,
+)
+from pylixir.interface.configuration import state_initializer
+
+NUM_ENVS = 16
+
+
+def _step_randomly(env: BaseVectorPylixirEnv, steps: int) -> None:
+    policy = np.random.default_rng(0)
+    for _ in range(steps):
+        env.step(policy.integers(0, 16, size=NUM_ENVS))
+
+
+def _get_client(env: BaseVectorPylixirEnv, row: int) -> Client:
+    state = env._simulator.state.to_game_state(row)
+    suggestions = state.suggestions
+
+    client = Client(
+        state_initializer,
+        state,
+        council_pool=get_ingame_council_pool(),
+        randomness=SeededRandomness(0),
+    )
+    client.get_state().suggestions = suggestions
+    return client
+
+
+def test_vector_env_observation_matches_scalar_encoding() -> None:
+    env = VectorPylixirEnv(NUM_ENVS, seed=0)
+    env.reset(seed=0)
+    _step_randomly(env, 5)
+    observation = env._get_obs(np.arange(NUM_ENVS))
+
+    assert observation.shape == (NUM_ENVS, 80)
+    assert env.observation_space.contains(observation)
+    for row in range(NUM_ENVS):
+        client = _get_client(env, row)
+        provider = EmbeddingProvider(client.get_council_pool_index_map())
+        assert observation[row].tolist() == provider.create_observation(client)
+
+
+def test_dict_vector_env_observation_matches_scalar_encoding() -> None:
+    env = DictVectorPylixirEnv(NUM_ENVS, seed=0)
+    env.reset(seed=0)
+    _step_randomly(env, 5)
+    observation = env._get_obs(np.arange(NUM_ENVS))
+
+    assert env.observation_space.contains(observation)
+    for row in range(NUM_ENVS):
+        client = _get_client(env, row)
+        expected = DictObservation(
+            client.get_council_pool_index_map()
+        ).create_observation(client)
+
+        assert observation.keys() == expected.keys()
+        for key, value in expected.items():
+            assert observation[key][row] == pytest.approx(value, abs=1e-6)
+
+
+@pytest.mark.parametrize("env_class", [VectorPylixirEnv, DictVectorPylixirEnv])
+def test_vector_env_autoresets_finished_games(
+    env_class: Callable[..., BaseVectorPylixirEnv], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    env = env_class(NUM_ENVS, seed=0)
+    env.reset(seed=0)
+    policy = np.random.default_rng(0)
+
+    # observations of finished games, taken right before they are reset.
+    terminal: dict[int, Any] = {}
+    reset = env._simulator.reset
+
+    def recording_reset(rows: npt.NDArray[np.int64]) -> None:
+        observation = env._get_obs(rows)
+        for index, row in enumerate(rows):
+            terminal[int(row)] = _copy_row(observation, index)
+        reset(rows)
+
+    monkeypatch.setattr(env._simulator, "reset", recording_reset)
+
+    finished = 0
+    for _ in range(40):
+        observation, _, terminated, truncated, info = env.step(
+            policy.integers(0, 15, size=NUM_ENVS)
+        )
+        if not terminated.any():
+            continue
+
+        finished += terminated.sum()
+        assert (info["_final_observation"] == terminated | truncated).all()
+        for row in np.flatnonzero(terminated):
+            final = info["final_observation"][row]
+            _assert_rows_equal(final, terminal[row])
+            assert env._simulator.state.turn_left[row] == 13
+            assert info["final_info"][row]["current_valuation"] >= 0
+            assert not info["final_info"][row]["action_mask"].any()
+            assert info["action_mask"][row].any()
+
+            if isinstance(final, dict):
+                assert final["turn_left"] == 0
+                for key in ["enchant_prob", "enchant_lucky"]:
+                    assert final[key].shape == (5,)
+                    assert not np.shares_memory(final[key], observation[key])
+            else:
+                assert not np.shares_memory(final, observation)
+
+    assert finished > 0
+
+
+def _copy_row(observation: Any, row: int) -> Any:
+    if isinstance(observation, dict):
+        return {key: np.array(value[row]) for key, value in observation.items()}
+    return np.array(observation[row])
+
+
+def _assert_rows_equal(actual: Any, expected: Any) -> None:
+    if isinstance(expected, dict):
+        assert actual.keys() == expected.keys()
+        for key, value in expected.items():
+            np.testing.assert_array_equal(actual[key], value)
+    else:
+        np.testing.assert_array_equal(actual, expected)
+
+
+def test_vector_env_rejects_exhausted_sage() -> None:
+    env = VectorPylixirEnv(NUM_ENVS, seed=0)
+    env.reset(seed=0)
+    env._simulator.state.sage_removed[:, 0] = True
+
+    _, reward, terminated, truncated, _ = env.step(np.zeros(NUM_ENVS, dtype=np.int64))
+
+    assert (reward == -1).all()
+    assert not terminated.any() and not truncated.any()
+
+
+def test_vector_env_truncates_long_episodes() -> None:
+    env = VectorPylixirEnv(NUM_ENVS, max_episode_steps=2, seed=0)
+    env.reset(seed=0)
+    env._simulator.state.sage_removed[:, 0] = True
+
+    actions = np.zeros(NUM_ENVS, dtype=np.int64)
+    _, _, _, truncated, _ = env.step(actions)
+    assert not truncated.any()
+
+    _, _, _, truncated, info = env.step(actions)
+    assert truncated.all()
+    assert info["_final_info"].all()
@@ -1,5 +1,5 @@
 from random import Random
-from typing import TypeVar, Union
+from typing import Any, TypeVar, Union
 
 from pylixir.core.base import Randomness
 
@@ -53,6 +53,13 @@ class DeterministicRandomness(Randomness):
     def weighted_sampling_target(self, probs: list[float], target: list[T]) -> T:
         return target[self.weighted_sampling(probs)]
 
+    def get_generator_state(self) -> Any:
+        return (list(self._random_number_set), self._idx)
+
+    def set_generator_state(self, state: Any) -> None:
+        numbers, self._idx = state
+        self._random_number_set = list(numbers)
+
     @property
     def _random_number(self) -> float:
         value = self._random_number_set[self._idx]
@@ -0,0 +1,76 @@
+import pytest
+
+from pylixir.application.reducer import (
+    PickCouncilAndEnchantAndRerollAction,
+    RerollAction,
+    pick_council,
+)
+from pylixir.core.randomness import SeededRandomness
+from pylixir.data.council_pool import ConcreteCouncilPool
+from pylixir.data.pool import get_ingame_council_pool
+from pylixir.search.expectimax import ExpectimaxSolver, get_valuation, success_objective
+from tests.search.util import play_until
+
+
+@pytest.fixture(name="council_pool", scope="module")
+def fixture_council_pool() -> ConcreteCouncilPool:
+    return get_ingame_council_pool(skip=True)
+
+
+def test_terminal_value(council_pool: ConcreteCouncilPool) -> None:
+    state = play_until(council_pool, 0, 0)
+    objective = success_objective(get_valuation(state))
+    solver = ExpectimaxSolver(council_pool, objective)
+
+    assert solver.value(state) == 1.0
+
+
+@pytest.mark.parametrize("seed", [1, 2])
+def test_pick_value_matches_sampling(
+    council_pool: ConcreteCouncilPool, seed: int
+) -> None:
+    state = play_until(council_pool, seed, 1)
+    solver = ExpectimaxSolver(council_pool, success_objective(get_valuation(state) + 1))
+    solution = solver.solve(state)
+
+    for action, value in solution.action_values:
+        if not isinstance(action, PickCouncilAndEnchantAndRerollAction):
+            continue
+
+        trials = 400
+        successes = sum(
+            get_valuation(
+                pick_council(
+                    action,
+                    state.copy(deep=True),
+                    SeededRandomness(trial),
+                    council_pool,
+                )
+            )
+            > get_valuation(state)
+            for trial in range(trials)
+        )
+        tolerance = 4 * (max(value * (1 - value), 0.0) / trials) ** 0.5 + 1e-9
+        assert successes / trials == pytest.approx(value, abs=tolerance)
+
+
+def test_solution_is_best_action(council_pool: ConcreteCouncilPool) -> None:
+    state = play_until(council_pool, 3, 1)
+    solver = ExpectimaxSolver(council_pool, success_objective(get_valuation(state) + 1))
+    solution = solver.solve(state)
+
+    assert solution.value == max(value for _, value in solution.action_values)
+    assert any(isinstance(action, RerollAction) for action, _ in solution.action_values)
+    assert all(0 <= value <= 1 for _, value in solution.action_values)
+
+
+def test_bounded_table_gives_same_value(council_pool: ConcreteCouncilPool) -> None:
+    state = play_until(council_pool, 4, 1)
+    objective = success_objective(get_valuation(state) + 1)
+
+    unbounded = ExpectimaxSolver(council_pool, objective)
+    bounded = ExpectimaxSolver(council_pool, objective, table_capacity=4)
+
+    assert bounded.solve(state).value == pytest.approx(unbounded.solve(state).value)
+    assert len(bounded.table) <= 4
+    assert bounded.table.evictions > 0
@@ -0,0 +1,84 @@
+import pytest
+
+from pylixir.application.reducer import RerollAction
+from pylixir.core.compact import CompactGameState
+from pylixir.core.state import GameState
+from pylixir.data.council_pool import ConcreteCouncilPool
+from pylixir.data.pool import get_ingame_council_pool
+from pylixir.search.expectimax import ExpectimaxSolver, get_valuation, success_objective
+from pylixir.search.mcts import MCTSAgent, MCTSConfig
+from pylixir.search.rollout import AdvisedAction
+from tests.search.util import play_until
+
+
+@pytest.fixture(name="council_pool", scope="module")
+def fixture_council_pool() -> ConcreteCouncilPool:
+    return get_ingame_council_pool(skip=True)
+
+
+def test_search_spends_simulations(council_pool: ConcreteCouncilPool) -> None:
+    state = play_until(council_pool, 0, 10)
+    agent = MCTSAgent(
+        council_pool, success_objective(10), MCTSConfig(simulations=60), seed=0
+    )
+
+    action = agent.search(state)
+    statistics = agent.get_statistics()
+
+    assert sum(statistic.visits for statistic in statistics) == 59
+    assert action == max(statistics, key=lambda statistic: statistic.visits).action
+
+
+@pytest.mark.parametrize("seed", [1, 2])
+def test_search_near_end_is_nearly_optimal(
+    council_pool: ConcreteCouncilPool, seed: int
+) -> None:
+    state = play_until(council_pool, seed, 1)
+    objective = success_objective(get_valuation(state) + 1)
+    solution = ExpectimaxSolver(council_pool, objective).solve(state)
+
+    agent = MCTSAgent(council_pool, objective, MCTSConfig(simulations=400), seed=0)
+    action = agent.search(state)
+
+    assert dict(
+        (repr(action_value[0]), action_value[1])
+        for action_value in solution.action_values
+    )[repr(action)] == pytest.approx(solution.value, abs=0.1)
+
+
+def test_prior_guides_search(council_pool: ConcreteCouncilPool) -> None:
+    state = play_until(council_pool, 0, 10)
+
+    def _prior(_: GameState, actions: list[AdvisedAction]) -> list[float]:
+        return [float(isinstance(action, RerollAction)) for action in actions]
+
+    agent = MCTSAgent(
+        council_pool,
+        success_objective(10),
+        MCTSConfig(simulations=30),
+        prior=_prior,
+        value=lambda _: 0.5,
+    )
+
+    assert agent.search(state) == RerollAction()
+
+
+def test_tree_is_reused(council_pool: ConcreteCouncilPool) -> None:
+    state = play_until(council_pool, 0, 10)
+    agent = MCTSAgent(
+        council_pool, success_objective(10), MCTSConfig(simulations=100), seed=0
+    )
+    action = agent.search(state)
+
+    root = agent._root  # pylint:disable=protected-access
+    assert root is not None and root.edges is not None
+    edge = next(edge for edge in root.edges if edge.action == action)
+    child = max(edge.outcomes.values(), key=lambda node: node.visits)
+
+    child_state = state.copy(deep=True)
+    child_state.restore(child.snapshot)
+    agent.advance(action, child_state)
+    assert agent._root is child  # pylint:disable=protected-access
+
+    agent.advance(action, CompactGameState.from_state(state).to_state())
+    assert agent._root is None  # pylint:disable=protected-access
@@ -0,0 +1,89 @@
+from typing import cast
+
+import pytest
+
+from pylixir.application.reducer import (
+    PickCouncilAndEnchantAndRerollAction,
+    RerollAction,
+)
+from pylixir.core.compact import CompactGameState
+from pylixir.core.randomness import SeededRandomness
+from pylixir.core.state import GameState
+from pylixir.data.council_pool import ConcreteCouncilPool
+from pylixir.data.pool import get_ingame_council_pool
+from pylixir.interface.configuration import state_initializer
+from pylixir.search.rollout import (
+    RolloutAdvisor,
+    get_candidate_actions,
+    run_rollouts,
+    wilson_interval,
+)
+
+
+@pytest.fixture(name="council_pool", scope="module")
+def fixture_council_pool() -> ConcreteCouncilPool:
+    return get_ingame_council_pool(skip=True)
+
+
+def test_wilson_interval() -> None:
+    assert wilson_interval(0, 0).dict() == {"lower": 0.0, "upper": 1.0}
+
+    interval = wilson_interval(50, 100)
+    assert interval.lower == pytest.approx(0.4038, abs=1e-4)
+    assert interval.upper == pytest.approx(0.5962, abs=1e-4)
+    assert wilson_interval(100, 100).upper == pytest.approx(1.0)
+
+
+def test_candidate_actions(council_pool: ConcreteCouncilPool) -> None:
+    state = state_initializer()
+    state.suggestions = council_pool.get_suggestions(state, SeededRandomness(0))
+
+    candidates = get_candidate_actions(state, council_pool)
+
+    assert candidates[-1] == RerollAction()
+    assert {
+        action.sage_index
+        for action in candidates
+        if isinstance(action, PickCouncilAndEnchantAndRerollAction)
+    } == {0, 1, 2}
+
+
+def test_rollouts_leave_state_untouched(council_pool: ConcreteCouncilPool) -> None:
+    state = CompactGameState.from_state(state_initializer())
+    state.suggestions = council_pool.get_suggestions(
+        cast(GameState, state), SeededRandomness(0)
+    )
+    snapshot = state.snapshot()
+
+    assert run_rollouts(state, RerollAction(), 4, 0, council_pool) is not None
+    assert state.snapshot() == snapshot
+
+
+def test_advise_streams_reports(council_pool: ConcreteCouncilPool) -> None:
+    state = state_initializer()
+    state.suggestions = council_pool.get_suggestions(state, SeededRandomness(0))
+    advisor = RolloutAdvisor(
+        council_pool, thresholds=[0, 40], rollouts_per_round=2, seed=3
+    )
+
+    reports = list(advisor.advise(state, time_budget=60, max_rounds=3))
+
+    assert [report.rounds for report in reports] == [1, 2, 3]
+    for estimate in reports[-1].estimates:
+        assert estimate.rollouts == 6
+        assert estimate.success_rate(0) == 1.0
+        assert estimate.success_rate(40) == 0.0
+
+
+def test_estimates_do_not_depend_on_workers(council_pool: ConcreteCouncilPool) -> None:
+    state = state_initializer()
+    state.suggestions = council_pool.get_suggestions(state, SeededRandomness(1))
+
+    serial = RolloutAdvisor(council_pool, rollouts_per_round=2).advise_until(
+        state, time_budget=60, max_rounds=2
+    )
+    parallel = RolloutAdvisor(
+        council_pool, rollouts_per_round=2, workers=2
+    ).advise_until(state, time_budget=60, max_rounds=2)
+
+    assert parallel.estimates == serial.estimates
@@ -0,0 +1,32 @@
+import pytest
+
+from pylixir.search.table import TranspositionTable
+
+
+def test_lru_eviction() -> None:
+    table: TranspositionTable[float] = TranspositionTable(2)
+    table.put("a", 1.0)
+    table.put("b", 2.0)
+
+    assert table.get("a") == 1.0
+    table.put("c", 3.0)
+
+    assert "b" not in table
+    assert table.get("a") == 1.0
+    assert table.get("c") == 3.0
+    assert len(table) == 2
+    assert table.evictions == 1
+
+
+def test_hits_and_misses() -> None:
+    table: TranspositionTable[float] = TranspositionTable(4)
+    table.put("a", 0.0)
+
+    assert table.get("a") == 0.0
+    assert table.get("b") is None
+    assert (table.hits, table.misses) == (1, 1)
+
+
+def test_invalid_capacity() -> None:
+    with pytest.raises(ValueError):
+        TranspositionTable(0)
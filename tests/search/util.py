@@ -0,0 +1,34 @@
+from random import Random
+
+from pylixir.application.council import ForbiddenActionException
+from pylixir.application.reducer import (
+    PickCouncilAndEnchantAndRerollAction,
+    pick_council,
+)
+from pylixir.core.randomness import SeededRandomness
+from pylixir.core.state import GameState
+from pylixir.data.council_pool import ConcreteCouncilPool
+from pylixir.interface.configuration import state_initializer
+
+
+def play_until(
+    council_pool: ConcreteCouncilPool, seed: int, turn_left: int
+) -> GameState:
+    randomness = SeededRandomness(seed)
+    policy = Random(seed)
+    state = state_initializer()
+    state.suggestions = council_pool.get_suggestions(state, randomness)
+
+    while state.progress.turn_left > turn_left:
+        action = PickCouncilAndEnchantAndRerollAction(
+            sage_index=policy.choice(state.committee.get_valid_slots()),
+            effect_index=policy.choice(state.board.unlocked_indices()),
+        )
+        try:
+            state = pick_council(
+                action, state.copy(deep=True), randomness, council_pool
+            )
+        except ForbiddenActionException:
+            continue
+
+    return state
@@ -14,3 +14,31 @@ def test_reroll() -> None:
     client = get_client(42)
 
     client.reroll()
+
+
+def test_snapshot_restores_pick() -> None:
+    client = get_client(42)
+    snapshot = client.snapshot()
+    view = client.view()
+
+    client.pick(sage_index=1, effect_index=1)
+    assert client.get_state().progress.turn_left < snapshot.state.progress[0]
+
+    client.restore(snapshot)
+    assert client.view() == view
+    assert client.snapshot() == snapshot
+
+
+def test_client_caches_action_mask_per_transition() -> None:
+    client = get_client(42)
+    mask = client.get_action_mask()
+
+    assert client.get_action_mask() is mask
+    assert not mask.flags.writeable
+
+    snapshot = client.snapshot()
+    client.reroll()
+    assert client.get_action_mask() is not mask
+
+    client.restore(snapshot)
+    assert (client.get_action_mask() == mask).all()
@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+from pylixir.envs.PylixirEnv import PylixirEnv
+from pylixir.interface.cli import ClientBuilder, get_client
+from pylixir.interface.replay import (
+    GameRecord,
+    ReplayEngine,
+    ReplayMismatchException,
+    hash_state,
+    play_action,
+)
+
+
+def _play(seed: int, common_random_numbers: bool = False) -> PylixirEnv:
+    env = PylixirEnv(debug=True, common_random_numbers=common_random_numbers)
+    env.reset(seed=seed)
+    env.step(9)  # rejected or not, replayed as played
+    terminated, step = False, 0
+    while not terminated:
+        legal = np.flatnonzero(env.action_masks())
+        _, _, terminated, _, _ = env.step(int(legal[(seed + step) % len(legal)]))
+        step += 1
+
+    return env
+
+
+@pytest.mark.parametrize("common_random_numbers", [False, True])
+def test_replay_reproduces_game(common_random_numbers: bool) -> None:
+    env = _play(5, common_random_numbers)
+    record = GameRecord.parse_raw(env.get_game_record().json())
+
+    engine = ReplayEngine(record, checkpoint_interval=3)
+    assert engine.verify() == record.hashes
+    assert hash_state(engine.client.get_state()) == hash_state(env._client.get_state())
+
+
+def test_replay_seeks_through_checkpoints() -> None:
+    record = _play(2).get_game_record()
+    engine = ReplayEngine(GameRecord(seed=record.seed, actions=record.actions))
+    hashes = engine.verify()
+
+    for step in [4, 1, len(record.actions), 0, 7]:
+        state = engine.seek(step).get_state()
+        assert engine.step == step
+        if step > 0:
+            assert hash_state(state) == hashes[step - 1]
+
+    state = engine.seek_turn(6).get_state()
+    assert state.progress.turn_passed >= 6
+    engine.seek(engine.step - 1)
+    assert engine.client.get_state().progress.turn_passed < 6
+
+    with pytest.raises(IndexError):
+        engine.seek(len(record.actions) + 1)
+
+
+def test_replay_detects_mismatch() -> None:
+    record = _play(3).get_game_record()
+    record.hashes[4] = "0" * 16
+
+    engine = ReplayEngine(record)
+    engine.seek(4)
+    with pytest.raises(ReplayMismatchException, match="step 4"):
+        engine.seek(5)
+
+
+def test_snapshot_with_randomness_replays_draws() -> None:
+    client = ClientBuilder().get_client(8)
+    snapshot = client.snapshot(with_randomness=True)
+    play_action(client, 4)
+    played = hash_state(client.get_state())
+
+    client.restore(snapshot)
+    play_action(client, 4)
+    assert hash_state(client.get_state()) == played
+    assert hash_state(get_client(8).get_state()) != played
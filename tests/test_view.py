@@ -8,3 +8,9 @@ def test_game() -> None:
     client.pick(sage_index=1, effect_index=1)
 
     print(client.view())
+
+
+def test_board_shows_enchant_odds() -> None:
+    client = get_client(42)
+
+    assert client.view().count("hit 20.00% +0.22") == 5